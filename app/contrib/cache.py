@@ -0,0 +1,369 @@
+import pickle
+import threading
+import time
+import uuid
+import zlib
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+from django.utils.module_loading import import_string
+
+from app.contrib.constants import CacheConstant, CacheKey
+from app.contrib.metrics.registry import cache_requests
+
+MISSING = object()
+
+
+class LocalLRU:
+    """Bounded in-process LRU of pickled values with a per-entry expiry.
+
+    Values are pickled like ``LocMemCache`` does, so callers can't mutate a
+    cached object. Every write bumps ``stamp``; a value read from the shared
+    cache is only stored if no write happened meanwhile, so a slow reader
+    can't put back a value another thread just replaced.
+    """
+
+    def __init__(self, max_entries: int, timeout: float) -> None:
+        """Initialize the LRU."""
+        self.max_entries = max_entries
+        self.timeout = timeout
+        self.stamp = 0
+        self._data: OrderedDict[str, Tuple[float, int, bytes]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> object:
+        """Return the value of the key, or ``MISSING``."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return MISSING
+            if entry[0] <= time.monotonic():
+                del self._data[key]
+                return MISSING
+            self._data.move_to_end(key)
+        return pickle.loads(entry[2])  # noqa: S301
+
+    def set(
+        self,
+        key: str,
+        slot: int,
+        value: object,
+        timeout: Optional[float] = None,
+        stamp: Optional[int] = None,
+    ) -> None:
+        """Store a value for at most ``timeout`` seconds.
+
+        Args:
+            key: The cache key.
+            slot: The invalidation slot of the key.
+            value: The value.
+            timeout: Seconds the value may be kept; the LRU timeout if None or longer.
+            stamp: Only store the value if ``stamp`` is still current.
+
+        """
+        if timeout is None or timeout > self.timeout:
+            timeout = self.timeout
+        pickled = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            if stamp is not None and stamp != self.stamp:
+                return
+            self._data[key] = (time.monotonic() + timeout, slot, pickled)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def delete(self, keys: Iterable[str]) -> None:
+        """Drop the keys."""
+        with self._lock:
+            self.stamp += 1
+            for key in keys:
+                self._data.pop(key, None)
+
+    def drop_slots(self, slots: Set[int]) -> None:
+        """Drop every key in the given invalidation slots."""
+        with self._lock:
+            self.stamp += 1
+            for key in [key for key, entry in self._data.items() if entry[1] in slots]:
+                del self._data[key]
+
+    def clear(self) -> None:
+        """Drop every key."""
+        with self._lock:
+            self.stamp += 1
+            self._data.clear()
+
+
+class LocalTier:
+    """Local LRU and slot tokens shared by the threads of a process.
+
+    Attributes:
+        lru (LocalLRU): The local copies of shared values
+        tokens (list): The last seen version token of each slot
+        synced_at (float): When the tokens were last read, None if never
+        lock (threading.Lock): Held by the thread syncing the tokens
+
+    """
+
+    def __init__(self, max_entries: int, timeout: float) -> None:
+        """Initialize an empty tier."""
+        self.lru = LocalLRU(max_entries, timeout)
+        self.tokens: List[Optional[str]] = [None] * CacheConstant.SLOTS
+        self.synced_at: Optional[float] = None
+        self.lock = threading.Lock()
+
+
+# Django builds one cache instance per thread; like ``LocMemCache``, the
+# local tiers are kept per process, by backend, location and key prefix.
+_local_tiers: Dict[str, LocalTier] = {}
+_local_tiers_lock = threading.Lock()
+
+
+def get_local_tier(name: str, max_entries: int, timeout: float) -> LocalTier:
+    """Return the local tier of the process for the given name, creating it once."""
+    with _local_tiers_lock:
+        tier = _local_tiers.get(name)
+        if tier is None:
+            tier = _local_tiers[name] = LocalTier(max_entries, timeout)
+        return tier
+
+
+class TwoTierCache(BaseCache):
+    """Small per-process LRU in front of a shared cache backend.
+
+    The LRU and slot tokens are shared by every thread of the process,
+    even though Django creates one backend instance per thread.
+
+    Reads are served from the local LRU for up to ``LOCAL_TIMEOUT`` seconds
+    and fall back to the shared backend, which is the source of truth: every
+    write and atomic counter operation goes to it.
+
+    Keys are hashed into ``CacheConstant.SLOTS`` invalidation slots, each
+    with a version token kept in the shared backend. A write replaces the
+    token of the slots it touched; every ``SYNC_INTERVAL`` seconds, each
+    process reads all tokens in one ``get_many`` and drops its local entries
+    in the slots whose token changed. Workers therefore see each other's
+    writes within ``SYNC_INTERVAL``, at the cost of one extra shared write
+    per write.
+
+    Configured with ``OPTIONS``: ``SHARED_BACKEND`` (dotted path),
+    ``SHARED_OPTIONS``, ``LOCAL_MAX_ENTRIES``, ``LOCAL_TIMEOUT`` and
+    ``SYNC_INTERVAL``. ``LOCATION``, ``TIMEOUT``, ``KEY_PREFIX``,
+    ``VERSION`` and ``KEY_FUNCTION`` are passed to the shared backend.
+    """
+
+    def __init__(self, location: str, params: Dict) -> None:
+        """Initialize the local LRU and the shared backend."""
+        super().__init__(params)
+        options = params.get("OPTIONS", {})
+        shared_params = {
+            key: value for key, value in params.items() if key not in ("BACKEND", "OPTIONS")
+        }
+        shared_params["OPTIONS"] = options.get("SHARED_OPTIONS", {})
+        self.shared: BaseCache = import_string(options["SHARED_BACKEND"])(location, shared_params)
+        self.tier = get_local_tier(
+            f"{options['SHARED_BACKEND']}:{location}:{self.key_prefix}",
+            options.get("LOCAL_MAX_ENTRIES", CacheConstant.LOCAL_MAX_ENTRIES),
+            options.get("LOCAL_TIMEOUT", CacheConstant.LOCAL_TIMEOUT),
+        )
+        self.local = self.tier.lru
+        self.sync_interval = options.get("SYNC_INTERVAL", CacheConstant.SYNC_INTERVAL)
+        self.slot_keys = [
+            CacheKey.CACHE_SLOT_KEY.format(slot=slot) for slot in range(CacheConstant.SLOTS)
+        ]
+
+    def get(self, key: str, default: object = None, version: Optional[int] = None) -> object:
+        """Get a value, from the local LRU if possible."""
+        self.sync()
+        local_key = self.shared.make_and_validate_key(key, version)
+        value = self.local.get(local_key)
+        if value is not MISSING:
+            cache_requests.inc(("local_hit",))
+            return value
+        stamp = self.local.stamp
+        value = self.shared.get(key, MISSING, version)
+        if value is MISSING:
+            return default
+        self.local.set(local_key, self.get_slot(local_key), value, stamp=stamp)
+        return value
+
+    def get_many(self, keys: Iterable[str], version: Optional[int] = None) -> Dict:
+        """Get several values, fetching those missing locally in one shared call."""
+        self.sync()
+        found = {}
+        missing = {}
+        for key in keys:
+            local_key = self.shared.make_and_validate_key(key, version)
+            value = self.local.get(local_key)
+            if value is MISSING:
+                missing[key] = local_key
+            else:
+                found[key] = value
+        if found:
+            cache_requests.inc(("local_hit",), len(found))
+        if missing:
+            stamp = self.local.stamp
+            fetched = self.shared.get_many(list(missing), version)
+            for key, value in fetched.items():
+                local_key = missing[key]
+                self.local.set(local_key, self.get_slot(local_key), value, stamp=stamp)
+            found.update(fetched)
+        return found
+
+    def has_key(self, key: str, version: Optional[int] = None) -> bool:
+        """Check whether a key exists."""
+        self.sync()
+        if self.local.get(self.shared.make_and_validate_key(key, version)) is not MISSING:
+            return True
+        return self.shared.has_key(key, version)
+
+    def set(
+        self,
+        key: str,
+        value: object,
+        timeout: object = DEFAULT_TIMEOUT,
+        version: Optional[int] = None,
+    ) -> None:
+        """Set a value in both tiers."""
+        self.shared.set(key, value, timeout, version)
+        self.written({key: value}, timeout, version)
+
+    def add(
+        self,
+        key: str,
+        value: object,
+        timeout: object = DEFAULT_TIMEOUT,
+        version: Optional[int] = None,
+    ) -> bool:
+        """Set a value if the key doesn't exist in the shared cache."""
+        added = self.shared.add(key, value, timeout, version)
+        if added:
+            self.written({key: value}, timeout, version)
+        return added
+
+    def set_many(
+        self, data: Dict, timeout: object = DEFAULT_TIMEOUT, version: Optional[int] = None
+    ) -> List[str]:
+        """Set several values in one shared call."""
+        failed = self.shared.set_many(data, timeout, version)
+        self.written({key: data[key] for key in data if key not in failed}, timeout, version)
+        return failed
+
+    def touch(
+        self, key: str, timeout: object = DEFAULT_TIMEOUT, version: Optional[int] = None
+    ) -> bool:
+        """Update the expiry of a key.
+
+        Other workers are only told when the key is expired, since their
+        copies never outlive ``LOCAL_TIMEOUT`` anyway.
+        """
+        touched = self.shared.touch(key, timeout, version)
+        expired = timeout is not DEFAULT_TIMEOUT and timeout is not None and timeout <= 0
+        self.written({key: MISSING}, timeout, version, publish=expired)
+        return touched
+
+    def incr(self, key: str, delta: int = 1, version: Optional[int] = None) -> int:
+        """Increment a value atomically in the shared cache."""
+        value = self.shared.incr(key, delta, version)
+        self.written({key: MISSING}, version=version)
+        return value
+
+    def decr(self, key: str, delta: int = 1, version: Optional[int] = None) -> int:
+        """Decrement a value atomically in the shared cache."""
+        value = self.shared.decr(key, delta, version)
+        self.written({key: MISSING}, version=version)
+        return value
+
+    def delete(self, key: str, version: Optional[int] = None) -> bool:
+        """Delete a key from both tiers."""
+        deleted = self.shared.delete(key, version)
+        self.written({key: MISSING}, version=version)
+        return deleted
+
+    def delete_many(self, keys: Iterable[str], version: Optional[int] = None) -> None:
+        """Delete several keys in one shared call."""
+        keys = list(keys)
+        self.shared.delete_many(keys, version)
+        self.written(dict.fromkeys(keys, MISSING), version=version)
+
+    def clear(self) -> None:
+        """Delete every key and tell the other workers."""
+        self.shared.clear()
+        self.local.clear()
+        self.publish(set(range(len(self.slot_keys))))
+
+    def close(self, **kwargs: object) -> None:
+        """Close the shared backend; the local LRU outlives requests."""
+        self.shared.close(**kwargs)
+
+    def get_slot(self, local_key: str) -> int:
+        """Return the invalidation slot of a key."""
+        return zlib.crc32(local_key.encode()) % len(self.slot_keys)
+
+    def written(
+        self,
+        data: Dict[str, object],
+        timeout: object = DEFAULT_TIMEOUT,
+        version: Optional[int] = None,
+        publish: bool = True,
+    ) -> None:
+        """Update the local LRU after a shared write and publish the change.
+
+        Args:
+            data: The written values by key; ``MISSING`` drops the local copy.
+            timeout: The timeout of the written values.
+            version: The key version.
+            publish: Whether to tell the other workers.
+
+        """
+        if not data:
+            return
+        local_keys = {key: self.shared.make_and_validate_key(key, version) for key in data}
+        self.local.delete(local_keys.values())
+        if timeout is DEFAULT_TIMEOUT:
+            timeout = self.default_timeout
+        if timeout is None or timeout > 0:
+            for key, value in data.items():
+                if value is not MISSING:
+                    local_key = local_keys[key]
+                    self.local.set(local_key, self.get_slot(local_key), value, timeout)
+        if publish:
+            self.publish({self.get_slot(local_key) for local_key in local_keys.values()})
+
+    def publish(self, slots: Set[int]) -> None:
+        """Replace the version tokens of the slots in the shared cache."""
+        tokens = {slot: uuid.uuid4().hex for slot in slots}
+        self.shared.set_many(
+            {self.slot_keys[slot]: token for slot, token in tokens.items()}, timeout=None
+        )
+        for slot, token in tokens.items():
+            self.tier.tokens[slot] = token
+
+    def sync(self) -> None:
+        """Drop local entries written by other workers, at most every ``SYNC_INTERVAL``.
+
+        One thread of the process syncs at a time; the others keep serving
+        local values meanwhile.
+        """
+        tier = self.tier
+        synced_at = tier.synced_at
+        if synced_at is not None and time.monotonic() - synced_at < self.sync_interval:
+            return
+        if not tier.lock.acquire(blocking=False):
+            return
+        try:
+            now = time.monotonic()
+            if tier.synced_at is not None and now - tier.synced_at < self.sync_interval:
+                return
+            tier.synced_at = now
+            tokens = self.shared.get_many(self.slot_keys)
+            changed = set()
+            for slot, key in enumerate(self.slot_keys):
+                token = tokens.get(key)
+                if token != tier.tokens[slot]:
+                    tier.tokens[slot] = token
+                    changed.add(slot)
+            if changed:
+                tier.lru.drop_slots(changed)
+        finally:
+            tier.lock.release()
@@ -1,37 +1,188 @@
+import logging
+import threading
+import time
+from types import MappingProxyType
+from typing import Any, Mapping, Optional
+
 from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.base import BaseCache
+from django.core.cache.backends.locmem import LocMemCache
+
+from asgiref.sync import sync_to_async
+
+from app.contrib.constants import CacheKey, ConfigConstant
+
+logger = logging.getLogger(__name__)
+
+EMPTY_SNAPSHOT: Mapping[str, Any] = MappingProxyType({})
 
 
 class ConfigWrapper:
-    """Wrapper class for accessing configuration settings."""
+    """Wrapper class for accessing configuration settings.
+
+    Constance values are served from a per-process, immutable snapshot. The
+    snapshot is rebuilt when the shared version counter changes; the counter
+    is checked at most once every ``CONFIG_SNAPSHOT_TTL`` seconds and bumped
+    by the constance ``config_updated`` signal.
+    """
 
     def __init__(self) -> None:
         """Initialize the ConfigWrapper."""
+        self._snapshot: Optional[Mapping[str, Any]] = None
+        self._version: Optional[int] = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
         try:
             from constance import config as constance_config
             from constance import settings as constance_settings
+            from constance import signals as constance_signals
 
             self.constance_config = constance_config
             self.constance_settings = constance_settings
+            constance_signals.config_updated.connect(self._on_config_updated)
         except ImportError:
             self.constance_config = None
             self.constance_settings = None
 
     def __getattr__(self, key: str) -> str:
         """Get attribute from the config or settings."""
-        if self.constance_config:
-            try:
-                result = getattr(self.constance_config, key)
-                if result is not None:
-                    return result
-            except AttributeError:
-                pass
+        return self.resolve(self.snapshot, key)
+
+    async def aget(self, key: str) -> object:
+        """Get a value from the config or settings without blocking the event loop."""
+        return self.resolve(await self.asnapshot(), key)
+
+    @staticmethod
+    def resolve(snapshot: Mapping[str, Any], key: str) -> object:
+        """Get a value from the given snapshot, falling back to settings."""
+        result = snapshot.get(key)
+        if result is not None:
+            return result
         return getattr(settings, key)
 
+    @property
+    def snapshot(self) -> Mapping[str, Any]:
+        """Return the current constance snapshot, refreshing it if it is stale."""
+        snapshot = self._get_fresh_snapshot()
+        if snapshot is not None:
+            return snapshot
+        with self._lock:
+            snapshot = self._get_fresh_snapshot()
+            if snapshot is None:
+                self._refresh()
+                snapshot = self._snapshot
+            return snapshot
+
+    async def asnapshot(self) -> Mapping[str, Any]:
+        """Async version of ``snapshot`` using the async constance and cache APIs."""
+        snapshot = self._get_fresh_snapshot()
+        if snapshot is not None:
+            return snapshot
+        version = await self._aget_shared_version()
+        if self._snapshot is None or version is None or version != self._version:
+            self._snapshot = MappingProxyType(await self._aload_values())
+            self._version = version
+        self._checked_at = time.monotonic()
+        return self._snapshot
+
+    def invalidate(self) -> None:
+        """Drop the local snapshot so the next access reloads it."""
+        self._snapshot = None
+
     def reset(self) -> None:
         """Reset the config to the default values."""
         if self.constance_settings:
             for name, options in self.constance_settings.CONFIG.items():
                 setattr(self.constance_config, name, options[0])
+        self.invalidate()
+
+    def _get_fresh_snapshot(self) -> Optional[Mapping[str, Any]]:
+        """Return the local snapshot if it doesn't need a version check yet."""
+        if not self.constance_config:
+            return EMPTY_SNAPSHOT
+        snapshot = self._snapshot
+        if snapshot is not None and time.monotonic() - self._checked_at < self._get_ttl():
+            return snapshot
+        return None
+
+    def _refresh(self) -> None:
+        """Reload the snapshot if the shared version moved (or on first use)."""
+        version = self._get_shared_version()
+        if self._snapshot is None or version is None or version != self._version:
+            self._snapshot = MappingProxyType(self._load_values())
+            self._version = version
+        self._checked_at = time.monotonic()
+
+    def _load_values(self) -> dict:
+        """Read every ``CONSTANCE_CONFIG`` value from the backend in one call."""
+        from constance.utils import get_values
+
+        return get_values()
+
+    async def _aload_values(self) -> dict:
+        """Async version of ``_load_values``.
+
+        ``aget_values`` only exists in recent django-constance releases; older
+        ones read the values in a worker thread instead.
+        """
+        try:
+            from constance.utils import aget_values
+        except ImportError:
+            return await sync_to_async(self._load_values)()
+        return await aget_values()
+
+    def _on_config_updated(self, **_kwargs: object) -> None:
+        """Invalidate the snapshot and bump the shared version counter."""
+        self.invalidate()
+        version_cache = self._get_version_cache()
+        if version_cache is None:
+            return
+        try:
+            if not version_cache.add(CacheKey.CONFIG_VERSION_KEY, 1, timeout=None):
+                version_cache.incr(CacheKey.CONFIG_VERSION_KEY)
+        except Exception as error:
+            logger.warning("CONFIG: Failed to bump config version: %s", error)
+
+    def _get_shared_version(self) -> Optional[int]:
+        """Return the shared version counter, or None when it can't be trusted."""
+        version_cache = self._get_version_cache()
+        if version_cache is None:
+            return None
+        try:
+            return version_cache.get(CacheKey.CONFIG_VERSION_KEY, 0)
+        except Exception as error:
+            logger.warning("CONFIG: Failed to read config version: %s", error)
+            return None
+
+    async def _aget_shared_version(self) -> Optional[int]:
+        """Async version of ``_get_shared_version``."""
+        version_cache = self._get_version_cache()
+        if version_cache is None:
+            return None
+        try:
+            return await version_cache.aget(CacheKey.CONFIG_VERSION_KEY, 0)
+        except Exception as error:
+            logger.warning("CONFIG: Failed to read config version: %s", error)
+            return None
+
+    @staticmethod
+    def _get_version_cache() -> Optional[BaseCache]:
+        """Return the cache holding the version counter if it is shared across workers.
+
+        A local-memory cache is private to each worker, so it can't carry the
+        counter; in that case the snapshot is simply reloaded once per TTL.
+        """
+        alias = getattr(settings, "CONFIG_SNAPSHOT_CACHE", ConfigConstant.SNAPSHOT_CACHE)
+        version_cache = caches[alias]
+        if isinstance(version_cache, LocMemCache):
+            return None
+        return version_cache
+
+    @staticmethod
+    def _get_ttl() -> float:
+        """Return the snapshot TTL in seconds."""
+        return getattr(settings, "CONFIG_SNAPSHOT_TTL", ConfigConstant.SNAPSHOT_TTL)
 
 
 config = ConfigWrapper()
@@ -4,12 +4,96 @@ class CacheKey:
     HEALTH_CHECK_KEY = "health_check"
     HEALTH_CHECK_VALUE = "it works!"
 
+    CONFIG_VERSION_KEY = "config_version"
+
+    CACHE_SLOT_KEY = "cache_slot:{slot}"
+
+
+class CacheConstant:
+    """Class for two-tier cache constants."""
+
+    LOCAL_MAX_ENTRIES = 1000
+    LOCAL_TIMEOUT = 5  # seconds
+    SYNC_INTERVAL = 1  # seconds
+    SLOTS = 64
+
+
+class ConfigConstant:
+    """Class for config snapshot constants."""
+
+    SNAPSHOT_TTL = 5  # seconds
+    SNAPSHOT_CACHE = "default"
+
+
+class HealthCheckConstant:
+    """Class for health check constants."""
+
+    CACHE_TTL = 5  # seconds
+    TIMEOUT = 3  # seconds
+    MAX_WORKERS = 4
+
 
 class LoggerConstant:
     """Class for logger constants."""
 
     MAX_BODY_SIZE = 1024 * 10  # 10KB
     SENSITIVE_FIELDS = {"password", "token", "secret"}
+    SENSITIVE_PATTERNS = ("*password*", "*secret*", "*token", "*api_key")
+    SENSITIVE_PATHS = ()
+    MASK = "***"
+    REDACT_KEY_CACHE_SIZE = 4096
+    SAMPLE_RATE = 1.0
+    SLOW_REQUEST_MS = 1000
+    ERROR_STATUS = 400  # responses at or above this status are always logged
+    SKIP_PATHS = ()
+    CAPTURE_PREFIX = False  # log the first MAX_BODY_SIZE bytes of larger bodies
+
+
+class SecurityHeaderConstant:
+    """Class for security header constants."""
+
+    HEADERS = {
+        "X-Frame-Options": "DENY",
+        "X-XSS-Protection": "1; mode=block",
+        "X-Content-Type-Options": "nosniff",
+        "Strict-Transport-Security": "max-age=31536000; includeSubDomains",
+    }
+    CSP = (
+        "default-src 'self'",
+        "img-src 'self' data: https:",
+        "script-src 'self' 'unsafe-inline' cdn.jsdelivr.net ",
+        "style-src 'self' 'unsafe-inline' https://cdn.jsdelivr.net",
+        "frame-ancestors 'none'",
+    )
+    NONCE_PLACEHOLDER = "{nonce}"
+    NONCE_SOURCE = "'nonce-{nonce}'"
+    NONCE_BYTES = 16
+
+
+class ThrottleConstant:
+    """Class for throttling constants."""
+
+    CACHE = "default"
+    LOCAL_MAX_KEYS = 10000
+
+
+class LogDedupConstant:
+    """Class for repeated log record deduplication constants."""
+
+    LIMIT = 10  # records logged in full per key and window
+    WINDOW = 60  # seconds
+    MAX_KEYS = 1000
+
+
+class LogQueueConstant:
+    """Class for queued logging constants."""
+
+    QUEUE_SIZE = 10000
+    OVERFLOW = "drop"
+    BATCH_SIZE = 500
+    BLOCK_TIMEOUT = 1  # seconds
+    SAMPLE_RATE = 10
+    SAMPLE_THRESHOLD = 0.8
 
 
 class PaginationConstant:
@@ -17,3 +101,47 @@ class PaginationConstant:
 
     MAX_PAGE_SIZE = 100
     PAGE_SIZE_QUERY_PARAM = "page_size"
+    CURSOR_SALT = "app.contrib.pagination.KeysetPagination"
+    COUNT_STRATEGY = "exact"
+    COUNT_CACHE = "default"
+    COUNT_CACHE_PREFIX = "pagination_count_"
+    COUNT_CACHE_TTL = 60  # seconds
+    COUNT_ESTIMATE_THRESHOLD = 100000
+
+
+class StreamingConstant:
+    """Class for streaming response constants."""
+
+    CHUNK_SIZE = 2000
+
+
+class TimingConstant:
+    """Class for request timing constants."""
+
+    ENABLED = False
+    HEADER = False
+    LOG = True
+    SLOW_MS = 0
+
+
+class MetricsConstant:
+    """Class for metrics constants."""
+
+    ENABLED = False
+    ENDPOINT = "/api/metrics/"
+    DIR_NAME = "app_metrics"  # under the system temp directory
+    ALLOWED_IPS = ("127.0.0.1", "::1")
+    FILE_SIZE = 1024 * 64  # 64KB, doubled when full
+    BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)  # seconds
+    CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class DatabaseConstant:
+    """Class for database routing constants."""
+
+    REPLICA_BALANCE = "round_robin"  # or "least_failed"
+    REPLICA_MAX_LAG = 10  # seconds
+    REPLICA_EJECT_SECONDS = 30
+    REPLICA_CHECK_INTERVAL = 5  # seconds
+    STICKY_SECONDS = 5
+    STICKY_COOKIE = "db_primary_until"
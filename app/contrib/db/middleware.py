@@ -0,0 +1,93 @@
+import time
+from typing import Callable
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import HttpRequest, HttpResponse
+
+from app.contrib.constants import DatabaseConstant
+from app.contrib.db.replicas import get_replicas
+from app.contrib.db.router import RoutingState, end_routing, start_routing
+from app.contrib.middleware import BaseMiddleware
+
+SAFE_METHODS = frozenset(("GET", "HEAD", "OPTIONS", "TRACE"))
+
+
+class ReplicaRoutingMiddleware(BaseMiddleware):
+    """Let ``ReplicaRouter`` send the reads of each request to replicas.
+
+    Requests with an unsafe method read from the primary. A request that
+    writes sets a cookie pinning the client to the primary for
+    ``DATABASE_STICKY_SECONDS``, so it reads its own writes on the next
+    requests while the replicas catch up.
+
+    Must come before any middleware querying the database. Not loaded when
+    no replica is configured.
+    """
+
+    def __init__(self, get_response: Callable) -> None:
+        """Initialize the middleware.
+
+        Raises:
+            MiddlewareNotUsed: If no replica is configured.
+
+        """
+        if not get_replicas().aliases:
+            raise MiddlewareNotUsed
+        super().__init__(get_response)
+        self.sticky_seconds = getattr(
+            settings, "DATABASE_STICKY_SECONDS", DatabaseConstant.STICKY_SECONDS
+        )
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        """Route the reads of the request."""
+        if self.async_mode:
+            return self.__acall__(request)
+        state, token = start_routing(self.is_pinned(request))
+        try:
+            response = self.get_response(request)
+        finally:
+            end_routing(token)
+        return self.process_response(response, state)
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponse:
+        """Async version of ``__call__``."""
+        state, token = start_routing(self.is_pinned(request))
+        try:
+            response = await self.get_response(request)
+        finally:
+            end_routing(token)
+        return self.process_response(response, state)
+
+    @staticmethod
+    def is_pinned(request: HttpRequest) -> bool:
+        """Check whether the request must read from the primary."""
+        if request.method not in SAFE_METHODS:
+            return True
+        try:
+            pinned_until = float(request.COOKIES.get(DatabaseConstant.STICKY_COOKIE, 0))
+        except ValueError:
+            return False
+        return pinned_until > time.time()
+
+    def process_response(self, response: HttpResponse, state: RoutingState) -> HttpResponse:
+        """Pin the client to the primary after a write.
+
+        Args:
+            response: The response.
+            state: The routing state of the request.
+
+        Returns:
+            The response.
+
+        """
+        if state.wrote and self.sticky_seconds:
+            response.set_cookie(
+                DatabaseConstant.STICKY_COOKIE,
+                f"{time.time() + self.sticky_seconds:.3f}",
+                max_age=self.sticky_seconds,
+                secure=settings.SESSION_COOKIE_SECURE,
+                httponly=True,
+                samesite="Lax",
+            )
+        return response
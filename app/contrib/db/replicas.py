@@ -0,0 +1,219 @@
+import itertools
+import logging
+import threading
+import time
+from functools import lru_cache
+from typing import Callable, Dict, Optional, Sequence, TypeVar
+
+from django.conf import settings
+from django.db import DatabaseError, InterfaceError, OperationalError, connections
+from django.db.backends.base.base import BaseDatabaseWrapper
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+from django.test.signals import setting_changed
+
+from app.contrib.constants import DatabaseConstant
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Seconds the replica is behind; 0 when it has replayed everything it received.
+POSTGRESQL_LAG_QUERY = (
+    "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+)
+
+
+class ReplicaState:
+    """Health of one replica as seen by this process."""
+
+    __slots__ = ("alias", "ejected_until", "failed_at", "checked_at", "lag", "error")
+
+    def __init__(self, alias: str) -> None:
+        """Initialize the state of a replica that was never checked."""
+        self.alias = alias
+        self.ejected_until = 0.0
+        self.failed_at = 0.0
+        self.checked_at: Optional[float] = None
+        self.lag: Optional[float] = None
+        self.error: Optional[str] = None
+
+    def is_ejected(self, now: float) -> bool:
+        """Check whether the replica is out of rotation."""
+        return self.ejected_until > now
+
+    def as_dict(self) -> dict:
+        """Return the JSON-serializable form of the state."""
+        return {
+            "ejected": self.is_ejected(time.monotonic()),
+            "lag_seconds": None if self.lag is None else round(self.lag, 3),
+            "error": self.error,
+        }
+
+
+class ReplicaSet:
+    """Read replicas with automatic ejection of failing or lagging ones.
+
+    Each process keeps its own view. A replica is probed (connectivity and
+    replication lag) before it is used if its last check is older than
+    ``check_interval``, and ejected for ``eject_seconds`` when the probe or
+    any query on it fails, or when it lags more than ``max_lag`` seconds.
+    Ejected replicas return to rotation after a new successful probe.
+    """
+
+    def __init__(
+        self,
+        aliases: Sequence[str],
+        balance: str = DatabaseConstant.REPLICA_BALANCE,
+        max_lag: float = DatabaseConstant.REPLICA_MAX_LAG,
+        eject_seconds: float = DatabaseConstant.REPLICA_EJECT_SECONDS,
+        check_interval: float = DatabaseConstant.REPLICA_CHECK_INTERVAL,
+    ) -> None:
+        """Initialize the replica set.
+
+        Args:
+            aliases: Database aliases of the replicas.
+            balance: ``round_robin``, or ``least_failed`` to prefer the
+                replicas that failed least recently.
+            max_lag: Replication lag in seconds above which a replica is ejected.
+            eject_seconds: Seconds a failing replica stays out of rotation.
+            check_interval: Seconds between probes of a replica.
+
+        Raises:
+            ValueError: If the balance mode is unknown.
+
+        """
+        if balance not in ("round_robin", "least_failed"):
+            raise ValueError(f"Unknown replica balance mode: {balance!r}")
+        self.states: Dict[str, ReplicaState] = {alias: ReplicaState(alias) for alias in aliases}
+        self.aliases = list(self.states)
+        self.balance = balance
+        self.max_lag = max_lag
+        self.eject_seconds = eject_seconds
+        self.check_interval = check_interval
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+
+    def choose(self) -> Optional[str]:
+        """Return the replica to read from, or None to use the primary."""
+        if not self.aliases:
+            return None
+        now = time.monotonic()
+        start = next(self._counter)
+        rotation = [
+            self.aliases[(start + offset) % len(self.aliases)]
+            for offset in range(len(self.aliases))
+        ]
+        if self.balance == "least_failed":
+            # ``sorted`` is stable, so replicas that never failed keep rotating.
+            rotation.sort(key=lambda alias: self.states[alias].failed_at)
+        for alias in rotation:
+            state = self.states[alias]
+            if state.is_ejected(now):
+                continue
+            if self._is_stale(state, now) and not self.check(alias):
+                continue
+            return alias
+        return None
+
+    def check(self, alias: str) -> bool:
+        """Probe the replica and update its state.
+
+        Args:
+            alias: The replica alias.
+
+        Returns:
+            True if the replica is reachable and not lagging too much.
+
+        """
+        state = self.states[alias]
+        state.checked_at = time.monotonic()
+        connection = connections[alias]
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute(self.get_lag_query(connection))
+                lag = float(cursor.fetchone()[0] or 0)
+        except DatabaseError as e:
+            connection.close_if_unusable_or_obsolete()
+            self.report_failure(alias, str(e))
+            return False
+        state.lag = lag
+        if lag > self.max_lag:
+            self.report_failure(alias, f"replication lag {lag:.1f}s exceeds {self.max_lag}s")
+            return False
+        with self._lock:
+            if state.error is not None:
+                logger.info("DATABASE: Replica %s is back in rotation", alias)
+            state.ejected_until = 0.0
+            state.error = None
+        return True
+
+    def report_failure(self, alias: str, error: str) -> None:
+        """Eject the replica for ``eject_seconds``."""
+        state = self.states.get(alias)
+        if state is None:
+            return
+        now = time.monotonic()
+        with self._lock:
+            if not state.is_ejected(now):
+                logger.warning("DATABASE: Ejecting replica %s: %s", alias, error)
+            state.ejected_until = now + self.eject_seconds
+            state.failed_at = now
+            state.checked_at = now
+            state.error = error
+
+    def _is_stale(self, state: ReplicaState, now: float) -> bool:
+        """Check whether the replica must be probed before use."""
+        return state.checked_at is None or now - state.checked_at >= self.check_interval
+
+    @staticmethod
+    def get_lag_query(connection: BaseDatabaseWrapper) -> str:
+        """Return the query measuring the replication lag in seconds."""
+        if connection.vendor == "postgresql":
+            return POSTGRESQL_LAG_QUERY
+        return "SELECT 0"
+
+
+@lru_cache(maxsize=None)
+def get_replicas() -> ReplicaSet:
+    """Return the replica set configured by the ``DATABASE_REPLICA*`` settings."""
+    replicas = ReplicaSet(
+        getattr(settings, "DATABASE_REPLICAS", []),
+        balance=getattr(settings, "DATABASE_REPLICA_BALANCE", DatabaseConstant.REPLICA_BALANCE),
+        max_lag=getattr(settings, "DATABASE_REPLICA_MAX_LAG", DatabaseConstant.REPLICA_MAX_LAG),
+        eject_seconds=getattr(
+            settings, "DATABASE_REPLICA_EJECT_SECONDS", DatabaseConstant.REPLICA_EJECT_SECONDS
+        ),
+        check_interval=getattr(
+            settings, "DATABASE_REPLICA_CHECK_INTERVAL", DatabaseConstant.REPLICA_CHECK_INTERVAL
+        ),
+    )
+    connection_created.connect(install_failure_reporting, dispatch_uid="app.contrib.db")
+    return replicas
+
+
+@receiver(setting_changed)
+def _reset_replicas(setting: str, **_kwargs: object) -> None:
+    """Rebuild the replica set when a ``DATABASE_REPLICA*`` setting changes."""
+    if setting.startswith("DATABASE_REPLICA"):
+        get_replicas.cache_clear()
+
+
+def report_failures(
+    execute: Callable[..., T], sql: str, params: object, many: bool, context: Dict
+) -> T:
+    """Database execute wrapper ejecting a replica when a query can't reach it."""
+    try:
+        return execute(sql, params, many, context)
+    except (OperationalError, InterfaceError) as e:
+        get_replicas().report_failure(context["connection"].alias, str(e))
+        raise
+
+
+def install_failure_reporting(connection: BaseDatabaseWrapper, **_kwargs: object) -> None:
+    """Add ``report_failures`` to the execute wrappers of replica connections."""
+    if connection.alias in get_replicas().states and report_failures not in (
+        connection.execute_wrappers
+    ):
+        connection.execute_wrappers.append(report_failures)
@@ -0,0 +1,90 @@
+from contextvars import ContextVar
+from typing import Optional, Tuple, Type
+
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.models import Model
+
+from app.contrib.db.replicas import get_replicas
+
+
+class RoutingState:
+    """Whether the current request must read from the primary.
+
+    Attributes:
+        pinned: Reads go to the primary, e.g. after a write
+        wrote: The request routed a write
+
+    """
+
+    __slots__ = ("pinned", "wrote")
+
+    def __init__(self, pinned: bool = False) -> None:
+        """Initialize the state."""
+        self.pinned = pinned
+        self.wrote = False
+
+
+_current: ContextVar[Optional[RoutingState]] = ContextVar("db_routing", default=None)
+
+
+def get_routing_state() -> Optional[RoutingState]:
+    """Return the routing state of the current request, if any."""
+    return _current.get()
+
+
+def start_routing(pinned: bool = False) -> Tuple[RoutingState, object]:
+    """Allow reads from replicas in the current context.
+
+    Args:
+        pinned: Whether reads must go to the primary from the start.
+
+    Returns:
+        The routing state and the token to pass to ``end_routing``.
+
+    """
+    state = RoutingState(pinned)
+    return state, _current.set(state)
+
+
+def end_routing(token: object) -> None:
+    """Detach the state set with ``start_routing``."""
+    _current.reset(token)
+
+
+class ReplicaRouter:
+    """Send writes to the primary and reads to the ``DATABASE_REPLICAS``.
+
+    Reads only use replicas inside a routing context, which
+    ``ReplicaRoutingMiddleware`` opens for each request; management
+    commands and other code outside a request always use the primary. Once
+    a context routes a write, or inside a transaction on the primary, its
+    reads go to the primary too, so it reads its own writes.
+    """
+
+    def db_for_read(self, _model: Type[Model], **_hints: object) -> Optional[str]:
+        """Return a replica, or the primary if pinned or none is available."""
+        state = _current.get()
+        if state is None or state.pinned or connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        return get_replicas().choose() or DEFAULT_DB_ALIAS
+
+    def db_for_write(self, _model: Type[Model], **_hints: object) -> str:
+        """Return the primary and pin the current context to it."""
+        state = _current.get()
+        if state is not None:
+            state.pinned = True
+            state.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1: Model, obj2: Model, **_hints: object) -> Optional[bool]:
+        """Allow relations between objects of the primary and its replicas."""
+        databases = {DEFAULT_DB_ALIAS, *get_replicas().states}
+        if obj1._state.db in databases and obj2._state.db in databases:  # noqa: SLF001
+            return True
+        return None
+
+    def allow_migrate(self, db: str, _app_label: str, **_hints: object) -> Optional[bool]:
+        """Never migrate replicas; they follow the primary."""
+        if db in get_replicas().states:
+            return False
+        return None
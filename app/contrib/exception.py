@@ -1,16 +1,25 @@
 import logging
-from typing import Any, Dict, Optional
+import threading
+from typing import Any, Dict, Optional, Tuple
 
+from django.conf import settings
 from django.core.exceptions import PermissionDenied
+from django.db import connections
 from django.http import Http404
-from django.http.response import JsonResponse
+from django.http.response import HttpResponse, JsonResponse
+from django.utils import translation
 
 from rest_framework import exceptions, status
 from rest_framework.response import Response
 from rest_framework.views import set_rollback
 
 from app.contrib.config import config
+from app.contrib.constants import LogDedupConstant
 from app.contrib.error_code import ErrorCode
+from app.contrib.log_dedup import LogDeduplicator, log_summary
+from app.contrib.metrics.registry import api_exceptions
+from app.contrib.redaction import LazyRedacted
+from app.contrib.renderers import dumps
 
 logger = logging.getLogger(__name__)
 
@@ -20,26 +29,47 @@ class APIExceptionHandler:
 
     This handler converts exceptions into standardized JSON responses
     with appropriate HTTP status codes and error details.
+
+    Outside DEBUG, the body of an exception raised without arguments (default
+    detail and code) is serialized once per exception class and language
+    and then served as is.
+
+    Repeated errors (same class, code and view) are only logged in full for
+    the first ``ERROR_LOG_DEDUP_LIMIT`` occurrences per
+    ``ERROR_LOG_DEDUP_WINDOW`` seconds; the rest are counted and summarized.
     """
 
-    def handle_exception(self, exc: Exception, _context: Dict[str, Any]) -> Optional[Response]:
+    def __init__(self) -> None:
+        """Initialize the handler."""
+        self._rendered: Dict[Tuple[type, Optional[str]], Tuple[Dict, bytes]] = {}
+        self._rendered_lock = threading.Lock()
+        self.deduplicator = LogDeduplicator(
+            log_summary(logger),
+            limit=getattr(settings, "ERROR_LOG_DEDUP_LIMIT", LogDedupConstant.LIMIT),
+            window=getattr(settings, "ERROR_LOG_DEDUP_WINDOW", LogDedupConstant.WINDOW),
+            max_keys=getattr(settings, "ERROR_LOG_DEDUP_MAX_KEYS", LogDedupConstant.MAX_KEYS),
+        )
+
+    def handle_exception(self, exc: Exception, context: Dict[str, Any]) -> Optional[Response]:
         """Handle main exception.
 
         Args:
             exc: The raised exception.
-            _context: Context about the exception.
+            context: Context about the exception.
 
         Returns:
             A Response object with the error details, or None.
 
         """
         exc = self._normalize_exception(exc)
+        view = context.get("view")
+        view_name = type(view).__qualname__ if view is not None else None
 
         if not isinstance(exc, exceptions.APIException):
-            self._log_unexpected_error(exc)
+            self._log_unexpected_error(exc, view_name)
             exc = InternalServerError()
 
-        return self._handle_api_exception(exc)
+        return self._handle_api_exception(exc, view_name)
 
     def _normalize_exception(self, exc: Exception) -> Exception:
         """Normalize exceptions to DRF Exception type.
@@ -57,24 +87,81 @@ class APIExceptionHandler:
             return exceptions.PermissionDenied(*(exc.args))
         return exc
 
-    def _handle_api_exception(self, exc: exceptions.APIException) -> Response:
+    def _handle_api_exception(
+        self, exc: exceptions.APIException, view_name: Optional[str] = None
+    ) -> Response:
         """Handle API Exceptions.
 
         Args:
             exc: The API exception.
+            view_name: Name of the view that raised the exception.
 
         Returns:
             A Response object with the error details.
 
         """
         headers = self._get_exception_headers(exc)
+        if not config.DEBUG and self._has_default_detail(exc):
+            data, content = self._get_rendered(exc)
+            self._count_api_error(exc, data)
+            self._log_api_error(exc, data, view_name)
+            self._set_rollback()
+            return PrerenderedJsonResponse(content, status=exc.status_code, headers=headers)
+
         data = self._get_exception_data(exc)
 
-        self._log_api_error(exc, data)
-        set_rollback()
+        self._count_api_error(exc, data)
+        self._log_api_error(exc, data, view_name)
+        self._set_rollback()
+
+        if config.DEBUG:
+            return Response(data, status=exc.status_code, headers=headers)
+        return PrerenderedJsonResponse(dumps(data), status=exc.status_code, headers=headers)
+
+    @staticmethod
+    def _has_default_detail(exc: exceptions.APIException) -> bool:
+        """Check whether the exception carries its default detail and code.
+
+        Args:
+            exc: The API exception.
+
+        Returns:
+            True if the exception was raised without a custom detail or code.
+
+        """
+        detail = exc.detail
+        return (
+            isinstance(detail, exceptions.ErrorDetail)
+            and detail.code == exc.default_code
+            and detail == str(exc.default_detail)
+        )
+
+    def _get_rendered(self, exc: exceptions.APIException) -> Tuple[Dict, bytes]:
+        """Return the data and serialized body for a default-detail exception.
+
+        Args:
+            exc: The API exception.
+
+        Returns:
+            The error data and its JSON encoding, cached per class and language.
 
-        response_class = Response if config.DEBUG else JsonResponse
-        return response_class(data, status=exc.status_code, headers=headers)
+        """
+        key = (type(exc), translation.get_language())
+        rendered = self._rendered.get(key)
+        if rendered is None:
+            data = self._get_exception_data(exc)
+            content = dumps(data)
+            with self._rendered_lock:
+                rendered = self._rendered.setdefault(key, (data, content))
+        return rendered
+
+    @staticmethod
+    def _set_rollback() -> None:
+        """Mark the active atomic blocks for rollback, if there is one."""
+        # A connection that was never opened in this thread can't be in an
+        # atomic block, so there is nothing to roll back without one.
+        if any(conn.in_atomic_block for conn in connections.all(initialized_only=True)):
+            set_rollback()
 
     def _get_exception_headers(self, exc: exceptions.APIException) -> Dict[str, str]:
         """Get the headers for the exception response.
@@ -107,30 +194,48 @@ class APIExceptionHandler:
             exc = RequestBodyValidationError(exc.get_full_details())
         return exc.get_full_details()
 
-    def _log_api_error(self, exc: exceptions.APIException, data: Dict) -> None:
+    @staticmethod
+    def _count_api_error(exc: exceptions.APIException, data: Dict) -> None:
+        """Count the error response by error code and status."""
+        code = data.get("code") if isinstance(data, dict) else None
+        api_exceptions.inc((str(code), str(exc.status_code)))
+
+    def _log_api_error(
+        self, exc: exceptions.APIException, data: Dict, view_name: Optional[str] = None
+    ) -> None:
         """Log details about API exceptions.
 
         Args:
             exc: The API exception.
             data: The error data.
+            view_name: Name of the view that raised the exception.
 
         """
+        if not logger.isEnabledFor(logging.INFO):
+            return
+        code = data.get("code") if isinstance(data, dict) else None
+        if not self.deduplicator.allow((exc.__class__.__name__, code, view_name)):
+            return
         logger.info(
             "API LOGGING: API exception: [%s: %s]",
             exc.__class__.__name__,
-            data,
+            LazyRedacted(data),
         )
 
-    def _log_unexpected_error(self, exc: Exception) -> None:
+    def _log_unexpected_error(self, exc: Exception, view_name: Optional[str] = None) -> None:
         """Log unexpected exceptions.
 
         Args:
             exc: The unexpected exception.
+            view_name: Name of the view that raised the exception.
 
         """
-        logger.exception(
+        if not self.deduplicator.allow((exc.__class__.__name__, None, view_name)):
+            return
+        logger.error(
             "API LOGGING: Unexpected exception occurred: [%s]",
             exc,
+            exc_info=exc,
         )
 
 
@@ -138,6 +243,21 @@ class APIExceptionHandler:
 exception_handler = APIExceptionHandler().handle_exception
 
 
+class PrerenderedJsonResponse(JsonResponse):
+    """``JsonResponse`` for a body that is already JSON-encoded."""
+
+    def __init__(self, content: bytes, **kwargs: object) -> None:
+        """Initialize the response without encoding the content again.
+
+        Args:
+            content: The JSON-encoded body.
+            kwargs: Keyword arguments for ``HttpResponse``.
+
+        """
+        kwargs.setdefault("content_type", "application/json")
+        HttpResponse.__init__(self, content, **kwargs)
+
+
 class InternalServerError(exceptions.APIException):
     """Internal server error."""
 
@@ -0,0 +1,225 @@
+import time
+from typing import NamedTuple, Optional
+
+from django.core.cache import caches
+from django.db import connections
+from django.db.backends.base.base import BaseDatabaseWrapper
+
+from asgiref.sync import sync_to_async
+
+from app.contrib.constants import CacheKey, HealthCheckConstant
+from app.contrib.db.replicas import get_replicas
+
+
+class CheckResult(NamedTuple):
+    """Outcome of a single health check."""
+
+    name: str
+    healthy: bool
+    latency_ms: float
+    error: Optional[str] = None
+    details: Optional[dict] = None
+    critical: bool = True
+
+    def as_dict(self) -> dict:
+        """Return the JSON-serializable form of the result."""
+        data = {"status": "ok" if self.healthy else "error", "latency_ms": self.latency_ms}
+        if self.error:
+            data["error"] = self.error
+        if self.details:
+            data.update(self.details)
+        return data
+
+
+class BaseHealthCheck:
+    """Base class for health checks.
+
+    Subclasses implement ``check`` and raise an exception when the dependency
+    is unhealthy. ``check`` may return a dictionary of details added to the
+    report.
+
+    Attributes:
+        name (str): Name shown in the health report
+        timeout (float): Seconds to wait for the check before failing it
+        critical (bool): Whether a failure makes the service unhealthy
+
+    """
+
+    name = "check"
+    timeout = HealthCheckConstant.TIMEOUT
+    critical = True
+
+    def check(self) -> Optional[dict]:
+        """Probe the dependency, raising on failure."""
+        raise NotImplementedError
+
+    async def acheck(self) -> Optional[dict]:
+        """Async version of ``check``; runs ``check`` in a worker thread by default."""
+        return await sync_to_async(self._check_and_close, thread_sensitive=False)()
+
+    def run(self) -> CheckResult:
+        """Run the check and measure its latency.
+
+        Returns:
+            The check result.
+
+        """
+        started = time.perf_counter()
+        try:
+            details = self.check()
+        except Exception as e:
+            return self._result(started, str(e))
+        return self._result(started, details=details)
+
+    async def arun(self) -> CheckResult:
+        """Async version of ``run``."""
+        started = time.perf_counter()
+        try:
+            details = await self.acheck()
+        except Exception as e:
+            return self._result(started, str(e))
+        return self._result(started, details=details)
+
+    def run_in_thread(self) -> CheckResult:
+        """Version of ``run`` for pool threads, closing the connections the check opened.
+
+        Pool threads outlive the check, so each one would otherwise keep an
+        idle connection per database alias.
+        """
+        try:
+            return self.run()
+        finally:
+            connections.close_all()
+
+    def _check_and_close(self) -> Optional[dict]:
+        """Run ``check`` from a pool thread, closing the connections it opened."""
+        try:
+            return self.check()
+        finally:
+            connections.close_all()
+
+    def _result(
+        self, started: float, error: Optional[str] = None, details: Optional[dict] = None
+    ) -> CheckResult:
+        """Build the result of a check started at ``started``."""
+        return CheckResult(
+            self.name,
+            error is None,
+            self._elapsed_ms(started),
+            error,
+            details,
+            self.critical,
+        )
+
+    @staticmethod
+    def _elapsed_ms(started: float) -> float:
+        """Return the milliseconds elapsed since ``started``."""
+        return round((time.perf_counter() - started) * 1000, 3)
+
+
+class DatabaseHealthCheck(BaseHealthCheck):
+    """Check that a database alias accepts queries."""
+
+    def __init__(self, alias: str = "default") -> None:
+        """Initialize the check for the given database alias."""
+        self.alias = alias
+        self.name = f"database:{alias}"
+
+    def check(self) -> Optional[dict]:
+        """Run a trivial query on the database.
+
+        Returns:
+            The usage of the connection pool, if the alias uses one.
+
+        """
+        connection = connections[self.alias]
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT 1")
+        except Exception:
+            connection.close_if_unusable_or_obsolete()
+            raise
+        if getattr(connection, "pool", None) is not None:
+            # Give the connection back, the check thread would hold it otherwise.
+            connection.close()
+        return self.get_pool_details(connection)
+
+    @staticmethod
+    def get_pool_details(connection: BaseDatabaseWrapper) -> Optional[dict]:
+        """Return the size, usage and saturation of the connection pool.
+
+        Args:
+            connection: The database connection.
+
+        Returns:
+            None if the connection is not pooled, otherwise the pool usage,
+            where a saturation of 1 means every connection is checked out.
+
+        """
+        pool = getattr(connection, "pool", None)
+        if pool is None:
+            return None
+        stats = pool.get_stats()
+        size = stats.get("pool_size", 0)
+        in_use = size - stats.get("pool_available", 0)
+        return {
+            "pool": {
+                "size": size,
+                "max_size": pool.max_size,
+                "in_use": in_use,
+                "waiting": stats.get("requests_waiting", 0),
+                "saturation": round(in_use / pool.max_size, 3) if pool.max_size else 0,
+            }
+        }
+
+
+class CacheHealthCheck(BaseHealthCheck):
+    """Check that a cache alias can store and return a value."""
+
+    def __init__(self, alias: str = "default") -> None:
+        """Initialize the check for the given cache alias."""
+        self.alias = alias
+        self.name = f"cache:{alias}"
+
+    def check(self) -> None:
+        """Write and read back a value in the cache."""
+        cache = caches[self.alias]
+        cache.set(CacheKey.HEALTH_CHECK_KEY, CacheKey.HEALTH_CHECK_VALUE, timeout=5)
+        if cache.get(CacheKey.HEALTH_CHECK_KEY) != CacheKey.HEALTH_CHECK_VALUE:
+            raise ValueError("Cache did not return expected value")
+
+    async def acheck(self) -> None:
+        """Write and read back a value through the async cache API."""
+        cache = caches[self.alias]
+        await cache.aset(CacheKey.HEALTH_CHECK_KEY, CacheKey.HEALTH_CHECK_VALUE, timeout=5)
+        if await cache.aget(CacheKey.HEALTH_CHECK_KEY) != CacheKey.HEALTH_CHECK_VALUE:
+            raise ValueError("Cache did not return expected value")
+
+
+class ReplicaHealthCheck(BaseHealthCheck):
+    """Check a read replica and report its replication lag.
+
+    Not critical: while a replica is ejected, reads go to the primary.
+    """
+
+    critical = False
+
+    def __init__(self, alias: str) -> None:
+        """Initialize the check for the given replica alias."""
+        self.alias = alias
+        self.name = f"database:{alias}"
+
+    def check(self) -> dict:
+        """Probe the replica, ejecting it if it fails or lags.
+
+        Returns:
+            The replication lag and whether the replica is ejected.
+
+        Raises:
+            ValueError: If the replica is ejected.
+
+        """
+        replicas = get_replicas()
+        if not replicas.check(self.alias):
+            raise ValueError(replicas.states[self.alias].error)
+        return {"replica": replicas.states[self.alias].as_dict()}
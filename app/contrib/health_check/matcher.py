@@ -0,0 +1,158 @@
+import ipaddress
+import logging
+from typing import Dict, Iterable, Optional, Set, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+IPAddress = Union[ipaddress.IPv4Address, ipaddress.IPv6Address]
+
+
+class PathPrefixTrie:
+    """Character trie answering "does any registered prefix start this path?".
+
+    A lookup walks the path once, so its cost depends on the path length and
+    not on how many prefixes are registered. Each prefix can carry a value,
+    returned by ``find`` for the longest matching prefix.
+    """
+
+    _END = ""
+
+    def __init__(self, prefixes: Iterable[str] = ()) -> None:
+        """Build the trie from the given prefixes."""
+        self._root: Dict[str, dict] = {}
+        for prefix in prefixes:
+            self.add(prefix)
+
+    def add(self, prefix: str, value: object = True) -> None:
+        """Register a prefix, optionally with a value."""
+        node = self._root
+        for char in prefix:
+            node = node.setdefault(char, {})
+        node[self._END] = value
+
+    def match(self, path: str) -> bool:
+        """Check whether the path starts with any registered prefix.
+
+        Args:
+            path: The request path.
+
+        Returns:
+            True if a registered prefix matches, False otherwise.
+
+        """
+        node = self._root
+        if self._END in node:
+            return True
+        for char in path:
+            node = node.get(char)
+            if node is None:
+                return False
+            if self._END in node:
+                return True
+        return False
+
+    def find(self, path: str, default: object = None) -> object:
+        """Return the value of the longest registered prefix of the path.
+
+        Args:
+            path: The request path.
+            default: Value returned when no prefix matches.
+
+        Returns:
+            The value registered with the longest matching prefix, or ``default``.
+
+        """
+        node = self._root
+        value = node.get(self._END, default)
+        for char in path:
+            node = node.get(char)
+            if node is None:
+                break
+            if self._END in node:
+                value = node[self._END]
+        return value
+
+
+class IPAddressSet:
+    """Hashed set of IP addresses and CIDR ranges.
+
+    Single addresses are kept in a set of strings. Networks are grouped by
+    prefix length, so a lookup costs one hash probe per distinct prefix length.
+    """
+
+    def __init__(self, entries: Iterable[str] = ()) -> None:
+        """Build the set from addresses or CIDR ranges."""
+        self._addresses: Set[str] = set()
+        self._networks: Dict[Tuple[int, int], Set[int]] = {}
+        for entry in entries:
+            self.add(entry)
+
+    def add(self, entry: str) -> None:
+        """Register an address or CIDR range, ignoring invalid entries."""
+        try:
+            network = ipaddress.ip_network(str(entry).strip(), strict=False)
+        except ValueError:
+            logger.warning("MAINTENANCE: Ignoring invalid allowed IP: %s", entry)
+            return
+        if network.prefixlen == network.max_prefixlen:
+            self._addresses.add(str(network.network_address))
+            return
+        key = (network.version, network.prefixlen)
+        self._networks.setdefault(key, set()).add(int(network.network_address))
+
+    def __contains__(self, value: Optional[str]) -> bool:
+        """Check whether the address is allowed."""
+        if not value:
+            return False
+        if value in self._addresses:
+            return True
+        address = self._parse(value)
+        if address is None:
+            return False
+        if str(address) in self._addresses:
+            return True
+        return self._in_networks(address)
+
+    def _in_networks(self, address: IPAddress) -> bool:
+        """Check whether the address falls into a registered network."""
+        value = int(address)
+        for (version, prefixlen), networks in self._networks.items():
+            if version != address.version:
+                continue
+            shift = address.max_prefixlen - prefixlen
+            if (value >> shift) << shift in networks:
+                return True
+        return False
+
+    @staticmethod
+    def _parse(value: str) -> Optional[IPAddress]:
+        """Parse an address, unwrapping IPv4-mapped IPv6 addresses."""
+        try:
+            address = ipaddress.ip_address(value)
+        except ValueError:
+            return None
+        if address.version == 6 and address.ipv4_mapped:
+            return address.ipv4_mapped
+        return address
+
+
+class MaintenanceAllowList:
+    """Compiled maintenance-mode allow-list of URL prefixes and client IPs."""
+
+    def __init__(self, urls: Iterable[str] = (), ips: Iterable[str] = ()) -> None:
+        """Compile the allow-list."""
+        self.urls = PathPrefixTrie(urls)
+        self.ips = IPAddressSet(ips)
+
+    def allows(self, path: str, remote_addr: Optional[str]) -> bool:
+        """Check whether the request may bypass maintenance mode.
+
+        Args:
+            path: The request path.
+            remote_addr: The client address.
+
+        Returns:
+            True if the path or the address is allowed, False otherwise.
+
+        """
+        return self.urls.match(path) or remote_addr in self.ips
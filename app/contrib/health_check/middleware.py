@@ -1,23 +1,30 @@
 from http import HTTPStatus
-from typing import Callable
+from typing import Callable, Mapping, Optional, Tuple
 
-from django.core.cache import cache
-from django.db import connection
 from django.http import HttpRequest, HttpResponse, JsonResponse
 
 from app.contrib.config import config
-from app.contrib.constants import CacheKey
 from app.contrib.exception import ServiceUnavailable
+from app.contrib.health_check.matcher import MaintenanceAllowList
+from app.contrib.health_check.registry import HealthReport, registry
 from app.contrib.health_check.throttling import HealthCheckThrottle
+from app.contrib.middleware import BaseMiddleware
 
 
-class HealthCheckMiddleware:
-    """Health check middleware."""
+class HealthCheckMiddleware(BaseMiddleware):
+    """Health check middleware.
+
+    Serves a liveness probe that only proves the process answers, and a
+    readiness probe (also served on ``HEALTH_CHECK_ENDPOINT``) that reports
+    the registered dependency checks.
+    """
 
     def __init__(self, get_response: Callable) -> None:
         """Initialize the middleware."""
-        self.get_response = get_response
+        super().__init__(get_response)
         self.health_check_path = config.HEALTH_CHECK_ENDPOINT
+        self.liveness_path = config.HEALTH_CHECK_LIVENESS_ENDPOINT
+        self.readiness_paths = {self.health_check_path, config.HEALTH_CHECK_READINESS_ENDPOINT}
         self.throttle = HealthCheckThrottle()
 
     def __call__(self, request: HttpRequest) -> HttpResponse:
@@ -31,12 +38,45 @@ class HealthCheckMiddleware:
             or the next middleware's response.
 
         """
-        if request.path == self.health_check_path:
+        if self.async_mode:
+            return self.__acall__(request)
+
+        path = request.path
+        if path == self.liveness_path:
+            if not self.throttle.allow_request(request, None):
+                return HttpResponse(status=HTTPStatus.TOO_MANY_REQUESTS)
+            return self.liveness(request)
+        if path in self.readiness_paths:
             if not self.throttle.allow_request(request, None):
                 return HttpResponse(status=HTTPStatus.TOO_MANY_REQUESTS)
             return self.health_check(request)
         return self.get_response(request)
 
+    async def __acall__(self, request: HttpRequest) -> HttpResponse:
+        """Async version of ``__call__``."""
+        path = request.path
+        if path == self.liveness_path:
+            if not self.throttle.allow_request(request, None):
+                return HttpResponse(status=HTTPStatus.TOO_MANY_REQUESTS)
+            return self.liveness(request)
+        if path in self.readiness_paths:
+            if not self.throttle.allow_request(request, None):
+                return HttpResponse(status=HTTPStatus.TOO_MANY_REQUESTS)
+            return self.report_response(await registry.arun())
+        return await self.get_response(request)
+
+    def liveness(self, _request: HttpRequest) -> HttpResponse:
+        """Report that the process is up without touching any dependency.
+
+        Args:
+            _request: The incoming HTTP request.
+
+        Returns:
+            HTTP 200 response.
+
+        """
+        return JsonResponse({"status": "ok"}, status=HTTPStatus.OK)
+
     def health_check(self, _request: HttpRequest) -> HttpResponse:
         """Perform health checks and return an HTTP response.
 
@@ -44,34 +84,41 @@ class HealthCheckMiddleware:
             _request: The incoming HTTP request.
 
         Returns:
-            HTTP response indicating the health status.
+            HTTP response indicating the health status, with the status and
+            latency of each check.
+
+        """
+        return self.report_response(registry.run())
+
+    @staticmethod
+    def report_response(report: HealthReport) -> HttpResponse:
+        """Build the HTTP response for a health report.
+
+        Args:
+            report: The health report.
+
+        Returns:
+            HTTP 200 response if every check passed, HTTP 503 otherwise.
 
         """
-        # Check database connectivity
-        try:
-            connection.ensure_connection()
-        except Exception as e:
-            exception = ServiceUnavailable(detail=f"database unavailable: {e}")
-            return JsonResponse(exception.get_full_details(), status=exception.status_code)
-
-        # Check cache connectivity (using the default cache)
-        try:
-            cache.set(CacheKey.HEALTH_CHECK_KEY, CacheKey.HEALTH_CHECK_VALUE, timeout=5)
-            if cache.get(CacheKey.HEALTH_CHECK_KEY) != CacheKey.HEALTH_CHECK_VALUE:
-                raise ValueError("Cache did not return expected value")
-        except Exception as e:
-            exception = ServiceUnavailable(detail=f"cache unavailable: {e}")
-            return JsonResponse(exception.get_full_details(), status=exception.status_code)
-
-        return HttpResponse(status=HTTPStatus.OK)
-
-
-class MaintenanceMiddleware:
+        if report.healthy:
+            return JsonResponse(report.as_dict(), status=HTTPStatus.OK)
+
+        exception = ServiceUnavailable(detail=report.error_message)
+        data = exception.get_full_details()
+        data["checks"] = report.as_dict()["checks"]
+        return JsonResponse(data, status=exception.status_code)
+
+
+class MaintenanceMiddleware(BaseMiddleware):
     """Middleware that puts the site into maintenance mode."""
 
     def __init__(self, get_response: Callable) -> None:
         """Initialize the middleware."""
-        self.get_response = get_response
+        super().__init__(get_response)
+        self._allow_list = MaintenanceAllowList()
+        self._allow_list_sources: Optional[Tuple[list, list]] = None
+        self._allow_list_snapshot: Optional[Mapping] = None
 
     def __call__(self, request: HttpRequest) -> HttpResponse:
         """Process each request to determine if maintenance mode is active.
@@ -83,21 +130,69 @@ class MaintenanceMiddleware:
             HTTP response, either the regular response or the maintenance response.
 
         """
-        if not config.MAINTENANCE_ENABLE:
+        if self.async_mode:
+            return self.__acall__(request)
+
+        snapshot = config.snapshot
+        if not config.resolve(snapshot, "MAINTENANCE_ENABLE"):
             return self.get_response(request)
 
         # Allow staff to bypass maintenance mode.
         if hasattr(request, "user") and request.user.is_staff:
             return self.get_response(request)
 
-        # Allow access to specific URLs (e.g., admin, login, a specific API endpoint).
-        if any(request.path.startswith(url) for url in config.MAINTENANCE_ALLOWED_URLS):
+        # Allow access to specific URLs (e.g., admin, login, a specific API endpoint)
+        # and from specific IP addresses or CIDR ranges.
+        if self.get_allow_list(snapshot).allows(request.path, request.META.get("REMOTE_ADDR")):
             return self.get_response(request)
 
-        # Allow access from specific IP addresses.
-        if request.META.get("REMOTE_ADDR") in config.MAINTENANCE_ALLOWED_IPS:
-            return self.get_response(request)
+        return self.maintenance_response(snapshot)
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponse:
+        """Async version of ``__call__``."""
+        snapshot = await config.asnapshot()
+        if not config.resolve(snapshot, "MAINTENANCE_ENABLE"):
+            return await self.get_response(request)
 
-        # Return a 503 Service Unavailable response with a custom message.
-        exception = ServiceUnavailable(detail=config.MAINTENANCE_MESSAGE)
+        # Allow staff to bypass maintenance mode.
+        if hasattr(request, "auser"):
+            user = await request.auser()
+        else:
+            user = getattr(request, "user", None)
+        if user is not None and user.is_staff:
+            return await self.get_response(request)
+
+        if self.get_allow_list(snapshot).allows(request.path, request.META.get("REMOTE_ADDR")):
+            return await self.get_response(request)
+
+        return self.maintenance_response(snapshot)
+
+    def get_allow_list(self, snapshot: Optional[Mapping] = None) -> MaintenanceAllowList:
+        """Return the compiled allow-list, rebuilding it when the config changed.
+
+        Args:
+            snapshot: The config snapshot to read the allow-list from.
+                Defaults to the current snapshot.
+
+        Returns:
+            The compiled maintenance allow-list.
+
+        """
+        if snapshot is None:
+            snapshot = config.snapshot
+        if snapshot is not self._allow_list_snapshot:
+            sources = (
+                list(config.resolve(snapshot, "MAINTENANCE_ALLOWED_URLS")),
+                list(config.resolve(snapshot, "MAINTENANCE_ALLOWED_IPS")),
+            )
+            if sources != self._allow_list_sources:
+                self._allow_list = MaintenanceAllowList(*sources)
+                self._allow_list_sources = sources
+            self._allow_list_snapshot = snapshot
+        return self._allow_list
+
+    @staticmethod
+    def maintenance_response(snapshot: Mapping) -> HttpResponse:
+        """Return a 503 Service Unavailable response with the custom message."""
+        exception = ServiceUnavailable(detail=config.resolve(snapshot, "MAINTENANCE_MESSAGE"))
         return JsonResponse(exception.get_full_details(), status=exception.status_code)
@@ -0,0 +1,208 @@
+import asyncio
+import logging
+import threading
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import List, NamedTuple, Optional, Tuple
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+from app.contrib.constants import HealthCheckConstant
+from app.contrib.health_check.checks import (
+    BaseHealthCheck,
+    CacheHealthCheck,
+    CheckResult,
+    DatabaseHealthCheck,
+    ReplicaHealthCheck,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class HealthReport(NamedTuple):
+    """Aggregated outcome of all registered health checks."""
+
+    results: Tuple[CheckResult, ...]
+
+    @property
+    def healthy(self) -> bool:
+        """Whether every critical check passed."""
+        return all(result.healthy or not result.critical for result in self.results)
+
+    @property
+    def error_message(self) -> str:
+        """Summary of failed checks, e.g. ``database:default unavailable: ...``."""
+        return "; ".join(
+            f"{result.name} unavailable: {result.error}"
+            for result in self.results
+            if not result.healthy
+        )
+
+    def as_dict(self) -> dict:
+        """Return the JSON-serializable form of the report."""
+        return {
+            "status": "ok" if self.healthy else "error",
+            "checks": {result.name: result.as_dict() for result in self.results},
+        }
+
+
+class HealthCheckRegistry:
+    """Registry of health checks.
+
+    Checks run in parallel with a per-check timeout and the report is cached
+    in-process for ``HEALTH_CHECK_CACHE_TTL`` seconds, so a burst of probes
+    costs one real round of checks.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the registry."""
+        self._checks: Optional[List[BaseHealthCheck]] = None
+        self._extra_checks: List[BaseHealthCheck] = []
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._report: Optional[HealthReport] = None
+        self._report_at = 0.0
+        self._lock = threading.Lock()
+        self._async_locks: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+    def register(self, check: BaseHealthCheck) -> BaseHealthCheck:
+        """Register a user-defined check.
+
+        Args:
+            check: The health check instance.
+
+        Returns:
+            The registered check.
+
+        """
+        self._extra_checks.append(check)
+        self._checks = None
+        return check
+
+    def get_checks(self) -> List[BaseHealthCheck]:
+        """Return the database, replica, cache and user-defined checks."""
+        if self._checks is None:
+            replicas = getattr(settings, "DATABASE_REPLICAS", [])
+            checks: List[BaseHealthCheck] = [
+                ReplicaHealthCheck(alias) if alias in replicas else DatabaseHealthCheck(alias)
+                for alias in settings.DATABASES
+            ]
+            checks += [CacheHealthCheck(alias) for alias in settings.CACHES]
+            checks += [
+                import_string(path)() for path in getattr(settings, "HEALTH_CHECK_EXTRA_CHECKS", [])
+            ]
+            self._checks = checks + self._extra_checks
+        return self._checks
+
+    def run(self) -> HealthReport:
+        """Return the cached report, running the checks when it has expired.
+
+        Returns:
+            The health report.
+
+        """
+        report = self._get_cached_report()
+        if report is not None:
+            return report
+        with self._lock:
+            report = self._get_cached_report()
+            if report is None:
+                report = HealthReport(self._run_checks())
+                self._report = report
+                self._report_at = time.monotonic()
+            return report
+
+    async def arun(self) -> HealthReport:
+        """Async version of ``run``.
+
+        Returns:
+            The health report.
+
+        """
+        report = self._get_cached_report()
+        if report is not None:
+            return report
+        async with self._get_async_lock():
+            report = self._get_cached_report()
+            if report is None:
+                report = HealthReport(await self._arun_checks())
+                self._report = report
+                self._report_at = time.monotonic()
+            return report
+
+    def clear(self) -> None:
+        """Drop the cached report and the compiled check list."""
+        self._report = None
+        self._checks = None
+
+    def _get_cached_report(self) -> Optional[HealthReport]:
+        """Return the cached report if it is still fresh."""
+        ttl = getattr(settings, "HEALTH_CHECK_CACHE_TTL", HealthCheckConstant.CACHE_TTL)
+        if self._report is not None and time.monotonic() - self._report_at < ttl:
+            return self._report
+        return None
+
+    def _run_checks(self) -> Tuple[CheckResult, ...]:
+        """Run every check in parallel, failing the ones that time out."""
+        checks = self.get_checks()
+        executor = self._get_executor()
+        started = time.monotonic()
+        futures = [(check, executor.submit(check.run_in_thread)) for check in checks]
+
+        results: List[CheckResult] = []
+        for check, future in futures:
+            remaining = max(0.0, started + check.timeout - time.monotonic())
+            try:
+                results.append(future.result(timeout=remaining))
+            except FutureTimeoutError:
+                logger.warning("HEALTH CHECK: %s timed out after %ss", check.name, check.timeout)
+                latency_ms = round((time.monotonic() - started) * 1000, 3)
+                results.append(
+                    CheckResult(check.name, False, latency_ms, "timed out", critical=check.critical)
+                )
+        return tuple(results)
+
+    async def _arun_checks(self) -> Tuple[CheckResult, ...]:
+        """Run every check concurrently on the event loop."""
+        checks = self.get_checks()
+        started = time.monotonic()
+        outcomes = await asyncio.gather(
+            *(asyncio.wait_for(check.arun(), check.timeout) for check in checks),
+            return_exceptions=True,
+        )
+
+        results: List[CheckResult] = []
+        for check, outcome in zip(checks, outcomes):
+            if isinstance(outcome, CheckResult):
+                results.append(outcome)
+                continue
+            logger.warning("HEALTH CHECK: %s timed out after %ss", check.name, check.timeout)
+            latency_ms = round((time.monotonic() - started) * 1000, 3)
+            results.append(
+                CheckResult(check.name, False, latency_ms, "timed out", critical=check.critical)
+            )
+        return tuple(results)
+
+    def _get_async_lock(self) -> asyncio.Lock:
+        """Return the lock serializing async runs on the current event loop."""
+        loop = asyncio.get_running_loop()
+        lock = self._async_locks.get(loop)
+        if lock is None:
+            lock = self._async_locks[loop] = asyncio.Lock()
+        return lock
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Return the shared thread pool, creating it on first use."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=getattr(
+                    settings, "HEALTH_CHECK_MAX_WORKERS", HealthCheckConstant.MAX_WORKERS
+                ),
+                thread_name_prefix="health-check",
+            )
+        return self._executor
+
+
+registry = HealthCheckRegistry()
@@ -5,11 +5,17 @@ from django.http.response import HttpResponseBase
 
 from rest_framework.throttling import AnonRateThrottle
 
+from app.contrib.throttling import LocalWindowStore, SlidingWindowThrottleMixin
 
-class HealthCheckThrottle(AnonRateThrottle):
-    """Rate limiting for health check endpoint."""
+
+class HealthCheckThrottle(SlidingWindowThrottleMixin, AnonRateThrottle):
+    """Rate limiting for health check endpoint.
+
+    Counters are kept in process, so a probe never touches the cache.
+    """
 
     rate = "60/minute"  # Limit 60 requests/minute
+    store = LocalWindowStore()
 
     def get_cache_key(self, request: HttpRequest, _view: Callable[..., HttpResponseBase]) -> str:
         """Generate unique cache key for request."""
@@ -0,0 +1,108 @@
+from typing import Dict, Iterable, List, Optional
+
+from django.core.cache.backends import db, filebased, locmem, memcached, redis
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+
+from app.contrib.instrumentation.timeline import timed
+from app.contrib.metrics.registry import cache_requests
+
+MISSING = object()
+
+
+class TimedCacheMixin:
+    """Count the calls of a cache backend in the request timeline.
+
+    Outside a timed request, each call only checks for a timeline. Calls
+    made by other calls, such as ``get_or_set`` or a generic ``incr``, are
+    counted once. Queries of ``DatabaseCache`` are also counted as ``db``.
+    Single-key lookups are also counted as hits or misses in the metrics.
+    """
+
+    def get(self, key: str, default: object = None, version: Optional[int] = None) -> object:
+        """Get a value, counting the lookup as a hit or a miss."""
+        value = timed("cache", super().get, key, MISSING, version)
+        if value is MISSING:
+            cache_requests.inc(("miss",))
+            return default
+        cache_requests.inc(("hit",))
+        return value
+
+    def set(
+        self,
+        key: str,
+        value: object,
+        timeout: object = DEFAULT_TIMEOUT,
+        version: Optional[int] = None,
+    ) -> None:
+        """Set a value."""
+        return timed("cache", super().set, key, value, timeout, version)
+
+    def add(
+        self,
+        key: str,
+        value: object,
+        timeout: object = DEFAULT_TIMEOUT,
+        version: Optional[int] = None,
+    ) -> bool:
+        """Set a value if the key doesn't exist."""
+        return timed("cache", super().add, key, value, timeout, version)
+
+    def touch(
+        self, key: str, timeout: object = DEFAULT_TIMEOUT, version: Optional[int] = None
+    ) -> bool:
+        """Update the expiry of a key."""
+        return timed("cache", super().touch, key, timeout, version)
+
+    def delete(self, key: str, version: Optional[int] = None) -> bool:
+        """Delete a key."""
+        return timed("cache", super().delete, key, version)
+
+    def has_key(self, key: str, version: Optional[int] = None) -> bool:
+        """Check whether a key exists."""
+        return timed("cache", super().has_key, key, version)
+
+    def incr(self, key: str, delta: int = 1, version: Optional[int] = None) -> int:
+        """Increment a value."""
+        return timed("cache", super().incr, key, delta, version)
+
+    def decr(self, key: str, delta: int = 1, version: Optional[int] = None) -> int:
+        """Decrement a value."""
+        return timed("cache", super().decr, key, delta, version)
+
+    def get_many(self, keys: Iterable[str], version: Optional[int] = None) -> Dict:
+        """Get several values."""
+        return timed("cache", super().get_many, keys, version)
+
+    def set_many(
+        self, data: Dict, timeout: object = DEFAULT_TIMEOUT, version: Optional[int] = None
+    ) -> List[str]:
+        """Set several values."""
+        return timed("cache", super().set_many, data, timeout, version)
+
+    def delete_many(self, keys: Iterable[str], version: Optional[int] = None) -> None:
+        """Delete several keys."""
+        return timed("cache", super().delete_many, keys, version)
+
+    def clear(self) -> None:
+        """Delete every key."""
+        return timed("cache", super().clear)
+
+
+class LocMemCache(TimedCacheMixin, locmem.LocMemCache):
+    """Timed ``LocMemCache``."""
+
+
+class FileBasedCache(TimedCacheMixin, filebased.FileBasedCache):
+    """Timed ``FileBasedCache``."""
+
+
+class DatabaseCache(TimedCacheMixin, db.DatabaseCache):
+    """Timed ``DatabaseCache``."""
+
+
+class RedisCache(TimedCacheMixin, redis.RedisCache):
+    """Timed ``RedisCache``."""
+
+
+class PyMemcacheCache(TimedCacheMixin, memcached.PyMemcacheCache):
+    """Timed ``PyMemcacheCache``."""
@@ -0,0 +1,186 @@
+import logging
+import time
+from typing import Callable, List, Tuple
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import HttpRequest, HttpResponse
+
+from app.contrib.constants import TimingConstant
+from app.contrib.instrumentation.timeline import (
+    Timeline,
+    enable_db_timing,
+    end_timeline,
+    get_timeline,
+    start_timeline,
+)
+from app.contrib.middleware import BaseMiddleware
+from app.contrib.request_logging.logger import LazyJSON
+
+logger = logging.getLogger(__name__)
+
+
+def is_timing_enabled() -> bool:
+    """Check whether request timing is enabled."""
+    return getattr(settings, "SERVER_TIMING_ENABLED", TimingConstant.ENABLED)
+
+
+class MiddlewareSpan(BaseMiddleware):
+    """Measure the time spent in the rest of the middleware stack.
+
+    ``get_timed_middleware`` puts one in front of each middleware and one in
+    front of the view; the difference between consecutive spans is the time
+    spent in the middleware between them. Not loaded when timing is disabled.
+    """
+
+    def __init__(self, get_response: Callable) -> None:
+        """Initialize the middleware.
+
+        Raises:
+            MiddlewareNotUsed: If timing is disabled.
+
+        """
+        if not is_timing_enabled():
+            raise MiddlewareNotUsed
+        super().__init__(get_response)
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        """Time the inner stack."""
+        if self.async_mode:
+            return self.__acall__(request)
+        timeline = get_timeline()
+        if timeline is None:
+            return self.get_response(request)
+        index = timeline.enter_span()
+        started = time.perf_counter_ns()
+        try:
+            return self.get_response(request)
+        finally:
+            timeline.spans[index] = time.perf_counter_ns() - started
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponse:
+        """Async version of ``__call__``."""
+        timeline = get_timeline()
+        if timeline is None:
+            return await self.get_response(request)
+        index = timeline.enter_span()
+        started = time.perf_counter_ns()
+        try:
+            return await self.get_response(request)
+        finally:
+            timeline.spans[index] = time.perf_counter_ns() - started
+
+
+class ServerTimingMiddleware(BaseMiddleware):
+    """Record where each request spends its time.
+
+    Must be the first middleware. It starts a ``Timeline`` for the request,
+    which ``MiddlewareSpan``, the database execute wrapper and the timed
+    cache backends fill in. Once the response is ready, the timings are
+    attached to ``request.timeline`` and, depending on the settings, sent in
+    a ``Server-Timing`` header (``SERVER_TIMING_HEADER``) and logged in one
+    summary line with the request id (``SERVER_TIMING_LOG``) for requests
+    taking at least ``SERVER_TIMING_SLOW_MS``.
+
+    Not loaded when ``SERVER_TIMING_ENABLED`` is off, so it then costs
+    nothing; the timed cache backends only check for a timeline.
+    """
+
+    def __init__(self, get_response: Callable) -> None:
+        """Initialize the middleware.
+
+        Raises:
+            MiddlewareNotUsed: If timing is disabled.
+
+        """
+        if not is_timing_enabled():
+            raise MiddlewareNotUsed
+        super().__init__(get_response)
+        self.names = self.get_span_names(settings.MIDDLEWARE)
+        self.header = getattr(settings, "SERVER_TIMING_HEADER", TimingConstant.HEADER)
+        self.log = getattr(settings, "SERVER_TIMING_LOG", TimingConstant.LOG)
+        self.slow_ns = int(getattr(settings, "SERVER_TIMING_SLOW_MS", TimingConstant.SLOW_MS) * 1e6)
+        enable_db_timing()
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        """Time the request."""
+        if self.async_mode:
+            return self.__acall__(request)
+        timeline, token = start_timeline()
+        try:
+            response = self.get_response(request)
+        finally:
+            end_timeline(token)
+        return self.process_response(request, response, timeline)
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponse:
+        """Async version of ``__call__``."""
+        timeline, token = start_timeline()
+        try:
+            response = await self.get_response(request)
+        finally:
+            end_timeline(token)
+        return self.process_response(request, response, timeline)
+
+    @staticmethod
+    def get_span_names(middleware: List[str]) -> List[str]:
+        """Return the name of what each ``MiddlewareSpan`` measures.
+
+        Args:
+            middleware: The ``MIDDLEWARE`` setting.
+
+        Returns:
+            The class name of the middleware following each span, or
+            ``view`` for the last one.
+
+        """
+        span_path = f"{MiddlewareSpan.__module__}.{MiddlewareSpan.__qualname__}"
+        names = []
+        for index, path in enumerate(middleware):
+            if path == span_path:
+                following = middleware[index + 1] if index + 1 < len(middleware) else None
+                names.append(following.rsplit(".", 1)[-1] if following else "view")
+        return names
+
+    def process_response(
+        self, request: HttpRequest, response: HttpResponse, timeline: Timeline
+    ) -> HttpResponse:
+        """Attach, send and log the timings of the request.
+
+        Args:
+            request: The HttpRequest object.
+            response: The response.
+            timeline: The timeline of the request.
+
+        Returns:
+            The response.
+
+        """
+        total_ns = time.perf_counter_ns() - timeline.started
+        request.timeline = timeline
+        log = self.log and total_ns >= self.slow_ns and logger.isEnabledFor(logging.INFO)
+        if not (self.header or log):
+            return response
+        metrics = self.get_metrics(timeline, total_ns)
+        if self.header:
+            response["Server-Timing"] = ", ".join(
+                f"{name};dur={duration_ns / 1e6:.3f}" for name, duration_ns in metrics
+            )
+        if log:
+            record = {
+                "request_id": getattr(request, "id", None),
+                "method": request.method,
+                "path": request.path,
+                "status": response.status_code,
+                "timings_ms": {name: round(duration / 1e6, 3) for name, duration in metrics},
+                "counts": timeline.counts,
+            }
+            logger.info("TIMING: %s", LazyJSON(record))
+        return response
+
+    def get_metrics(self, timeline: Timeline, total_ns: int) -> List[Tuple[str, int]]:
+        """Return the middleware spans, DB and cache totals and the total time."""
+        metrics = timeline.get_middleware_spans(self.names)
+        metrics.extend(timeline.totals.items())
+        metrics.append(("total", total_ns))
+        return metrics
@@ -0,0 +1,124 @@
+import time
+from contextvars import ContextVar
+from typing import Callable, Dict, List, Optional, Set, Tuple, TypeVar
+
+from django.db import connections
+from django.db.backends.base.base import BaseDatabaseWrapper
+from django.db.backends.signals import connection_created
+
+T = TypeVar("T")
+
+
+class Timeline:
+    """Timings recorded while handling one request.
+
+    Middleware spans are kept in the order the middlewares were entered,
+    one slot each. DB queries and cache calls are only summed per kind, so
+    the memory and work per request are bounded however many there are.
+    """
+
+    __slots__ = ("started", "spans", "totals", "counts", "active")
+
+    def __init__(self) -> None:
+        """Start the timeline."""
+        self.started = time.perf_counter_ns()
+        self.spans: List[Optional[int]] = []
+        self.totals: Dict[str, int] = {}
+        self.counts: Dict[str, int] = {}
+        self.active: Set[str] = set()
+
+    def enter_span(self) -> int:
+        """Reserve the slot of the next middleware span and return its index."""
+        self.spans.append(None)
+        return len(self.spans) - 1
+
+    def add(self, kind: str, duration_ns: int) -> None:
+        """Count one call of the given kind, e.g. ``db`` or ``cache``."""
+        self.totals[kind] = self.totals.get(kind, 0) + duration_ns
+        self.counts[kind] = self.counts.get(kind, 0) + 1
+
+    def call(self, kind: str, func: Callable[..., T], *args: object, **kwargs: object) -> T:
+        """Call the function and count its duration.
+
+        Calls made while another call of the same kind is running, such as
+        a cache ``incr`` implemented with ``get`` and ``set``, are not
+        counted again.
+        """
+        if kind in self.active:
+            return func(*args, **kwargs)
+        self.active.add(kind)
+        started = time.perf_counter_ns()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            self.active.discard(kind)
+            self.add(kind, time.perf_counter_ns() - started)
+
+    def get_middleware_spans(self, names: List[str]) -> List[Tuple[str, int]]:
+        """Return the time spent in each middleware itself.
+
+        Args:
+            names: Name of the middleware measured by each span, in order.
+
+        Returns:
+            Pairs of name and nanoseconds, for the middlewares that ran.
+
+        """
+        durations = [duration or 0 for duration in self.spans]
+        spans = []
+        for index, duration in enumerate(durations[: len(names)]):
+            inner = durations[index + 1] if index + 1 < len(durations) else 0
+            spans.append((names[index], max(duration - inner, 0)))
+        return spans
+
+
+_current: ContextVar[Optional[Timeline]] = ContextVar("timeline", default=None)
+
+
+def get_timeline() -> Optional[Timeline]:
+    """Return the timeline of the current request, if timing is enabled."""
+    return _current.get()
+
+
+def start_timeline() -> Tuple[Timeline, object]:
+    """Start a timeline for the current context.
+
+    Returns:
+        The timeline and the token to pass to ``end_timeline``.
+
+    """
+    timeline = Timeline()
+    return timeline, _current.set(timeline)
+
+
+def end_timeline(token: object) -> None:
+    """Detach the timeline started with ``start_timeline``."""
+    _current.reset(token)
+
+
+def timed(kind: str, func: Callable[..., T], *args: object, **kwargs: object) -> T:
+    """Call the function, counting its duration if a timeline is active."""
+    timeline = _current.get()
+    if timeline is None:
+        return func(*args, **kwargs)
+    return timeline.call(kind, func, *args, **kwargs)
+
+
+def timed_execute(
+    execute: Callable[..., T], sql: str, params: object, many: bool, context: Dict
+) -> T:
+    """Database execute wrapper counting queries in the active timeline."""
+    return timed("db", execute, sql, params, many, context)
+
+
+def install_db_timing(connection: BaseDatabaseWrapper, **_kwargs: object) -> None:
+    """Add ``timed_execute`` to the execute wrappers of the connection, once."""
+    if timed_execute not in connection.execute_wrappers:
+        connection.execute_wrappers.append(timed_execute)
+
+
+def enable_db_timing() -> None:
+    """Time the queries of the open connections and of every one opened from now on."""
+    connection_created.connect(install_db_timing, dispatch_uid="app.contrib.instrumentation")
+    for connection in connections.all(initialized_only=True):
+        install_db_timing(connection)
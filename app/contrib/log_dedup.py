@@ -0,0 +1,157 @@
+import atexit
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Hashable, List, Optional, Tuple
+
+from app.contrib.constants import LogDedupConstant
+
+
+class _Occurrences:
+    """Occurrences of one key in the current window."""
+
+    __slots__ = ("started", "count", "suppressed")
+
+    def __init__(self, started: float) -> None:
+        """Start a window."""
+        self.started = started
+        self.count = 0
+        self.suppressed = 0
+
+
+class LogDeduplicator:
+    """Let the first occurrences of a repeated event be logged, then summarize.
+
+    Within each ``window`` seconds, the first ``limit`` occurrences of a key
+    are allowed; later ones are only counted and reported in one summary
+    when the window ends. At most ``max_keys`` keys are tracked; the least
+    recently seen key is evicted (and summarized) first.
+
+    Summaries are passed to ``report(key, suppressed, window)``. Once an
+    occurrence is suppressed, a timer thread emits the summary when its
+    window ends, even if the key never occurs again; pending summaries are
+    flushed at exit, before ``logging.shutdown`` stops the log handlers.
+    """
+
+    def __init__(
+        self,
+        report: Callable[[Hashable, int, float], None],
+        limit: int = LogDedupConstant.LIMIT,
+        window: float = LogDedupConstant.WINDOW,
+        max_keys: int = LogDedupConstant.MAX_KEYS,
+        timer: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize the deduplicator."""
+        self.report = report
+        self.limit = limit
+        self.window = window
+        self.max_keys = max_keys
+        self.timer = timer
+        self._keys: OrderedDict[Hashable, _Occurrences] = OrderedDict()
+        self._lock = threading.Lock()
+        self._next_sweep = timer() + window
+        self._expiry: Optional[threading.Timer] = None
+        # Registered after logging's own hook, so it runs before it.
+        atexit.register(self.flush)
+
+    def allow(self, key: Hashable) -> bool:
+        """Count an occurrence of the key.
+
+        Args:
+            key: Identifies the event, e.g. exception class, code and view.
+
+        Returns:
+            True if this occurrence should be logged in full.
+
+        """
+        now = self.timer()
+        pending: List[Tuple[Hashable, int]] = []
+        with self._lock:
+            occurrences = self._keys.get(key)
+            if occurrences is None:
+                if len(self._keys) >= self.max_keys:
+                    evicted, oldest = self._keys.popitem(last=False)
+                    if oldest.suppressed:
+                        pending.append((evicted, oldest.suppressed))
+                occurrences = self._keys[key] = _Occurrences(now)
+            else:
+                self._keys.move_to_end(key)
+                if now - occurrences.started >= self.window:
+                    if occurrences.suppressed:
+                        pending.append((key, occurrences.suppressed))
+                    occurrences.started, occurrences.count, occurrences.suppressed = now, 0, 0
+            occurrences.count += 1
+            allowed = occurrences.count <= self.limit
+            if not allowed:
+                occurrences.suppressed += 1
+                if self._expiry is None:
+                    self._schedule(occurrences.started + self.window - now)
+            if now >= self._next_sweep:
+                pending.extend(self._sweep(now))
+        for pending_key, suppressed in pending:
+            self.report(pending_key, suppressed, self.window)
+        return allowed
+
+    def flush(self) -> None:
+        """Report every pending summary now."""
+        with self._lock:
+            if self._expiry is not None:
+                self._expiry.cancel()
+                self._expiry = None
+            pending = [
+                (key, item.suppressed) for key, item in self._keys.items() if item.suppressed
+            ]
+            self._keys.clear()
+        for key, suppressed in pending:
+            self.report(key, suppressed, self.window)
+
+    def _schedule(self, delay: float) -> None:
+        """Start the timer closing the windows that hold suppressed occurrences."""
+        self._expiry = threading.Timer(max(delay, 0.0), self._expire)
+        self._expiry.daemon = True
+        self._expiry.start()
+
+    def _expire(self) -> None:
+        """Report the summaries of the ended windows, then wait for the next one."""
+        now = self.timer()
+        with self._lock:
+            self._expiry = None
+            pending = self._sweep(now)
+            started = [item.started for item in self._keys.values() if item.suppressed]
+            if started:
+                self._schedule(min(started) + self.window - now)
+        for key, suppressed in pending:
+            self.report(key, suppressed, self.window)
+
+    def _sweep(self, now: float) -> List[Tuple[Hashable, int]]:
+        """Close the expired windows of keys that stopped occurring."""
+        self._next_sweep = now + self.window
+        pending = []
+        for key in [key for key, item in self._keys.items() if now - item.started >= self.window]:
+            item = self._keys.pop(key)
+            if item.suppressed:
+                pending.append((key, item.suppressed))
+        return pending
+
+
+def log_summary(
+    logger: logging.Logger, level: int = logging.WARNING
+) -> Callable[[Hashable, int, float], None]:
+    """Return a ``report`` callback writing summaries to the logger.
+
+    Args:
+        logger: The logger to write to.
+        level: The level of summary records.
+
+    Returns:
+        The callback.
+
+    """
+
+    def report(key: Hashable, suppressed: int, window: float) -> None:
+        logger.log(
+            level, "LOGGING: Suppressed %s repeated records of %s in %ss.", suppressed, key, window
+        )
+
+    return report
@@ -0,0 +1,253 @@
+import copy
+import logging
+import logging.handlers
+import os
+import queue
+import threading
+import weakref
+from typing import List, Optional
+
+from app.contrib.constants import LogQueueConstant
+
+
+class BatchRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """Rotating file handler that writes a batch of records with one write and flush."""
+
+    def emit_batch(self, records: List[logging.LogRecord]) -> None:
+        """Format and write the records, rotating the file at most once per batch.
+
+        Args:
+            records: The log records to write.
+
+        """
+        lines = []
+        for record in records:
+            if record.levelno < self.level or not self.filter(record):
+                continue
+            try:
+                lines.append(self.format(record) + self.terminator)
+            except Exception:
+                self.handleError(record)
+        if not lines:
+            return
+        data = "".join(lines)
+        with self.lock:
+            try:
+                if self.stream is None:
+                    self.stream = self._open()
+                if self.maxBytes > 0 and self.stream.tell() + len(data) >= self.maxBytes:
+                    self.doRollover()
+                self.stream.write(data)
+                self.stream.flush()
+            except Exception:
+                self.handleError(records[-1])
+
+
+class BatchQueueListener(logging.handlers.QueueListener):
+    """Queue listener that drains records in batches."""
+
+    def __init__(self, log_queue: queue.Queue, handler: logging.Handler, batch_size: int) -> None:
+        """Initialize the listener."""
+        super().__init__(log_queue, handler, respect_handler_level=True)
+        self.batch_size = batch_size
+
+    def enqueue_sentinel(self) -> None:
+        """Wait for room in the queue so the sentinel is never lost."""
+        self.queue.put(self._sentinel)
+
+    def _monitor(self) -> None:
+        """Drain the queue until the sentinel arrives."""
+        log_queue = self.queue
+        while True:
+            batch = [log_queue.get()]
+            while len(batch) < self.batch_size and batch[-1] is not self._sentinel:
+                try:
+                    batch.append(log_queue.get_nowait())
+                except queue.Empty:
+                    break
+            stop = batch[-1] is self._sentinel
+            if stop:
+                batch.pop()
+            if batch:
+                self.handle_batch(batch)
+            if stop:
+                return
+
+    def handle_batch(self, records: List[logging.LogRecord]) -> None:
+        """Pass the batch to every handler."""
+        for handler in self.handlers:
+            if hasattr(handler, "emit_batch"):
+                handler.emit_batch(records)
+                continue
+            for record in records:
+                if record.levelno >= handler.level:
+                    handler.handle(record)
+
+
+class QueueRotatingFileHandler(logging.handlers.QueueHandler):
+    """Non-blocking drop-in replacement for ``RotatingFileHandler``.
+
+    The request thread only puts the record on a bounded queue. A background
+    listener formats the records, writes them in batches and rotates the
+    file. When the queue is full the ``overflow`` policy applies:
+
+    - ``drop``: discard the record.
+    - ``block``: wait up to ``block_timeout`` seconds for room, then discard.
+    - ``sample``: once the queue is ``sample_threshold`` full, keep only one
+      in ``sample_rate`` records below WARNING; discard when full.
+
+    Discarded records are counted and reported by the listener.
+    """
+
+    OVERFLOW_POLICIES = ("drop", "block", "sample")
+
+    def __init__(
+        self,
+        filename: str,
+        maxBytes: int = 0,  # noqa: N803
+        backupCount: int = 0,  # noqa: N803
+        encoding: Optional[str] = None,
+        queue_size: int = LogQueueConstant.QUEUE_SIZE,
+        overflow: str = LogQueueConstant.OVERFLOW,
+        batch_size: int = LogQueueConstant.BATCH_SIZE,
+        block_timeout: float = LogQueueConstant.BLOCK_TIMEOUT,
+        sample_rate: int = LogQueueConstant.SAMPLE_RATE,
+        sample_threshold: float = LogQueueConstant.SAMPLE_THRESHOLD,
+    ) -> None:
+        """Initialize the handler and start its listener thread."""
+        if overflow not in self.OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown log queue overflow policy: {overflow}")
+        super().__init__(queue.Queue(maxsize=queue_size))
+        self.target = BatchRotatingFileHandler(
+            filename, maxBytes=maxBytes, backupCount=backupCount, encoding=encoding
+        )
+        self.overflow = overflow
+        self.batch_size = batch_size
+        self.block_timeout = block_timeout
+        self.sample_rate = max(1, sample_rate)
+        self.sample_high_water = int(queue_size * sample_threshold)
+        self.dropped = 0
+        self._sampled = 0
+        self._dropped_lock = threading.Lock()
+        self.listener: Optional[BatchQueueListener] = None
+        self.start_listener()
+        _register_fork_handler(self)
+
+    def setFormatter(self, fmt: Optional[logging.Formatter]) -> None:  # noqa: N802
+        """Format records in the listener thread instead of the caller."""
+        self.target.setFormatter(fmt)
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """Merge the arguments into the message, leaving formatting to the listener.
+
+        Arguments may be mutated once the logging call returns, so
+        ``msg % args`` is resolved here as ``QueueHandler.prepare`` does. The
+        formatter, traceback and stack are still rendered by the listener.
+        """
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        """Put the record on the queue according to the overflow policy."""
+        try:
+            if self.overflow == "block":
+                self.queue.put(record, timeout=self.block_timeout)
+                return
+            if self.overflow == "sample" and self._should_skip(record):
+                self._count_dropped()
+                return
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self._count_dropped()
+
+    def flush(self) -> None:
+        """Wait until every queued record has been written."""
+        if self.listener is not None:
+            self.listener.stop()
+            self.start_listener()
+        self.target.flush()
+
+    def close(self) -> None:
+        """Flush the queue, stop the listener and close the file."""
+        if self.listener is not None:
+            self.listener.stop()
+            self.listener = None
+        self.report_dropped()
+        self.target.close()
+        super().close()
+
+    def start_listener(self) -> None:
+        """Start a fresh listener thread on the queue."""
+        self.listener = _ReportingQueueListener(self, self.batch_size)
+        self.listener.start()
+
+    def restart_after_fork(self) -> None:
+        """Replace the queue and listener inherited from the parent process."""
+        if self.listener is not None:
+            self.queue = queue.Queue(maxsize=self.queue.maxsize)
+            self.start_listener()
+
+    def report_dropped(self) -> None:
+        """Write a summary of discarded records to the target."""
+        with self._dropped_lock:
+            dropped, self.dropped = self.dropped, 0
+        if dropped:
+            record = logging.makeLogRecord(
+                {
+                    "name": __name__,
+                    "levelno": logging.WARNING,
+                    "levelname": "WARNING",
+                    "msg": "LOGGING: Dropped %s records because the log queue was full.",
+                    "args": (dropped,),
+                }
+            )
+            self.target.emit_batch([record])
+
+    def _should_skip(self, record: logging.LogRecord) -> bool:
+        """Return True if a sampled-out record should be skipped."""
+        if record.levelno >= logging.WARNING or self.queue.qsize() < self.sample_high_water:
+            return False
+        self._sampled += 1
+        return self._sampled % self.sample_rate != 0
+
+    def _count_dropped(self) -> None:
+        """Count a discarded record."""
+        with self._dropped_lock:
+            self.dropped += 1
+
+
+class _ReportingQueueListener(BatchQueueListener):
+    """Listener that also reports the owner's discarded records after each batch."""
+
+    def __init__(self, owner: QueueRotatingFileHandler, batch_size: int) -> None:
+        """Initialize the listener for the given handler."""
+        super().__init__(owner.queue, owner.target, batch_size)
+        self.owner = weakref.ref(owner)
+
+    def handle_batch(self, records: List[logging.LogRecord]) -> None:
+        """Write the batch, then the drop summary if records were discarded."""
+        super().handle_batch(records)
+        owner = self.owner()
+        if owner is not None and owner.dropped:
+            owner.report_dropped()
+
+
+_handlers: "weakref.WeakSet[QueueRotatingFileHandler]" = weakref.WeakSet()
+
+
+def _register_fork_handler(handler: QueueRotatingFileHandler) -> None:
+    """Track the handler so its listener is restarted in forked children."""
+    _handlers.add(handler)
+
+
+def _restart_listeners() -> None:
+    """Start a new listener for every live handler; threads don't survive fork."""
+    for handler in list(_handlers):
+        handler.restart_after_fork()
+
+
+# Listener threads don't survive fork (e.g. gunicorn ``preload_app``).
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_restart_listeners)
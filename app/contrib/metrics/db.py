@@ -0,0 +1,36 @@
+import time
+from typing import Callable, Dict, TypeVar
+
+from django.db import connections
+from django.db.backends.base.base import BaseDatabaseWrapper
+from django.db.backends.signals import connection_created
+
+from app.contrib.metrics.registry import db_queries, db_query_duration
+
+T = TypeVar("T")
+
+
+def metrics_execute(
+    execute: Callable[..., T], sql: str, params: object, many: bool, context: Dict
+) -> T:
+    """Database execute wrapper counting queries and their duration by alias."""
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        labels = (context["connection"].alias,)
+        db_queries.inc(labels)
+        db_query_duration.inc(labels, time.perf_counter() - started)
+
+
+def install_db_metrics(connection: BaseDatabaseWrapper, **_kwargs: object) -> None:
+    """Add ``metrics_execute`` to the execute wrappers of the connection, once."""
+    if metrics_execute not in connection.execute_wrappers:
+        connection.execute_wrappers.append(metrics_execute)
+
+
+def enable_db_metrics() -> None:
+    """Count the queries of the open connections and of every one opened from now on."""
+    connection_created.connect(install_db_metrics, dispatch_uid="app.contrib.metrics")
+    for connection in connections.all(initialized_only=True):
+        install_db_metrics(connection)
@@ -0,0 +1,116 @@
+import hmac
+import time
+from typing import Callable
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import HttpRequest, HttpResponse, JsonResponse
+
+from rest_framework import exceptions
+
+from app.contrib.constants import MetricsConstant
+from app.contrib.health_check.matcher import IPAddressSet
+from app.contrib.metrics.db import enable_db_metrics
+from app.contrib.metrics.registry import (
+    get_store,
+    http_request_duration,
+    http_requests,
+    render_metrics,
+)
+from app.contrib.middleware import BaseMiddleware
+
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+class MetricsMiddleware(BaseMiddleware):
+    """Collect request metrics and serve them in the Prometheus text format.
+
+    Should come right after ``HealthCheckMiddleware``, so probes are not
+    counted and every other request is. Requests are labelled with their URL
+    pattern rather than their path, which keeps the number of series bounded.
+
+    ``METRICS_ENDPOINT`` returns the values of every worker, summed. It is
+    only served to ``METRICS_ALLOWED_IPS`` or to requests sending
+    ``Authorization: Bearer <METRICS_TOKEN>``; anything else gets a 403.
+
+    Not loaded when ``METRICS_ENABLED`` is off.
+    """
+
+    def __init__(self, get_response: Callable) -> None:
+        """Initialize the middleware.
+
+        Raises:
+            MiddlewareNotUsed: If metrics are disabled.
+
+        """
+        if get_store() is None:
+            raise MiddlewareNotUsed
+        super().__init__(get_response)
+        self.path = getattr(settings, "METRICS_ENDPOINT", MetricsConstant.ENDPOINT)
+        self.allowed_ips = IPAddressSet(
+            getattr(settings, "METRICS_ALLOWED_IPS", MetricsConstant.ALLOWED_IPS)
+        )
+        token = getattr(settings, "METRICS_TOKEN", None)
+        self.authorization = f"Bearer {token}".encode() if token else None
+        enable_db_metrics()
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        """Serve the metrics or count the request."""
+        if self.async_mode:
+            return self.__acall__(request)
+        if request.path == self.path:
+            return self.metrics_response(request)
+        started = time.perf_counter()
+        response = self.get_response(request)
+        self.record(request, response, time.perf_counter() - started)
+        return response
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponse:
+        """Async version of ``__call__``."""
+        if request.path == self.path:
+            return self.metrics_response(request)
+        started = time.perf_counter()
+        response = await self.get_response(request)
+        self.record(request, response, time.perf_counter() - started)
+        return response
+
+    @staticmethod
+    def record(request: HttpRequest, response: HttpResponse, duration: float) -> None:
+        """Count the request and observe its latency.
+
+        Args:
+            request: The HttpRequest object.
+            response: The response.
+            duration: Seconds spent handling the request.
+
+        """
+        match = getattr(request, "resolver_match", None)
+        route = match.route if match is not None and match.route else UNMATCHED_ROUTE
+        http_requests.inc((request.method, route, str(response.status_code)))
+        http_request_duration.observe((request.method, route), duration)
+
+    def is_allowed(self, request: HttpRequest) -> bool:
+        """Check whether the client may read the metrics."""
+        if request.META.get("REMOTE_ADDR") in self.allowed_ips:
+            return True
+        if self.authorization is None:
+            return False
+        provided = request.headers.get("Authorization", "").encode()
+        return hmac.compare_digest(provided, self.authorization)
+
+    def metrics_response(self, request: HttpRequest) -> HttpResponse:
+        """Return the metrics of every worker, or a 403 response.
+
+        Args:
+            request: The HttpRequest object.
+
+        Returns:
+            The exposition text, or HTTP 403 if the client is not allowed.
+
+        """
+        if not self.is_allowed(request):
+            exception = exceptions.PermissionDenied()
+            return JsonResponse(exception.get_full_details(), status=exception.status_code)
+        return HttpResponse(
+            render_metrics(get_store().collect()), content_type=MetricsConstant.CONTENT_TYPE
+        )
@@ -0,0 +1,217 @@
+import bisect
+import tempfile
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from django.conf import settings
+from django.dispatch import receiver
+from django.test.signals import setting_changed
+
+from app.contrib.constants import MetricsConstant
+from app.contrib.metrics.store import MetricsStore, decode_key, encode_key
+
+Samples = Dict[str, List[Tuple[Tuple[str, ...], float]]]
+
+
+def get_metrics_dir() -> Path:
+    """Return the directory shared by the workers for their metric files."""
+    directory = getattr(settings, "METRICS_DIR", None)
+    return Path(directory or Path(tempfile.gettempdir()) / MetricsConstant.DIR_NAME)
+
+
+@lru_cache(maxsize=None)
+def get_store() -> Optional[MetricsStore]:
+    """Return the metrics store, or None if metrics are disabled."""
+    if not getattr(settings, "METRICS_ENABLED", MetricsConstant.ENABLED):
+        return None
+    return MetricsStore(get_metrics_dir())
+
+
+@receiver(setting_changed)
+def _reset_store(setting: str, **_kwargs: object) -> None:
+    """Reopen the store when a ``METRICS_*`` setting changes."""
+    if setting.startswith("METRICS_"):
+        get_store.cache_clear()
+
+
+class Metric:
+    """Base class for metrics exported in the Prometheus text format.
+
+    Attributes:
+        type: The Prometheus metric type
+
+    """
+
+    type = ""
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = ()) -> None:
+        """Declare the metric and add it to the exported metrics."""
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        metrics.append(self)
+
+    def render(self, samples: Samples) -> List[str]:
+        """Return the exposition lines of the metric.
+
+        Args:
+            samples: Collected values, grouped by sample name.
+
+        Returns:
+            The ``HELP`` and ``TYPE`` lines followed by the samples.
+
+        """
+        raise NotImplementedError
+
+    def get_header(self) -> List[str]:
+        """Return the ``HELP`` and ``TYPE`` lines."""
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type}"]
+
+    def format_sample(self, name: str, labels: Sequence[str], value: float) -> str:
+        """Format one sample line."""
+        return f"{name}{format_labels(self.labels, labels)} {format_value(value)}"
+
+
+class Counter(Metric):
+    """Monotonic counter, optionally labelled."""
+
+    type = "counter"
+
+    def inc(self, labels: Tuple[str, ...] = (), amount: float = 1.0) -> None:
+        """Add the amount to the counter of the label values; no-op when disabled."""
+        store = get_store()
+        if store is not None:
+            store.inc(encode_key(self.name, labels), amount)
+
+    def render(self, samples: Samples) -> List[str]:
+        """Return the exposition lines of the counter."""
+        lines = self.get_header()
+        for labels, value in sorted(samples.get(self.name, ())):
+            lines.append(self.format_sample(self.name, labels, value))
+        return lines
+
+
+class Histogram(Metric):
+    """Distribution of observed values in fixed buckets.
+
+    Each observation increments a single bucket, the sum and the count;
+    buckets are made cumulative when exported.
+    """
+
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labels: Sequence[str] = (),
+        buckets: Sequence[float] = MetricsConstant.BUCKETS,
+    ) -> None:
+        """Declare the histogram."""
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(sorted(buckets))
+        self.bounds = (*(format_value(bucket) for bucket in self.buckets), "+Inf")
+
+    def observe(self, labels: Tuple[str, ...], value: float) -> None:
+        """Record one value for the label values; no-op when disabled."""
+        store = get_store()
+        if store is None:
+            return
+        bound = self.bounds[bisect.bisect_left(self.buckets, value)]
+        store.inc(encode_key(f"{self.name}_bucket", (*labels, bound)))
+        store.inc(encode_key(f"{self.name}_sum", labels), value)
+        store.inc(encode_key(f"{self.name}_count", labels))
+
+    def render(self, samples: Samples) -> List[str]:
+        """Return the exposition lines of the histogram."""
+        lines = self.get_header()
+        buckets: Dict[Tuple[str, ...], Dict[str, float]] = {}
+        for labels, value in samples.get(f"{self.name}_bucket", ()):
+            buckets.setdefault(labels[:-1], {})[labels[-1]] = value
+        sums = dict(samples.get(f"{self.name}_sum", ()))
+        counts = dict(samples.get(f"{self.name}_count", ()))
+        label_names = (*self.labels, "le")
+        for labels in sorted(buckets):
+            total = 0.0
+            for bound in self.bounds:
+                total += buckets[labels].get(bound, 0.0)
+                lines.append(
+                    f"{self.name}_bucket{format_labels(label_names, (*labels, bound))} "
+                    f"{format_value(total)}"
+                )
+            lines.append(self.format_sample(f"{self.name}_sum", labels, sums.get(labels, 0.0)))
+            lines.append(self.format_sample(f"{self.name}_count", labels, counts.get(labels, 0.0)))
+        return lines
+
+
+def format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    """Format label pairs, escaping the values as the text format requires."""
+    if not names:
+        return ""
+    pairs = ",".join(
+        f'{name}="{escape_label_value(str(value))}"' for name, value in zip(names, values)
+    )
+    return f"{{{pairs}}}"
+
+
+def escape_label_value(value: str) -> str:
+    """Escape backslashes, double quotes and line feeds in a label value."""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def format_value(value: float) -> str:
+    """Format a sample value, without a fraction when it is whole."""
+    value = float(value)
+    return str(int(value)) if value.is_integer() else repr(value)
+
+
+def group_samples(values: Dict[str, float]) -> Samples:
+    """Group collected values by sample name."""
+    samples: Samples = {}
+    for key, value in values.items():
+        name, labels = decode_key(key)
+        samples.setdefault(name, []).append((labels, value))
+    return samples
+
+
+def render_metrics(values: Dict[str, float]) -> str:
+    """Render collected values in the Prometheus text exposition format.
+
+    Args:
+        values: Values summed across workers, by store key.
+
+    Returns:
+        The exposition text of every declared metric.
+
+    """
+    samples = group_samples(values)
+    lines = []
+    for metric in metrics:
+        lines.extend(metric.render(samples))
+    return "\n".join(lines) + "\n"
+
+
+metrics: List[Metric] = []
+
+http_requests = Counter(
+    "http_requests_total",
+    "HTTP requests by method, route and status.",
+    ("method", "route", "status"),
+)
+http_request_duration = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by method and route.",
+    ("method", "route"),
+)
+db_queries = Counter("db_queries_total", "Database queries by connection alias.", ("alias",))
+db_query_duration = Counter(
+    "db_query_duration_seconds_total", "Time spent in database queries.", ("alias",)
+)
+cache_requests = Counter("cache_requests_total", "Cache lookups by result.", ("result",))
+throttle_rejections = Counter(
+    "throttle_rejections_total", "Requests rejected by a throttle, by scope.", ("scope",)
+)
+api_exceptions = Counter(
+    "api_exceptions_total", "API error responses by error code and status.", ("code", "status")
+)
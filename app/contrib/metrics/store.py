@@ -0,0 +1,194 @@
+import json
+import mmap
+import os
+import struct
+import threading
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Tuple
+
+from app.contrib.constants import MetricsConstant
+
+# File layout: an 8-byte header holding the number of bytes used, then
+# entries of [key length: uint32][key: utf-8, padded to 8 bytes][value: float64].
+HEADER = struct.Struct("<Q")
+KEY_LENGTH = struct.Struct("<I")
+VALUE = struct.Struct("<d")
+
+# Values of exited processes, merged by ``MetricsStore.mark_process_dead``.
+AGGREGATE_FILE = "aggregate.db"
+
+
+def _padded(length: int) -> int:
+    """Round the length up to a multiple of 8, so values are aligned."""
+    return (length + 7) & ~7
+
+
+class MmapValues:
+    """Float values of one process, kept in a memory-mapped file.
+
+    The threads of the owning process update it under a lock, held only for
+    the in-place float update. A new key is appended and the used size is
+    published after the entry is written, so a reader in another process
+    never sees a partial entry.
+    """
+
+    def __init__(self, path: Path, initial_size: int = MetricsConstant.FILE_SIZE) -> None:
+        """Create or reopen the file."""
+        self.path = path
+        self.pid = os.getpid()
+        self.offsets: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._file = path.open("a+b")
+        size = max(os.fstat(self._file.fileno()).st_size, initial_size)
+        self._file.truncate(size)
+        self._map = mmap.mmap(self._file.fileno(), size)
+        self.used = HEADER.unpack_from(self._map, 0)[0] or HEADER.size
+        for key, _value, offset in self._iter_entries(self._map, self.used):
+            self.offsets[key] = offset
+
+    def inc(self, key: str, amount: float = 1.0) -> None:
+        """Add the amount to the value of the key."""
+        with self._lock:
+            offset = self.offsets.get(key)
+            if offset is None:
+                offset = self._append(key)
+            VALUE.pack_into(self._map, offset, VALUE.unpack_from(self._map, offset)[0] + amount)
+
+    def close(self) -> None:
+        """Unmap and close the file."""
+        self._map.close()
+        self._file.close()
+
+    def _append(self, key: str) -> int:
+        """Add an entry for the key and return the offset of its value."""
+        encoded = key.encode()
+        offset = self.used + KEY_LENGTH.size + _padded(len(encoded))
+        end = offset + VALUE.size
+        if end > len(self._map):
+            self._grow(end)
+        KEY_LENGTH.pack_into(self._map, self.used, len(encoded))
+        self._map[self.used + KEY_LENGTH.size : self.used + KEY_LENGTH.size + len(encoded)] = (
+            encoded
+        )
+        VALUE.pack_into(self._map, offset, 0.0)
+        self.used = end
+        HEADER.pack_into(self._map, 0, end)
+        self.offsets[key] = offset
+        return offset
+
+    def _grow(self, needed: int) -> None:
+        """Double the file until it holds ``needed`` bytes."""
+        size = len(self._map)
+        while size < needed:
+            size *= 2
+        self._map.close()
+        self._file.truncate(size)
+        self._map = mmap.mmap(self._file.fileno(), size)
+
+    @staticmethod
+    def _iter_entries(data: bytes, used: int) -> Iterator[Tuple[str, float, int]]:
+        """Yield the key, value and value offset of each entry."""
+        position = HEADER.size
+        while position < used:
+            length = KEY_LENGTH.unpack_from(data, position)[0]
+            key_start = position + KEY_LENGTH.size
+            offset = key_start + _padded(length)
+            key = bytes(data[key_start : key_start + length]).decode()
+            yield key, VALUE.unpack_from(data, offset)[0], offset
+            position = offset + VALUE.size
+
+    @classmethod
+    def read(cls, path: Path) -> Iterator[Tuple[str, float]]:
+        """Yield the keys and values of a file written by any process."""
+        data = path.read_bytes()
+        if len(data) < HEADER.size:
+            return
+        used = min(HEADER.unpack_from(data, 0)[0], len(data))
+        for key, value, _offset in cls._iter_entries(data, used):
+            yield key, value
+
+
+class MetricsStore:
+    """Metric values shared by the worker processes through files.
+
+    Each process writes its own ``MmapValues`` file, ``{pid}.db`` in
+    ``directory``, so collecting a value costs a dict lookup and an in-place
+    float update under a lock private to the process. The exporter sums the
+    files of all workers. When a worker exits, ``mark_process_dead`` merges
+    its file into ``aggregate.db`` so counters never go down while the
+    number of files stays bounded by the number of live workers; the
+    directory is emptied when the server starts.
+    """
+
+    def __init__(self, directory: Path) -> None:
+        """Initialize the store."""
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._values: Optional[MmapValues] = None
+        self._open_lock = threading.Lock()
+
+    def inc(self, key: str, amount: float = 1.0) -> None:
+        """Add the amount to the value of the key for this process."""
+        values = self._values
+        if values is None or values.pid != os.getpid():
+            values = self._open()
+        values.inc(key, amount)
+
+    def collect(self) -> Dict[str, float]:
+        """Return the values of every writer, summed by key."""
+        totals: Dict[str, float] = {}
+        for path in sorted(self.directory.glob("*.db")):
+            try:
+                for key, value in MmapValues.read(path):
+                    totals[key] = totals.get(key, 0.0) + value
+            except (OSError, ValueError, struct.error):
+                # A file being created or removed; it is read on the next scrape.
+                continue
+        return totals
+
+    def mark_process_dead(self, pid: int) -> None:
+        """Merge the file of an exited process into the aggregate file.
+
+        Called by the server's master process, e.g. from Gunicorn's
+        ``child_exit`` hook, which is the only writer of the aggregate file.
+
+        Args:
+            pid: The process id of the exited worker.
+
+        """
+        path = self.directory / f"{pid}.db"
+        try:
+            entries = list(MmapValues.read(path))
+        except FileNotFoundError:
+            return
+        aggregate = MmapValues(self.directory / AGGREGATE_FILE)
+        try:
+            for key, value in entries:
+                aggregate.inc(key, value)
+        finally:
+            aggregate.close()
+        path.unlink(missing_ok=True)
+
+    def clear(self) -> None:
+        """Delete every file, e.g. when the server starts."""
+        for path in self.directory.glob("*.db"):
+            path.unlink(missing_ok=True)
+
+    def _open(self) -> MmapValues:
+        """Open the file of the current process, e.g. after a fork."""
+        with self._open_lock:
+            values = self._values
+            if values is None or values.pid != os.getpid():
+                values = self._values = MmapValues(self.directory / f"{os.getpid()}.db")
+            return values
+
+
+def encode_key(name: str, labels: Tuple[str, ...]) -> str:
+    """Encode a metric name and label values as a store key."""
+    return json.dumps([name, *labels], separators=(",", ":"))
+
+
+def decode_key(key: str) -> Tuple[str, Tuple[str, ...]]:
+    """Decode a store key into a metric name and label values."""
+    name, *labels = json.loads(key)
+    return name, tuple(labels)
@@ -0,0 +1,23 @@
+from typing import Callable
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+
+
+class BaseMiddleware:
+    """Base class for middlewares that run natively under both WSGI and ASGI.
+
+    Django picks the mode from ``sync_capable``/``async_capable`` and passes an
+    async ``get_response`` when the rest of the stack is async. In that case
+    the middleware marks itself as a coroutine function and subclasses
+    dispatch ``__call__`` to their ``__acall__``, so no thread hop is needed.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response: Callable) -> None:
+        """Initialize the middleware."""
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
@@ -1,6 +1,47 @@
-from rest_framework.pagination import PageNumberPagination
+import datetime
+import decimal
+import hashlib
+import logging
+import uuid
+from functools import partial
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from django.conf import settings
+from django.core import signing
+from django.core.cache import caches
+from django.core.paginator import Paginator as DjangoPaginator
+from django.db import connections
+from django.db.models import Q, QuerySet
+from django.db.models.constants import LOOKUP_SEP
+from django.http import HttpRequest
+from django.utils.functional import cached_property
+
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+from rest_framework.views import APIView
 
 from app.contrib.constants import PaginationConstant
+from app.contrib.renderers import loads
+
+logger = logging.getLogger(__name__)
+
+
+class CountedPaginator(DjangoPaginator):
+    """Django paginator that takes its total from a count function."""
+
+    def __init__(
+        self, object_list: QuerySet, per_page: int, count_function: Callable[[QuerySet], int]
+    ) -> None:
+        """Initialize the paginator."""
+        super().__init__(object_list, per_page)
+        self.count_function = count_function
+
+    @cached_property
+    def count(self) -> int:
+        """Return the total number of objects from the count function."""
+        return self.count_function(self.object_list)
 
 
 class CustomPagination(PageNumberPagination):
@@ -9,11 +50,344 @@ class CustomPagination(PageNumberPagination):
     This class extends DRF's PageNumberPagination to provide customized
     pagination with configurable page sizes and maximum limits.
 
+    The total is computed with a count strategy, taken from the view's
+    ``count_strategy``, then the paginator's, then ``PAGINATION_COUNT_STRATEGY``:
+
+    - ``exact``: ``COUNT(*)`` on every request.
+    - ``cached``: the exact count, cached per query for ``PAGINATION_COUNT_CACHE_TTL``.
+    - ``estimated``: the PostgreSQL planner's row estimate, or an exact count
+      below ``PAGINATION_COUNT_ESTIMATE_THRESHOLD`` or on other databases.
+
+    The response's ``count_exact`` tells whether ``count`` is exact. With an
+    estimate, pages past the real end are empty and pages past the estimate
+    are not found.
+
     Attributes:
         max_page_size (int): Maximum number of items per page
         page_size_query_param (str): Query parameter name for page size
+        count_strategy (str): Count strategy, or None for the setting
 
     """
 
     max_page_size = PaginationConstant.MAX_PAGE_SIZE
     page_size_query_param = PaginationConstant.PAGE_SIZE_QUERY_PARAM
+    count_strategy: Optional[str] = None
+
+    COUNT_STRATEGIES = ("exact", "cached", "estimated")
+
+    def paginate_queryset(
+        self, queryset: QuerySet, request: HttpRequest, view: Optional[APIView] = None
+    ) -> Optional[List]:
+        """Return one page of the queryset, counted with the count strategy.
+
+        Args:
+            queryset: The queryset to paginate.
+            request: The incoming request.
+            view: The view being paginated.
+
+        Returns:
+            The items of the page, or None if pagination is disabled.
+
+        """
+        strategy = self.get_count_strategy(view)
+        self.count_exact = True
+        self.django_paginator_class = partial(
+            CountedPaginator, count_function=getattr(self, f"get_{strategy}_count")
+        )
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data: List) -> Response:
+        """Return the paginated response, saying whether the count is exact."""
+        response = super().get_paginated_response(data)
+        response.data["count_exact"] = self.count_exact
+        return response
+
+    def get_paginated_response_schema(self, schema: Dict) -> Dict:
+        """Return the schema of the paginated response."""
+        paginated_schema = super().get_paginated_response_schema(schema)
+        paginated_schema["properties"]["count_exact"] = {"type": "boolean", "example": True}
+        return paginated_schema
+
+    def get_count_strategy(self, view: Optional[APIView] = None) -> str:
+        """Return the count strategy for the view.
+
+        Raises:
+            ValueError: If the strategy is unknown.
+
+        """
+        strategy = (
+            getattr(view, "count_strategy", None)
+            or self.count_strategy
+            or getattr(settings, "PAGINATION_COUNT_STRATEGY", PaginationConstant.COUNT_STRATEGY)
+        )
+        if strategy not in self.COUNT_STRATEGIES:
+            raise ValueError(f"Unknown pagination count strategy: {strategy}")
+        return strategy
+
+    def get_exact_count(self, queryset: QuerySet) -> int:
+        """Count the queryset with ``COUNT(*)``."""
+        self.count_exact = True
+        return queryset.count()
+
+    def get_cached_count(self, queryset: QuerySet) -> int:
+        """Return the exact count, cached per query.
+
+        The cache key is a hash of the compiled SQL, so it covers the filters,
+        search and per-user restrictions applied to the queryset.
+        """
+        try:
+            sql, params = queryset.query.sql_with_params()
+        except Exception:
+            # EmptyResultSet and the like: the exact count is cheap or zero.
+            return self.get_exact_count(queryset)
+        digest = hashlib.sha256(f"{queryset.db}:{sql}:{params!r}".encode()).hexdigest()
+        key = f"{PaginationConstant.COUNT_CACHE_PREFIX}{digest}"
+        cache = caches[getattr(settings, "PAGINATION_COUNT_CACHE", PaginationConstant.COUNT_CACHE)]
+        count = cache.get(key)
+        if count is not None:
+            self.count_exact = False
+            return count
+        count = self.get_exact_count(queryset)
+        ttl = getattr(settings, "PAGINATION_COUNT_CACHE_TTL", PaginationConstant.COUNT_CACHE_TTL)
+        cache.set(key, count, ttl)
+        return count
+
+    def get_estimated_count(self, queryset: QuerySet) -> int:
+        """Return the planner's row estimate, or the exact count for small results."""
+        estimate = self.get_planner_estimate(queryset)
+        threshold = getattr(
+            settings,
+            "PAGINATION_COUNT_ESTIMATE_THRESHOLD",
+            PaginationConstant.COUNT_ESTIMATE_THRESHOLD,
+        )
+        if estimate is None or estimate < threshold:
+            return self.get_exact_count(queryset)
+        self.count_exact = False
+        return estimate
+
+    @staticmethod
+    def get_planner_estimate(queryset: QuerySet) -> Optional[int]:
+        """Return the PostgreSQL planner's row estimate for the queryset.
+
+        Returns:
+            The estimated number of rows, or None if no estimate is available.
+
+        """
+        if queryset.query.is_sliced:
+            return None
+        if connections[queryset.db].vendor != "postgresql":
+            return None
+        try:
+            plan = loads(queryset.explain(format="json"))
+            # Django joins the plan rows with json.dumps, so the single plan
+            # comes back as an object rather than PostgreSQL's one-item array.
+            if isinstance(plan, list):
+                plan = plan[0]
+            return int(plan["Plan"]["Plan Rows"])
+        except Exception as e:
+            logger.warning("PAGINATION: Failed to estimate count: %s", e)
+            return None
+
+
+class KeysetCursor(NamedTuple):
+    """Decoded keyset cursor: direction and the ordering values to continue from."""
+
+    reverse: bool
+    position: Tuple
+
+
+class KeysetPagination(CursorPagination):
+    """Keyset (seek) pagination for API responses.
+
+    Pages are selected with a ``WHERE`` on the ordering fields of the last
+    (or first) row of the previous page instead of ``OFFSET``, and no
+    ``COUNT`` is run, so every page costs O(page_size) whatever its depth.
+    The ordering may span several fields; the primary key is appended as a
+    tie-breaker when it isn't already part of it. The ordering fields should
+    be indexed and not nullable.
+
+    Cursors are signed with ``SECRET_KEY``, so clients can't forge positions,
+    and carry the ordering they were built for; a cursor reused with another
+    ``?ordering=`` is rejected.
+    The ordering comes from the view's ``OrderingFilter`` when it has one,
+    otherwise from ``ordering``.
+
+    Attributes:
+        ordering (str | tuple): Default ordering of the pages
+        max_page_size (int): Maximum number of items per page
+        page_size_query_param (str): Query parameter name for page size
+
+    """
+
+    ordering = "-pk"
+    max_page_size = PaginationConstant.MAX_PAGE_SIZE
+    page_size_query_param = PaginationConstant.PAGE_SIZE_QUERY_PARAM
+    cursor_salt = PaginationConstant.CURSOR_SALT
+
+    def paginate_queryset(
+        self, queryset: QuerySet, request: HttpRequest, view: Optional[APIView] = None
+    ) -> Optional[List]:
+        """Return one page of the queryset.
+
+        Args:
+            queryset: The queryset to paginate.
+            request: The incoming request.
+            view: The view being paginated.
+
+        Returns:
+            The items of the page, or None if pagination is disabled.
+
+        """
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_keyset_ordering(self.get_ordering(request, queryset, view))
+        self.cursor = self.decode_cursor(request)
+        reverse, position = self.cursor if self.cursor else (False, None)
+
+        ordering = self.reverse_ordering(self.ordering) if reverse else self.ordering
+        queryset = queryset.order_by(*ordering)
+        if position is not None:
+            queryset = queryset.filter(self.get_seek_filter(ordering, position))
+
+        results = list(queryset[: self.page_size + 1])
+        has_more = len(results) > self.page_size
+        self.page = results[: self.page_size]
+        if reverse:
+            self.page.reverse()
+
+        self.has_next = position is not None if reverse else has_more
+        self.has_previous = has_more if reverse else position is not None
+        self.next_position = self._get_position(self.page[-1]) if self.page else position
+        self.previous_position = self._get_position(self.page[0]) if self.page else position
+
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+        return self.page
+
+    def get_next_link(self) -> Optional[str]:
+        """Return the URL of the next page, if any."""
+        if not self.has_next:
+            return None
+        return self.encode_cursor(KeysetCursor(False, self.next_position))
+
+    def get_previous_link(self) -> Optional[str]:
+        """Return the URL of the previous page, if any."""
+        if not self.has_previous:
+            return None
+        if self.previous_position is None:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(KeysetCursor(True, self.previous_position))
+
+    def encode_cursor(self, cursor: KeysetCursor) -> str:
+        """Return the URL of the page at the cursor.
+
+        Args:
+            cursor: The cursor to encode.
+
+        Returns:
+            The page URL with the signed cursor.
+
+        """
+        payload = {"r": int(cursor.reverse), "p": list(cursor.position), "o": list(self.ordering)}
+        token = signing.dumps(payload, salt=self.cursor_salt, compress=True)
+        return replace_query_param(self.base_url, self.cursor_query_param, token)
+
+    def decode_cursor(self, request: HttpRequest) -> Optional[KeysetCursor]:
+        """Decode and verify the cursor of the request.
+
+        Args:
+            request: The incoming request.
+
+        Returns:
+            The cursor, or None on the first page.
+
+        Raises:
+            NotFound: If the cursor is malformed, forged or doesn't match the ordering.
+
+        """
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None
+        try:
+            payload = signing.loads(token, salt=self.cursor_salt)
+            cursor = KeysetCursor(bool(payload["r"]), tuple(payload["p"]))
+        except (signing.BadSignature, KeyError, TypeError, ValueError) as e:
+            raise NotFound(self.invalid_cursor_message) from e
+        if payload.get("o") != list(self.ordering) or len(cursor.position) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+        return cursor
+
+    @staticmethod
+    def get_keyset_ordering(ordering: Sequence[str]) -> Tuple[str, ...]:
+        """Append the primary key to the ordering so that it is unique.
+
+        Args:
+            ordering: The ordering fields.
+
+        Returns:
+            The ordering ending with a unique field.
+
+        """
+        ordering = tuple(ordering)
+        if not any(field.lstrip("-") in {"pk", "id"} for field in ordering):
+            ordering += ("pk",)
+        return ordering
+
+    @staticmethod
+    def reverse_ordering(ordering: Sequence[str]) -> Tuple[str, ...]:
+        """Return the ordering with every direction flipped."""
+        return tuple(field[1:] if field.startswith("-") else f"-{field}" for field in ordering)
+
+    @staticmethod
+    def get_seek_filter(ordering: Sequence[str], position: Sequence) -> Q:
+        """Build the filter selecting the rows after the position in the ordering.
+
+        For ``(a, -b)`` this is ``a > x OR (a = x AND b < y)``.
+
+        Args:
+            ordering: The ordering fields, as passed to ``order_by``.
+            position: The values of the ordering fields to continue from.
+
+        Returns:
+            The filter.
+
+        """
+        seek = Q()
+        equal = Q()
+        for field, value in zip(ordering, position):
+            name = field.lstrip("-")
+            lookup = "lt" if field.startswith("-") else "gt"
+            seek |= equal & Q(**{f"{name}__{lookup}": value})
+            equal &= Q(**{name: value})
+        return seek
+
+    def _get_position(self, item: object) -> Tuple:
+        """Return the JSON-serializable ordering values of an item."""
+        return tuple(self._encode_value(self._get_value(item, field)) for field in self.ordering)
+
+    @staticmethod
+    def _get_value(item: object, field: str) -> object:
+        """Return the value of an ordering field from a model instance or a dict.
+
+        Fields spanning relations, e.g. ``author__name``, are followed on
+        instances; ``values()`` dicts hold them under the full name.
+        """
+        name = field.lstrip("-")
+        if isinstance(item, dict):
+            return item[name]
+        for part in name.split(LOOKUP_SEP):
+            item = getattr(item, part)
+        return item
+
+    @staticmethod
+    def _encode_value(value: object) -> object:
+        """Convert a value to a JSON type that lookups accept back."""
+        if isinstance(value, (datetime.date, datetime.time)):
+            return value.isoformat()
+        if isinstance(value, (decimal.Decimal, uuid.UUID)):
+            return str(value)
+        return value
@@ -0,0 +1,216 @@
+import fnmatch
+import re
+from functools import lru_cache
+from typing import Dict, Iterable, Optional, Tuple, Union
+
+from django.conf import settings
+from django.dispatch import receiver
+from django.test.signals import setting_changed
+
+from app.contrib.constants import LoggerConstant
+
+Path = Tuple[str, ...]
+
+# A JSON ``"key": value`` or form ``key=value`` pair; the value may be cut off.
+TEXT_PAIR_PATTERN = re.compile(
+    r'(?:"(?P<json_key>(?:[^"\\]|\\.)*)"\s*:\s*|(?<![\w.\-])(?P<form_key>[\w.\-\[\]]+)=)'
+    r'(?P<value>"(?:[^"\\]|\\.)*"?|[^&,{}\[\]\s]*)'
+)
+
+
+class Redactor:
+    """Mask sensitive values in nested data before it is logged.
+
+    Keys are matched case-insensitively against exact names and glob
+    patterns; dotted JSON paths (``*`` matches any key or list index) mask
+    values at a specific location. Everything is compiled once, and
+    ``redact`` walks the data in a single pass, copying only the containers
+    that contain a masked value. Unchanged data is returned as is.
+
+    Attributes:
+        fields (frozenset): Lowercased exact key names
+        pattern (re.Pattern): Compiled glob patterns, or None
+        paths (tuple): Dotted paths split into segments
+        mask (str): Replacement for sensitive values
+
+    """
+
+    def __init__(
+        self,
+        fields: Iterable[str] = (),
+        patterns: Iterable[str] = (),
+        paths: Iterable[str] = (),
+        mask: str = LoggerConstant.MASK,
+    ) -> None:
+        """Compile the redaction rules."""
+        self.fields = frozenset(field.lower() for field in fields)
+        patterns = [fnmatch.translate(pattern.lower()) for pattern in patterns]
+        self.pattern = re.compile("|".join(patterns)) if patterns else None
+        self.paths: Tuple[Path, ...] = tuple(tuple(path.split(".")) for path in paths)
+        self.mask = mask
+        self._keys: Dict[str, bool] = {}
+
+    def is_sensitive_key(self, key: object) -> bool:
+        """Check whether values under the key must be masked.
+
+        Args:
+            key: A mapping key.
+
+        Returns:
+            True if the key matches a field name or pattern.
+
+        """
+        if not isinstance(key, str):
+            return False
+        sensitive = self._keys.get(key)
+        if sensitive is None:
+            lowered = key.lower()
+            sensitive = lowered in self.fields or (
+                self.pattern is not None and self.pattern.match(lowered) is not None
+            )
+            if len(self._keys) < LoggerConstant.REDACT_KEY_CACHE_SIZE:
+                self._keys[key] = sensitive
+        return sensitive
+
+    def redact(self, data: object) -> object:
+        """Return the data with sensitive values masked.
+
+        Args:
+            data: Decoded JSON-like data (dicts, lists, tuples and scalars).
+
+        Returns:
+            The data itself if nothing was masked, otherwise a copy that
+            shares every unchanged container with the original.
+
+        """
+        return self._redact(data, self.paths)
+
+    def redact_text(self, text: str) -> str:
+        """Mask sensitive values in raw JSON or form-encoded text.
+
+        Only key names and patterns apply; the text may be truncated, so JSON
+        paths can't be resolved.
+
+        Args:
+            text: The raw text.
+
+        Returns:
+            The text with sensitive values masked.
+
+        """
+        return TEXT_PAIR_PATTERN.sub(self._redact_pair, text)
+
+    def _redact_pair(self, match: re.Match) -> str:
+        """Mask the value of one text pair if its key is sensitive."""
+        key = match.group("json_key")
+        if key is None:
+            key = match.group("form_key")
+        if not self.is_sensitive_key(key):
+            return match.group(0)
+        return match.group(0)[: match.start("value") - match.start(0)] + self.mask
+
+    def _redact(self, value: object, paths: Tuple[Path, ...]) -> object:
+        """Redact one value reached through ``paths``."""
+        if isinstance(value, dict):
+            return self._redact_dict(value, paths)
+        if isinstance(value, (list, tuple)):
+            return self._redact_sequence(value, paths)
+        return value
+
+    def _redact_dict(self, data: dict, paths: Tuple[Path, ...]) -> dict:
+        """Redact a mapping, copying it only if one of its values changes."""
+        result: Optional[dict] = None
+        for key, value in data.items():
+            matched, child_paths = self._descend(paths, key) if paths else (False, ())
+            if matched or self.is_sensitive_key(key):
+                if value == self.mask:
+                    continue
+                new = self.mask
+            else:
+                new = self._redact(value, child_paths)
+                if new is value:
+                    continue
+            if result is None:
+                result = dict(data)
+            result[key] = new
+        return data if result is None else result
+
+    def _redact_sequence(
+        self, items: Union[list, tuple], paths: Tuple[Path, ...]
+    ) -> Union[list, tuple]:
+        """Redact a list or tuple, copying it only if one of its items changes."""
+        result: Optional[list] = None
+        for index, item in enumerate(items):
+            matched, child_paths = self._descend(paths, str(index)) if paths else (False, ())
+            new = self.mask if matched else self._redact(item, child_paths)
+            if new is item or (matched and item == self.mask):
+                continue
+            if result is None:
+                result = list(items)
+            result[index] = new
+        if result is None:
+            return items
+        return result if isinstance(items, list) else tuple(result)
+
+    @staticmethod
+    def _descend(paths: Tuple[Path, ...], key: object) -> Tuple[bool, Tuple[Path, ...]]:
+        """Advance the paths by one key.
+
+        Returns:
+            Whether a path ends at the key, and the remaining paths below it.
+
+        """
+        matched = False
+        remaining = []
+        for path in paths:
+            if path[0] != "*" and path[0] != key:
+                continue
+            if len(path) == 1:
+                matched = True
+            else:
+                remaining.append(path[1:])
+        return matched, tuple(remaining)
+
+
+@lru_cache(maxsize=None)
+def get_redactor() -> Redactor:
+    """Return the redactor compiled from the ``LOG_REDACT_*`` settings."""
+    return Redactor(
+        fields=getattr(settings, "LOG_REDACT_FIELDS", LoggerConstant.SENSITIVE_FIELDS),
+        patterns=getattr(settings, "LOG_REDACT_PATTERNS", LoggerConstant.SENSITIVE_PATTERNS),
+        paths=getattr(settings, "LOG_REDACT_PATHS", LoggerConstant.SENSITIVE_PATHS),
+    )
+
+
+def redact(data: object) -> object:
+    """Mask sensitive values in the data with the configured redactor.
+
+    Args:
+        data: Decoded JSON-like data.
+
+    Returns:
+        The redacted data.
+
+    """
+    return get_redactor().redact(data)
+
+
+class LazyRedacted:
+    """Log message argument that is redacted only when it is formatted."""
+
+    __slots__ = ("data",)
+
+    def __init__(self, data: object) -> None:
+        """Wrap the data to redact."""
+        self.data = data
+
+    def __str__(self) -> str:
+        """Return the redacted data as a string."""
+        return str(redact(self.data))
+
+
+@receiver(setting_changed)
+def _reset_redactor(setting: str, **_kwargs: object) -> None:
+    """Recompile the redactor when a ``LOG_REDACT_*`` setting changes."""
+    if setting.startswith("LOG_REDACT_"):
+        get_redactor.cache_clear()
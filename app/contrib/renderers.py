@@ -0,0 +1,138 @@
+import decimal
+import json
+from typing import IO, Any, Callable, Mapping, Optional, Union
+
+from django.conf import settings
+
+from rest_framework import parsers, renderers
+from rest_framework.exceptions import ParseError
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+# With a "Z" suffix for UTC, orjson's native dates, times and UUIDs are
+# formatted like DRF's encoder does, without a call to ``default``.
+ORJSON_OPTIONS = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS if orjson is not None else 0
+UTF8 = ("utf-8", "utf8")
+
+_encoder = JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+
+
+def encode_default(obj: object) -> object:
+    """Convert a value JSON can't encode, as DRF's ``JSONEncoder`` does.
+
+    Handles lazy translation strings, dates and times, Decimal (as a number),
+    UUID, querysets, generators and the like.
+
+    Raises:
+        TypeError: If the value can't be converted.
+
+    """
+    # The most common value in serialized data, checked before DRF's chain.
+    if type(obj) is decimal.Decimal:
+        return float(obj)
+    return _encoder.default(obj)
+
+
+def dumps(data: object, default: Optional[Callable[[object], object]] = None) -> bytes:
+    """Encode data to compact UTF-8 JSON.
+
+    Uses orjson when it is installed, otherwise the standard library; both
+    give the same output, except that orjson encodes NaN and infinities as
+    null. Values orjson rejects (such as integers over 64 bits) are encoded
+    with the standard library.
+
+    Args:
+        data: The data to encode.
+        default: Converts values JSON can't encode; ``encode_default`` if None.
+
+    Returns:
+        The JSON document.
+
+    """
+    default = default or encode_default
+    if orjson is not None:
+        try:
+            return orjson.dumps(data, default=default, option=ORJSON_OPTIONS)
+        except orjson.JSONEncodeError:
+            pass
+    return json.dumps(data, default=default, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def loads(data: Union[bytes, bytearray, memoryview, str]) -> object:
+    """Decode a JSON document.
+
+    Raises:
+        json.JSONDecodeError: If the document is not valid JSON.
+        UnicodeDecodeError: If the document is not valid UTF-8.
+
+    """
+    if orjson is None:
+        return json.loads(data)
+    try:
+        return orjson.loads(data)
+    except orjson.JSONDecodeError:
+        if not isinstance(data, str):
+            # Report invalid UTF-8 the way ``json.loads`` does.
+            bytes(data).decode()
+        raise
+
+
+class JSONRenderer(renderers.JSONRenderer):
+    """DRF JSON renderer using ``dumps``.
+
+    Compact, non-ASCII-escaped output (DRF's defaults) goes through the fast
+    path. Indented output, e.g. for the browsable API, and the
+    ``COMPACT_JSON=False`` or ``UNICODE_JSON=False`` settings fall back to
+    DRF's renderer.
+    """
+
+    def render(
+        self,
+        data: object,
+        accepted_media_type: Optional[str] = None,
+        renderer_context: Optional[Mapping[str, Any]] = None,
+    ) -> bytes:
+        """Render the data into JSON."""
+        if data is None:
+            return b""
+        indent = self.get_indent(accepted_media_type, renderer_context or {})
+        if indent is not None or not self.compact or self.ensure_ascii:
+            return super().render(data, accepted_media_type, renderer_context)
+        content = dumps(data)
+        # Like DRF, escape U+2028 and U+2029 so the output is valid JavaScript.
+        if b"\xe2\x80\xa8" in content or b"\xe2\x80\xa9" in content:
+            content = content.replace(b"\xe2\x80\xa8", b"\\u2028").replace(
+                b"\xe2\x80\xa9", b"\\u2029"
+            )
+        return content
+
+
+class JSONParser(parsers.JSONParser):
+    """DRF JSON parser using ``loads`` for UTF-8 bodies."""
+
+    renderer_class = JSONRenderer
+
+    def parse(
+        self,
+        stream: IO[bytes],
+        media_type: Optional[str] = None,
+        parser_context: Optional[Mapping[str, Any]] = None,
+    ) -> object:
+        """Parse the request body as JSON.
+
+        Raises:
+            ParseError: If the body is not valid JSON.
+
+        """
+        parser_context = parser_context or {}
+        encoding = parser_context.get("encoding", settings.DEFAULT_CHARSET)
+        if orjson is None or encoding.lower() not in UTF8:
+            return super().parse(stream, media_type, parser_context)
+        try:
+            return loads(stream.read())
+        except ValueError as exc:
+            raise ParseError(f"JSON parse error - {exc}") from exc
@@ -1,9 +1,147 @@
+import io
 from functools import lru_cache
-from typing import Any, Dict
+from typing import IO, Any, Dict, Optional
 
 from django.http import HttpRequest
+from django.http.response import HttpResponseBase
 
-from app.contrib.constants import LoggerConstant
+from app.contrib.redaction import get_redactor
+from app.contrib.renderers import dumps
+
+
+class LazyJSON:
+    """Log message argument that is encoded to JSON only when it is formatted."""
+
+    __slots__ = ("data",)
+
+    def __init__(self, data: Dict[str, Any]) -> None:
+        """Wrap the data to encode."""
+        self.data = data
+
+    def __str__(self) -> str:
+        """Encode the data as JSON."""
+        return dumps(self.data, default=str).decode()
+
+
+class ReplayStream:
+    """Request stream returning bytes already read from it, then the rest."""
+
+    def __init__(self, prefix: bytes, stream: IO[bytes]) -> None:
+        """Wrap the stream the prefix was read from."""
+        self.prefix = io.BytesIO(prefix)
+        self.stream = stream
+
+    def read(self, size: int = -1) -> bytes:
+        """Read from the prefix, then from the wrapped stream."""
+        data = self.prefix.read(size)
+        if size is None or size < 0:
+            return data + self.stream.read()
+        if len(data) < size:
+            data += self.stream.read(size - len(data))
+        return data
+
+    def readline(self, size: int = -1) -> bytes:
+        """Read a line from the prefix, then from the wrapped stream."""
+        line = self.prefix.readline(size)
+        if line.endswith(b"\n") or (size is not None and 0 <= size <= len(line)):
+            return line
+        return line + self.stream.readline(-1 if size is None or size < 0 else size - len(line))
+
+    def close(self) -> None:
+        """Close the wrapped stream."""
+        self.stream.close()
+
+
+class BodyPrefixCapture:
+    """Request stream wrapper that keeps the first ``limit`` bytes read through it.
+
+    Used for bodies above ``LoggerConstant.MAX_BODY_SIZE``: the view reads the
+    stream as usual and at most ``limit`` bytes are ever held for logging.
+    """
+
+    def __init__(self, stream: IO[bytes], limit: int, size: int) -> None:
+        """Wrap the stream."""
+        self.stream = stream
+        self.limit = limit
+        self.size = size
+        self.buffer = bytearray()
+
+    @classmethod
+    def install(cls, request: HttpRequest, limit: int) -> "BodyPrefixCapture":
+        """Wrap the request stream so the body prefix is captured as it is read.
+
+        Args:
+            request: The HttpRequest object.
+            limit: Maximum number of bytes to keep.
+
+        Returns:
+            The installed capture.
+
+        """
+        # HttpRequest.read()/readline() delegate to the private _stream.
+        size = RequestBodyLogger.get_request_size(request) or None
+        capture = cls(request._stream, limit, size)  # noqa: SLF001
+        request._stream = capture  # noqa: SLF001
+        return capture
+
+    @staticmethod
+    def peek(request: HttpRequest, limit: int) -> bytes:
+        """Read at most ``limit + 1`` bytes of the body, leaving them to the view.
+
+        Used when the request has no Content-Length, e.g. chunked or ASGI
+        bodies, to learn whether the body is above ``limit``.
+
+        Args:
+            request: The HttpRequest object.
+            limit: Maximum body size.
+
+        Returns:
+            The bytes read, longer than ``limit`` if the body is.
+
+        """
+        stream = request._stream  # noqa: SLF001
+        prefix = stream.read(limit + 1)
+        request._stream = ReplayStream(prefix, stream)  # noqa: SLF001
+        return prefix
+
+    def read(self, *args: int) -> bytes:
+        """Read from the wrapped stream."""
+        return self._capture(self.stream.read(*args))
+
+    def readline(self, *args: int) -> bytes:
+        """Read a line from the wrapped stream."""
+        return self._capture(self.stream.readline(*args))
+
+    def close(self) -> None:
+        """Close the wrapped stream."""
+        self.stream.close()
+
+    def finish(self) -> Dict[str, Any]:
+        """Return the log value, reading the rest of the prefix if the view didn't.
+
+        Returns:
+            The sanitized prefix with the full body size, None if unknown.
+
+        """
+        missing = self.limit - len(self.buffer)
+        if missing > 0:
+            try:
+                self.read(missing)
+            except Exception:  # noqa: S110
+                pass
+        prefix = self.buffer.decode("utf-8", errors="replace")
+        return {
+            "truncated": True,
+            "size": self.size,
+            "prefix": RequestBodyLogger.sanitize_text(prefix),
+        }
+
+    def _capture(self, data: bytes) -> bytes:
+        """Keep the part of ``data`` that still fits in the buffer."""
+        room = self.limit - len(self.buffer)
+        if room > 0 and data:
+            self.buffer += data[:room]
+        return data
 
 
 class RequestBodyLogger:
@@ -45,10 +183,55 @@ class RequestBodyLogger:
             body: The request body dictionary.
 
         Returns:
-            A sanitized copy of the body with sensitive fields masked.
+            The body with sensitive fields masked at any depth. Only the
+            containers holding a masked value are copied.
+
+        """
+        return get_redactor().redact(body)
+
+    @classmethod
+    def sanitize_text(cls, text: str) -> str:
+        """Mask sensitive fields in raw (possibly truncated) body text.
+
+        Args:
+            text: JSON or form-encoded body text.
+
+        Returns:
+            The text with the values of sensitive fields masked.
+
+        """
+        return get_redactor().redact_text(text)
+
+    @classmethod
+    def get_request_size(cls, request: HttpRequest) -> int:
+        """Get the size of the request body from its Content-Length.
+
+        Args:
+            request: The HttpRequest object.
+
+        Returns:
+            The request body size in bytes.
+
+        """
+        try:
+            return int(request.META.get("CONTENT_LENGTH") or 0)
+        except ValueError:
+            return 0
+
+    @classmethod
+    def get_response_size(cls, response: HttpResponseBase) -> Optional[int]:
+        """Get the size of the response body.
+
+        Args:
+            response: The response object.
+
+        Returns:
+            The response body size in bytes, or None for streaming responses
+            without a Content-Length.
 
         """
-        sanitized = body.copy()
-        for key in LoggerConstant.SENSITIVE_FIELDS & set(sanitized.keys()):
-            sanitized[key] = "***"
-        return sanitized
+        if response.has_header("Content-Length"):
+            return int(response["Content-Length"])
+        if getattr(response, "streaming", False):
+            return None
+        return len(response.content)
@@ -1,60 +1,124 @@
 import json
 import logging
+import time
 import uuid
-from typing import Callable, Optional
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, Optional, Union
 
-from django.http import HttpRequest, HttpResponse
+from django.conf import settings
+from django.http import HttpRequest, HttpResponse, StreamingHttpResponse
+from django.http.response import HttpResponseBase
 
 from app.contrib.constants import LoggerConstant
-from app.contrib.request_logging.logger import RequestBodyLogger
+from app.contrib.middleware import BaseMiddleware
+from app.contrib.renderers import loads
+from app.contrib.request_logging.logger import BodyPrefixCapture, LazyJSON, RequestBodyLogger
+from app.contrib.request_logging.policy import LogDecision, get_policy
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_DECISION = LogDecision(logging.INFO, sampled=True)
 
-class RequestLoggingMiddleware:
-    """Middleware for logging request/response."""
 
-    def __init__(self, get_response: Callable) -> None:
-        """Initialize the middleware with the get_response function."""
-        self.get_response = get_response
+class RequestLoggingMiddleware(BaseMiddleware):
+    """Middleware for logging request/response.
+
+    Emits one structured JSON record per request once the response is ready,
+    subject to the sampling and per-route rules of ``RequestLogPolicy``.
+    Only JSON and form bodies are captured; other requests have a null body.
+    The record is only built when the logger is enabled for the route level, and its JSON
+    is only encoded if a handler actually formats it.
+    """
 
     def __call__(self, request: HttpRequest) -> HttpResponse:
         """Handle the request and response cycle."""
+        if self.async_mode:
+            return self.__acall__(request)
+
         request.id = str(uuid.uuid4())
+        decision = self.get_decision(request)
+        # The body must be read before the view consumes the request stream.
+        body = self.get_request_body(request) if decision and decision.sampled else None
+        started = time.perf_counter_ns()
 
-        should_log_body = RequestBodyLogger.should_log_body(request)
+        response = self.get_response(request)
 
-        if should_log_body:
-            self.log_request(request, "Start of request.")
+        if decision is not None:
+            self.log_request(request, response, time.perf_counter_ns() - started, body, decision)
 
-        response = self.get_response(request)
+        return response
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponse:
+        """Async version of ``__call__``."""
+        request.id = str(uuid.uuid4())
+        decision = self.get_decision(request)
+        # The body must be read before the view consumes the request stream.
+        body = self.get_request_body(request) if decision and decision.sampled else None
+        started = time.perf_counter_ns()
 
-        if should_log_body:
-            self.log_request(request, "End of request.")
+        response = await self.get_response(request)
+
+        if decision is not None:
+            self.log_request(request, response, time.perf_counter_ns() - started, body, decision)
 
         return response
 
     @staticmethod
-    def get_request_body(request: HttpRequest) -> Optional[str]:
+    def get_decision(request: HttpRequest) -> Optional[LogDecision]:
+        """Decide, before the view runs, whether and how the request is logged.
+
+        The content type only decides whether the body is captured (see
+        ``get_request_body``); requests without a body are logged too.
+
+        Args:
+            request: The HttpRequest object.
+
+        Returns:
+            The logging decision, or None if the request is not logged.
+
+        """
+        decision = get_policy().decide(request)
+        if decision is None or not logger.isEnabledFor(decision.level):
+            return None
+        return decision
+
+    @staticmethod
+    def get_request_body(
+        request: HttpRequest,
+    ) -> Optional[Union[Dict[str, Any], str, BodyPrefixCapture]]:
         """Get the request body if it should be logged.
 
+        The size is checked against ``CONTENT_LENGTH`` before the body is read,
+        or, without it, by reading at most one byte more than the limit, so
+        oversized payloads are never loaded or parsed here.
+
         Args:
             request: The HttpRequest object.
 
         Returns:
-            The request body as a JSON string if it should be logged,
-            "BODY TOO LARGE" if the body exceeds the maximum size,
+            The sanitized request body if it should be logged,
+            a ``BodyPrefixCapture`` (or "BODY TOO LARGE" when prefix capture
+            is disabled) if the body exceeds the maximum size,
             or None if the body cannot be decoded or shouldn't be logged.
 
         """
         if not RequestBodyLogger.should_log_body(request):
             return None
 
+        limit = LoggerConstant.MAX_BODY_SIZE
+        if request.META.get("CONTENT_LENGTH"):
+            too_large = RequestBodyLogger.get_request_size(request) > limit
+        else:
+            too_large = len(BodyPrefixCapture.peek(request, limit)) > limit
+        if too_large:
+            if getattr(settings, "REQUEST_LOGGING_CAPTURE_PREFIX", LoggerConstant.CAPTURE_PREFIX):
+                return BodyPrefixCapture.install(request, LoggerConstant.MAX_BODY_SIZE)
+            return "BODY TOO LARGE"
+
         if request.content_type == "application/x-www-form-urlencoded":
             body = request.POST.dict()
         else:
             try:
-                body = json.loads(request.body)
+                body = loads(request.body)
             except json.JSONDecodeError:
                 logger.warning("API LOGGING: Failed to decode request body.")
                 return None
@@ -65,23 +129,132 @@ class RequestLoggingMiddleware:
                 logger.exception("API LOGGING: Failed to process request body: %s", error)
                 return None
 
-        if len(str(body)) > LoggerConstant.MAX_BODY_SIZE:
-            return "BODY TOO LARGE"
-        return json.dumps(RequestBodyLogger.sanitize_body(body))
+        return RequestBodyLogger.sanitize_body(body)
 
-    @staticmethod
-    def log_request(request: HttpRequest, stage: str) -> None:
-        """Log the request with the given count and stage."""
-        query = request.META.get("QUERY_STRING", "")
-        body = RequestLoggingMiddleware.get_request_body(request)
-        log_message = (
-            f"[request_id={request.id}, "
-            f"method={request.method}, "
-            f"content_type={request.content_type}, "
-            f"path={request.path}, "
-            f"query={query}, "
-            f"body={body}, "
-            f"user_agent={request.META.get('HTTP_USER_AGENT')}, "
-            f"ip={request.META.get('REMOTE_ADDR')}], {stage}"
+    @classmethod
+    def log_request(
+        cls,
+        request: HttpRequest,
+        response: HttpResponseBase,
+        duration_ns: int,
+        body: Optional[Union[Dict[str, Any], str, BodyPrefixCapture]] = None,
+        decision: LogDecision = DEFAULT_DECISION,
+    ) -> None:
+        """Log one structured record for the request.
+
+        Unsampled requests are only logged if they failed or were slow.
+        Streaming responses without a Content-Length are logged once their
+        content has been sent (or the client went away), with the bytes
+        actually sent and the time taken to stream them.
+
+        Args:
+            request: The HttpRequest object.
+            response: The response returned by the view.
+            duration_ns: Time spent handling the request, in nanoseconds.
+            body: The body returned by ``get_request_body``.
+            decision: The decision returned by ``get_decision``.
+
+        """
+        if getattr(response, "streaming", False) and not response.has_header("Content-Length"):
+            cls.log_when_streamed(request, response, duration_ns, body, decision)
+            return
+        cls.emit(
+            request,
+            response,
+            duration_ns,
+            body,
+            decision,
+            RequestBodyLogger.get_response_size(response),
         )
-        logger.info(log_message)
+
+    @classmethod
+    def log_when_streamed(
+        cls,
+        request: HttpRequest,
+        response: StreamingHttpResponse,
+        duration_ns: int,
+        body: Optional[Union[Dict[str, Any], str, BodyPrefixCapture]],
+        decision: LogDecision,
+    ) -> None:
+        """Defer the record until the streaming content has been consumed.
+
+        Args:
+            request: The HttpRequest object.
+            response: The streaming response returned by the view.
+            duration_ns: Time spent until the view returned, in nanoseconds.
+            body: The body returned by ``get_request_body``.
+            decision: The decision returned by ``get_decision``.
+
+        """
+        started = time.perf_counter_ns()
+
+        def done(size: int) -> None:
+            duration = duration_ns + time.perf_counter_ns() - started
+            cls.emit(request, response, duration, body, decision, size)
+
+        count = cls._count_async if response.is_async else cls._count_sync
+        response.streaming_content = count(response.streaming_content, done)
+
+    @staticmethod
+    def _count_sync(content: Iterator[bytes], done: Callable[[int], None]) -> Iterator[bytes]:
+        """Yield the content, then report how many bytes were sent."""
+        size = 0
+        try:
+            for chunk in content:
+                size += len(chunk)
+                yield chunk
+        finally:
+            done(size)
+
+    @staticmethod
+    async def _count_async(
+        content: AsyncIterator[bytes], done: Callable[[int], None]
+    ) -> AsyncIterator[bytes]:
+        """Async version of ``_count_sync``."""
+        size = 0
+        try:
+            async for chunk in content:
+                size += len(chunk)
+                yield chunk
+        finally:
+            done(size)
+
+    @staticmethod
+    def emit(
+        request: HttpRequest,
+        response: HttpResponseBase,
+        duration_ns: int,
+        body: Optional[Union[Dict[str, Any], str, BodyPrefixCapture]],
+        decision: LogDecision,
+        size: Optional[int],
+    ) -> None:
+        """Emit the record if the policy keeps it.
+
+        Args:
+            request: The HttpRequest object.
+            response: The response returned by the view.
+            duration_ns: Time spent handling the request, in nanoseconds.
+            body: The body returned by ``get_request_body``.
+            decision: The decision returned by ``get_decision``.
+            size: Size of the response body in bytes.
+
+        """
+        if not get_policy().should_emit(decision, response.status_code, duration_ns):
+            return
+        if isinstance(body, BodyPrefixCapture):
+            body = body.finish()
+        record = {
+            "request_id": request.id,
+            "method": request.method,
+            "path": request.path,
+            "query": request.META.get("QUERY_STRING", ""),
+            "status": response.status_code,
+            "duration_ns": duration_ns,
+            "bytes_in": RequestBodyLogger.get_request_size(request),
+            "bytes_out": size,
+            "content_type": request.content_type,
+            "body": body,
+            "user_agent": request.META.get("HTTP_USER_AGENT"),
+            "ip": request.META.get("REMOTE_ADDR"),
+        }
+        logger.log(decision.level, "%s", LazyJSON(record))
@@ -0,0 +1,164 @@
+import logging
+import random
+from functools import lru_cache
+from typing import Dict, Iterable, Mapping, NamedTuple, Optional
+
+from django.conf import settings
+from django.dispatch import receiver
+from django.http import HttpRequest
+from django.test.signals import setting_changed
+
+from app.contrib.constants import LoggerConstant
+from app.contrib.health_check.matcher import PathPrefixTrie
+
+
+class LogDecision(NamedTuple):
+    """How a single request is logged, decided before the view runs.
+
+    Attributes:
+        level: Log level of the request record
+        sampled: Whether the request was sampled; only sampled requests have
+            their body captured and are logged regardless of the outcome
+
+    """
+
+    level: int
+    sampled: bool
+
+
+class RouteRule(NamedTuple):
+    """Sampling rate and log level for a path prefix and method."""
+
+    sample_rate: float
+    level: int
+
+
+class RequestLogPolicy:
+    """Decide which requests are logged.
+
+    Routes are compiled into a path prefix trie whose entries map methods to
+    rules, so a decision costs one walk of the path and a dict lookup. Paths
+    under ``skip_paths`` are never logged. Other requests are sampled at the
+    rate of their route; unsampled requests are still logged when their
+    status is at least ``error_status`` or they took ``slow_ms`` or longer.
+
+    Each route is a mapping with a ``prefix`` and optional ``methods`` (all
+    methods if omitted), ``sample_rate`` and ``level`` (a name or number).
+    """
+
+    ANY_METHOD = "*"
+
+    def __init__(
+        self,
+        routes: Iterable[Mapping] = (),
+        skip_paths: Iterable[str] = (),
+        sample_rate: float = LoggerConstant.SAMPLE_RATE,
+        slow_ms: Optional[float] = LoggerConstant.SLOW_REQUEST_MS,
+        error_status: Optional[int] = LoggerConstant.ERROR_STATUS,
+        level: int = logging.INFO,
+    ) -> None:
+        """Compile the route table."""
+        self.default_rule = RouteRule(sample_rate, level)
+        self.slow_ns = None if slow_ms is None else int(slow_ms * 1_000_000)
+        self.error_status = error_status
+        self.skip = PathPrefixTrie(path for path in skip_paths if path)
+        self.routes = PathPrefixTrie()
+        tables: Dict[str, Dict[str, RouteRule]] = {}
+        for route in routes:
+            rule = RouteRule(
+                float(route.get("sample_rate", sample_rate)),
+                self._get_level(route.get("level", level)),
+            )
+            table = tables.setdefault(route["prefix"], {})
+            for method in route.get("methods") or (self.ANY_METHOD,):
+                table[method.upper()] = rule
+        # Shorter prefixes first, so methods missing from a route fall back to
+        # the enclosing route rather than to the default rule.
+        for prefix in sorted(tables, key=len):
+            table = tables[prefix]
+            parent = self.routes.find(prefix)
+            if parent is not None and self.ANY_METHOD not in table:
+                table = {**parent, **table}
+            self.routes.add(prefix, table)
+
+    @classmethod
+    def from_settings(cls) -> "RequestLogPolicy":
+        """Build the policy from the ``REQUEST_LOGGING_*`` settings."""
+        return cls(
+            routes=getattr(settings, "REQUEST_LOGGING_ROUTES", ()),
+            skip_paths=getattr(settings, "REQUEST_LOGGING_SKIP_PATHS", LoggerConstant.SKIP_PATHS),
+            sample_rate=getattr(
+                settings, "REQUEST_LOGGING_SAMPLE_RATE", LoggerConstant.SAMPLE_RATE
+            ),
+            slow_ms=getattr(settings, "REQUEST_LOGGING_SLOW_MS", LoggerConstant.SLOW_REQUEST_MS),
+            error_status=getattr(
+                settings, "REQUEST_LOGGING_ERROR_STATUS", LoggerConstant.ERROR_STATUS
+            ),
+        )
+
+    def decide(self, request: HttpRequest) -> Optional[LogDecision]:
+        """Decide how the request is logged.
+
+        Args:
+            request: The HttpRequest object.
+
+        Returns:
+            The decision, or None if the request must not be logged.
+
+        """
+        path = request.path
+        if self.skip.match(path):
+            return None
+        table = self.routes.find(path)
+        rule = self.default_rule
+        if table is not None:
+            rule = table.get(request.method) or table.get(self.ANY_METHOD) or rule
+        return LogDecision(rule.level, self._sample(rule.sample_rate))
+
+    def should_emit(self, decision: LogDecision, status: int, duration_ns: int) -> bool:
+        """Check whether the record is emitted once the response is known.
+
+        Args:
+            decision: The decision taken before the view ran.
+            status: The response status code.
+            duration_ns: Time spent handling the request, in nanoseconds.
+
+        Returns:
+            True if the request was sampled, failed or was slow.
+
+        """
+        return (
+            decision.sampled
+            or (self.error_status is not None and status >= self.error_status)
+            or (self.slow_ns is not None and duration_ns >= self.slow_ns)
+        )
+
+    @staticmethod
+    def _sample(rate: float) -> bool:
+        """Return True for a ``rate`` fraction of calls."""
+        if rate >= 1:
+            return True
+        return rate > 0 and random.random() < rate  # noqa: S311
+
+    @staticmethod
+    def _get_level(level: object) -> int:
+        """Convert a level name or number to a number."""
+        if not isinstance(level, str):
+            return int(level)
+        value = logging.getLevelName(level.upper())
+        if not isinstance(value, int):
+            raise ValueError(f"Unknown log level: {level}")
+        return value
+
+
+@lru_cache(maxsize=None)
+def get_policy() -> RequestLogPolicy:
+    """Return the policy compiled from the settings."""
+    return RequestLogPolicy.from_settings()
+
+
+@receiver(setting_changed)
+def _reset_policy(setting: str, **_kwargs: object) -> None:
+    """Recompile the policy when a ``REQUEST_LOGGING_*`` setting changes."""
+    if setting.startswith("REQUEST_LOGGING_"):
+        get_policy.cache_clear()
@@ -1,54 +1,69 @@
-from http import HTTPStatus
-from typing import Callable
+from typing import Optional
 
-from django.conf import settings
 from django.http import HttpRequest, HttpResponse
 
+from app.contrib.middleware import BaseMiddleware
+from app.contrib.security.policy import CSPNonce, HeaderSet, get_security_policy
 
-class SecurityHeadersMiddleware:
-    """Middleware to add security headers to all responses."""
 
-    def __init__(self, get_response: Callable) -> None:
-        """Initialize the middleware."""
-        self.get_response = get_response
+class SecurityHeadersMiddleware(BaseMiddleware):
+    """Middleware to add security headers to all responses.
+
+    The headers come from ``SecurityHeaderPolicy``, compiled once from the
+    ``SECURITY_*`` settings, so no header value is built per response.
+    """
 
     def __call__(self, request: HttpRequest) -> HttpResponse:
         """Add security headers to the response."""
-        response = self.get_response(request)
+        if self.async_mode:
+            return self.__acall__(request)
+        header_set = get_security_policy().get_header_set(request)
+        nonce = self.attach_nonce(request, header_set)
+        return self.process_response(self.get_response(request), header_set, nonce)
 
-        # Ignore debug mode
-        exempted_debug_codes = (
-            HTTPStatus.INTERNAL_SERVER_ERROR,
-            HTTPStatus.NOT_FOUND,
-        )
-        if response.status_code in exempted_debug_codes and settings.DEBUG:
-            return response
+    async def __acall__(self, request: HttpRequest) -> HttpResponse:
+        """Async version of ``__call__``."""
+        header_set = get_security_policy().get_header_set(request)
+        nonce = self.attach_nonce(request, header_set)
+        return self.process_response(await self.get_response(request), header_set, nonce)
 
-        # Prevent clickjacking attacks
-        response["X-Frame-Options"] = "DENY"
+    @staticmethod
+    def attach_nonce(request: HttpRequest, header_set: HeaderSet) -> Optional[CSPNonce]:
+        """Attach a lazy CSP nonce to the request if the route's CSP uses one.
 
-        # Enable browser XSS filtering
-        response["X-XSS-Protection"] = "1; mode=block"
+        Args:
+            request: The incoming HTTP request.
+            header_set: The header set of the route.
 
-        # Prevent MIME type sniffing
-        response["X-Content-Type-Options"] = "nosniff"
+        Returns:
+            The nonce, or None if the route doesn't use one.
 
-        # HSTS (HTTP Strict Transport Security)
-        response["Strict-Transport-Security"] = "max-age=31536000; includeSubDomains"
+        """
+        if not header_set.uses_nonce:
+            return None
+        request.csp_nonce = CSPNonce()
+        return request.csp_nonce
 
-        # Content Security Policy
-        response["Content-Security-Policy"] = self._get_csp_policy()
+    def process_response(
+        self,
+        response: HttpResponse,
+        header_set: Optional[HeaderSet] = None,
+        nonce: Optional[CSPNonce] = None,
+    ) -> HttpResponse:
+        """Add security headers to the response.
 
-        return response
+        Args:
+            response: The response.
+            header_set: The header set of the route. Defaults to the default set.
+            nonce: The nonce attached to the request, if any.
 
-    def _get_csp_policy(self) -> str:
-        """Generate Content Security Policy."""
-        return "; ".join(
-            [
-                "default-src 'self'",
-                "img-src 'self' data: https:",
-                "script-src 'self' 'unsafe-inline' cdn.jsdelivr.net ",
-                "style-src 'self' 'unsafe-inline' https://cdn.jsdelivr.net",
-                "frame-ancestors 'none'",
-            ]
-        )
+        Returns:
+            The response.
+
+        """
+        policy = get_security_policy()
+        # Ignore debug mode
+        if response.status_code in policy.exempt_statuses:
+            return response
+        policy.apply(header_set or policy.default, response, nonce)
+        return response
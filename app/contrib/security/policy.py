@@ -0,0 +1,166 @@
+import secrets
+from functools import lru_cache
+from http import HTTPStatus
+from typing import Dict, Iterable, Mapping, NamedTuple, Optional, Tuple
+
+from django.conf import settings
+from django.dispatch import receiver
+from django.http import HttpRequest, HttpResponse
+from django.http.response import ResponseHeaders
+from django.test.signals import setting_changed
+
+from app.contrib.constants import SecurityHeaderConstant
+from app.contrib.health_check.matcher import PathPrefixTrie
+
+# Encoded and validated headers: (name, value).
+HeaderEntries = Tuple[Tuple[str, str], ...]
+
+
+class CSPNonce:
+    """Per-request CSP nonce, generated the first time it is rendered."""
+
+    __slots__ = ("value",)
+
+    def __init__(self) -> None:
+        """Create the nonce without generating it."""
+        self.value: Optional[str] = None
+
+    def __str__(self) -> str:
+        """Return the nonce, generating it on first use."""
+        if self.value is None:
+            self.value = secrets.token_urlsafe(SecurityHeaderConstant.NONCE_BYTES)
+        return self.value
+
+
+class HeaderSet(NamedTuple):
+    """Precomputed security headers for a route.
+
+    Attributes:
+        entries: Encoded headers, without the CSP when it takes a nonce
+        csp: CSP with the nonce placeholder, or None if it takes no nonce
+        csp_without_nonce: CSP sent when the view never rendered the nonce
+
+    """
+
+    entries: HeaderEntries
+    csp: Optional[str] = None
+    csp_without_nonce: Optional[str] = None
+
+    @property
+    def uses_nonce(self) -> bool:
+        """Whether the CSP of this route takes a nonce."""
+        return self.csp is not None
+
+
+class SecurityHeaderPolicy:
+    """Security headers compiled once from settings.
+
+    Every route gets a frozen tuple of encoded header entries, applied to the
+    response in one pass with no per-response string building. Routes are
+    matched on the longest path prefix; an override replaces the CSP
+    directives and adds, replaces or (with a None value) removes headers.
+
+    A CSP source written as ``'nonce-{nonce}'`` makes the middleware attach a
+    ``CSPNonce`` to ``request.csp_nonce``. The nonce is only generated if the
+    view renders it; otherwise that source is left out of the header.
+    Routes without the placeholder pay nothing for it.
+    """
+
+    CSP_HEADER = "Content-Security-Policy"
+
+    def __init__(
+        self,
+        headers: Mapping[str, str],
+        csp: Iterable[str],
+        routes: Optional[Mapping[str, Mapping]] = None,
+        debug: bool = False,
+    ) -> None:
+        """Compile the header sets."""
+        self.exempt_statuses = (
+            frozenset({HTTPStatus.INTERNAL_SERVER_ERROR, HTTPStatus.NOT_FOUND})
+            if debug
+            else frozenset()
+        )
+        self.default = self.compile(headers, csp)
+        self.routes = PathPrefixTrie()
+        for prefix, override in (routes or {}).items():
+            route_headers = {**headers, **override.get("headers", {})}
+            self.routes.add(prefix, self.compile(route_headers, override.get("csp", csp)))
+
+    @classmethod
+    def from_settings(cls) -> "SecurityHeaderPolicy":
+        """Build the policy from the ``SECURITY_*`` settings."""
+        return cls(
+            headers=getattr(settings, "SECURITY_HEADERS", SecurityHeaderConstant.HEADERS),
+            csp=getattr(settings, "SECURITY_CSP", SecurityHeaderConstant.CSP),
+            routes=getattr(settings, "SECURITY_HEADERS_ROUTES", None),
+            debug=settings.DEBUG,
+        )
+
+    @classmethod
+    def compile(cls, headers: Mapping[str, Optional[str]], csp: Iterable[str]) -> HeaderSet:
+        """Compile one header set.
+
+        Args:
+            headers: Header values by name; None leaves the header out.
+            csp: CSP directives; empty to send no CSP.
+
+        Returns:
+            The compiled header set.
+
+        """
+        values: Dict[str, str] = {name: value for name, value in headers.items() if value}
+        policy = "; ".join(csp)
+        source = SecurityHeaderConstant.NONCE_SOURCE
+        if source in policy:
+            without_nonce = "; ".join(
+                " ".join(part for part in directive.split(" ") if part != source)
+                for directive in csp
+            )
+            return HeaderSet(cls._encode(values), policy, without_nonce)
+        if policy:
+            values[cls.CSP_HEADER] = policy
+        return HeaderSet(cls._encode(values))
+
+    def get_header_set(self, request: HttpRequest) -> HeaderSet:
+        """Return the header set of the request's route."""
+        return self.routes.find(request.path, self.default)
+
+    def apply(
+        self, header_set: HeaderSet, response: HttpResponse, nonce: Optional[CSPNonce]
+    ) -> None:
+        """Add the header set to the response.
+
+        Args:
+            header_set: The header set of the route.
+            response: The response.
+            nonce: The nonce attached to the request, if the route uses one.
+
+        """
+        headers = response.headers
+        for name, value in header_set.entries:
+            headers[name] = value
+        if header_set.uses_nonce:
+            if nonce is not None and nonce.value is not None:
+                placeholder = SecurityHeaderConstant.NONCE_PLACEHOLDER
+                response[self.CSP_HEADER] = header_set.csp.replace(placeholder, nonce.value)
+            elif header_set.csp_without_nonce:
+                response[self.CSP_HEADER] = header_set.csp_without_nonce
+
+    @staticmethod
+    def _encode(values: Mapping[str, str]) -> HeaderEntries:
+        """Encode and validate the headers once."""
+        return tuple(ResponseHeaders(values).items())
+
+
+@lru_cache(maxsize=None)
+def get_security_policy() -> SecurityHeaderPolicy:
+    """Return the policy compiled from the settings."""
+    return SecurityHeaderPolicy.from_settings()
+
+
+@receiver(setting_changed)
+def _reset_security_policy(setting: str, **_kwargs: object) -> None:
+    """Recompile the policy when a setting it depends on changes."""
+    if setting == "DEBUG" or setting.startswith("SECURITY_"):
+        get_security_policy.cache_clear()
@@ -0,0 +1,167 @@
+from itertools import islice
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, Iterator, Optional, Tuple
+
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.db.models import QuerySet
+from django.http import HttpRequest, StreamingHttpResponse
+
+from asgiref.sync import sync_to_async
+
+from app.contrib.constants import StreamingConstant
+from app.contrib.renderers import dumps
+
+# Envelope keys known only once every item has been written.
+TRAILING_KEYS = ("count", "count_exact")
+
+
+class JSONListStream:
+    """Iterable of bytes encoding items as a JSON array, one batch at a time.
+
+    Only one batch of encoded items is held at a time, so memory stays flat
+    however many items there are. With an ``envelope``, the array is the
+    ``results`` key of an object holding the other keys. Those in
+    ``TRAILING_KEYS`` are written after the array, so ``count`` is the
+    number of items streamed and needs no ``COUNT(*)``.
+    """
+
+    def __init__(
+        self,
+        items: Iterable,
+        serialize: Callable[[Any], Any],
+        envelope: Optional[Dict[str, Any]] = None,
+        batch_size: int = StreamingConstant.CHUNK_SIZE,
+    ) -> None:
+        """Initialize the stream.
+
+        Args:
+            items: The items to stream, e.g. a queryset iterator.
+            serialize: Converts one item to JSON-serializable data.
+            envelope: Keys of the enclosing object, or None for a bare array.
+            batch_size: Number of items encoded per chunk.
+
+        """
+        self.items = items
+        self.serialize = serialize
+        self.envelope = envelope
+        self.batch_size = batch_size
+
+    def __iter__(self) -> Iterator[bytes]:
+        """Yield the encoded chunks."""
+        head, tail = self._split_envelope()
+        serialize = self.serialize
+        items = iter(self.items)
+        count = 0
+        chunk = head + b"["
+        while batch := list(islice(items, self.batch_size)):
+            separator = b"," if count else b""
+            chunk += separator + b",".join(dumps(serialize(item)) for item in batch)
+            count += len(batch)
+            yield chunk
+            chunk = b""
+        yield chunk + b"]" + self._encode_tail(tail, count)
+
+    async def aiter_chunks(self) -> AsyncIterator[bytes]:
+        """Yield the encoded chunks, reading and encoding each one in a worker thread.
+
+        Under ASGI, Django reads a sync iterator whole before sending it;
+        this keeps one batch in memory instead. Every batch is read in the
+        same thread, so a server-side cursor keeps its connection.
+        """
+        chunks = iter(self)
+        next_chunk = sync_to_async(next)
+        try:
+            while (chunk := await next_chunk(chunks, None)) is not None:
+                yield chunk
+        finally:
+            # Release the cursor if the client went away mid-stream.
+            await sync_to_async(chunks.close)()
+
+    def _split_envelope(self) -> Tuple[bytes, Dict[str, Any]]:
+        """Return the encoded opening of the envelope and its trailing keys."""
+        if self.envelope is None:
+            return b"", {}
+        leading = {key: value for key, value in self.envelope.items() if key not in TRAILING_KEYS}
+        tail = {key: value for key, value in self.envelope.items() if key in TRAILING_KEYS}
+        # Drop the closing brace and add the results key.
+        head = dumps(leading)[:-1]
+        return head + (b"," if leading else b"") + b'"results":', tail
+
+    def _encode_tail(self, tail: Dict[str, Any], count: int) -> bytes:
+        """Return the end of the envelope, with the final count."""
+        if self.envelope is None:
+            return b""
+        if "count" in tail:
+            tail["count"] = count
+        if "count_exact" in tail:
+            tail["count_exact"] = True
+        if not tail:
+            return b"}"
+        return b"," + dumps(tail)[1:]
+
+
+class StreamingListMixin:
+    """Stream the ``list`` action as JSON for large exports.
+
+    The filtered queryset is read with ``QuerySet.iterator`` in chunks of
+    ``stream_chunk_size`` (``STREAMING_CHUNK_SIZE`` by default) and written
+    to a ``StreamingHttpResponse`` as it is serialized, so neither the rows
+    nor the body are ever held in memory whole. The whole result set is
+    sent, in the envelope of the view's paginator (``next`` and ``previous``
+    are null), or as a bare array without a paginator.
+
+    The serializer is instantiated once and its ``to_representation`` is
+    called per row; prefetches are applied per chunk. The status and headers
+    are sent before the rows are read, so an error while streaming aborts
+    the response instead of returning an error body.
+
+    Attributes:
+        stream_chunk_size (int): Rows fetched and encoded per chunk, or None for the setting
+
+    """
+
+    stream_chunk_size: Optional[int] = None
+
+    def list(
+        self, request: HttpRequest, *_args: object, **_kwargs: object
+    ) -> StreamingHttpResponse:
+        """Return the filtered queryset as a streaming JSON response.
+
+        Under ASGI the content is an async iterator, so it is sent as it is
+        encoded.
+        """
+        queryset = self.filter_queryset(self.get_queryset())
+        serializer = self.get_serializer()
+        stream = JSONListStream(
+            self.get_stream_items(queryset),
+            serializer.to_representation,
+            envelope=self.get_stream_envelope(),
+            batch_size=self.get_stream_chunk_size(),
+        )
+        if isinstance(getattr(request, "_request", request), ASGIRequest):
+            return StreamingHttpResponse(stream.aiter_chunks(), content_type="application/json")
+        return StreamingHttpResponse(stream, content_type="application/json")
+
+    def get_stream_chunk_size(self) -> int:
+        """Return the number of rows fetched and encoded per chunk."""
+        return self.stream_chunk_size or getattr(
+            settings, "STREAMING_CHUNK_SIZE", StreamingConstant.CHUNK_SIZE
+        )
+
+    def get_stream_items(self, queryset: QuerySet) -> Iterator:
+        """Return an iterator over the rows that doesn't cache them."""
+        if isinstance(queryset, QuerySet):
+            return queryset.iterator(chunk_size=self.get_stream_chunk_size())
+        return iter(queryset)
+
+    def get_stream_envelope(self) -> Optional[Dict[str, Any]]:
+        """Return the keys of the paginator's envelope, other than ``results``.
+
+        Returns:
+            The keys with null values, or None to stream a bare array.
+
+        """
+        if self.paginator is None:
+            return None
+        schema = self.paginator.get_paginated_response_schema({})
+        return dict.fromkeys(key for key in schema.get("properties", {}) if key != "results")
@@ -0,0 +1,352 @@
+import threading
+from typing import Callable, Dict, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.base import BaseCache
+from django.http import HttpRequest
+from django.http.response import HttpResponseBase
+
+from rest_framework import throttling
+
+from app.contrib.cache import TwoTierCache
+from app.contrib.constants import ThrottleConstant
+from app.contrib.metrics.registry import throttle_rejections
+
+
+class LocalWindowStore:
+    """In-process sliding-window counters.
+
+    Each key holds its current window index and the counts of the current and
+    previous windows, so a hit is a single dict update under a short lock.
+    Counters are per process; use it where a per-worker limit is enough.
+    """
+
+    def __init__(self, max_keys: int = ThrottleConstant.LOCAL_MAX_KEYS) -> None:
+        """Initialize the store."""
+        self.max_keys = max_keys
+        self._windows: Dict[str, Tuple[int, int, int]] = {}
+        self._lock = threading.Lock()
+
+    def incr(self, key: str, window: int, _ttl: int) -> Tuple[int, int]:
+        """Count a hit in the window.
+
+        Args:
+            key: The throttle key.
+            window: Index of the current window.
+            _ttl: Unused; stale windows are dropped when the store is full.
+
+        Returns:
+            The previous window's count and the current count, including this hit.
+
+        """
+        with self._lock:
+            previous, current = self._get_counts(key, window)
+            current += 1
+            if key not in self._windows and len(self._windows) >= self.max_keys:
+                self._prune(window)
+            self._windows[key] = (window, previous, current)
+        return previous, current
+
+    def decr(self, key: str, window: int) -> None:
+        """Remove a hit counted in the window."""
+        with self._lock:
+            entry = self._windows.get(key)
+            if entry is not None and entry[0] == window and entry[2] > 0:
+                self._windows[key] = (window, entry[1], entry[2] - 1)
+
+    def clear(self) -> None:
+        """Drop every counter."""
+        with self._lock:
+            self._windows.clear()
+
+    def _get_counts(self, key: str, window: int) -> Tuple[int, int]:
+        """Return the previous and current counts of the key for the window."""
+        entry = self._windows.get(key)
+        if entry is None or entry[0] < window - 1:
+            return 0, 0
+        if entry[0] == window - 1:
+            return entry[2], 0
+        return entry[1], entry[2]
+
+    def _prune(self, window: int) -> None:
+        """Drop keys that no longer affect the current window, or all if none are stale."""
+        stale = [key for key, entry in self._windows.items() if entry[0] < window - 1]
+        if not stale:
+            self._windows.clear()
+        for key in stale:
+            del self._windows[key]
+
+
+class CacheWindowStore:
+    """Sliding-window counters shared through a Django cache.
+
+    Each window is a separate integer key created with ``add`` and bumped
+    with ``incr``, which are atomic on Redis and Memcached, so nothing is
+    rewritten and concurrent workers don't lose hits.
+    """
+
+    def __init__(self, alias: Optional[str] = None) -> None:
+        """Initialize the store for the given cache alias."""
+        self.alias = alias
+
+    @property
+    def cache(self) -> BaseCache:
+        """Return the cache used by the store.
+
+        A ``TwoTierCache`` is bypassed for its shared backend: counters are
+        written on every request, so the per-process tier would only add a
+        slot token write to each ``incr`` and serve stale counts.
+        """
+        alias = self.alias or getattr(settings, "THROTTLE_CACHE", ThrottleConstant.CACHE)
+        cache = caches[alias]
+        if isinstance(cache, TwoTierCache):
+            return cache.shared
+        return cache
+
+    def incr(self, key: str, window: int, ttl: int) -> Tuple[int, int]:
+        """Count a hit in the window.
+
+        Args:
+            key: The throttle key.
+            window: Index of the current window.
+            ttl: Seconds to keep the window's counter.
+
+        Returns:
+            The previous window's count and the current count, including this hit.
+
+        """
+        cache = self.cache
+        current_key = f"{key}:{window}"
+        if cache.add(current_key, 1, ttl):
+            current = 1
+        else:
+            try:
+                current = cache.incr(current_key)
+            except ValueError:
+                # The counter expired between ``add`` and ``incr``.
+                cache.set(current_key, 1, ttl)
+                current = 1
+        return cache.get(f"{key}:{window - 1}", 0), current
+
+    def decr(self, key: str, window: int) -> None:
+        """Remove a hit counted in the window."""
+        try:
+            self.cache.decr(f"{key}:{window}")
+        except ValueError:
+            pass
+
+
+class LocalGCRAStore:
+    """In-process GCRA state: one theoretical arrival time per key."""
+
+    def __init__(self, max_keys: int = ThrottleConstant.LOCAL_MAX_KEYS) -> None:
+        """Initialize the store."""
+        self.max_keys = max_keys
+        self._arrivals: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def hit(self, key: str, now: float, interval: float, limit: float) -> Optional[float]:
+        """Count a hit if it conforms to the rate.
+
+        Args:
+            key: The throttle key.
+            now: The current time in seconds.
+            interval: Seconds between requests at the sustained rate.
+            limit: How far ahead of ``now`` the arrival time may run (the period).
+
+        Returns:
+            None if the hit is allowed, otherwise the seconds to wait.
+
+        """
+        with self._lock:
+            arrival = max(self._arrivals.get(key, now), now) + interval
+            if arrival - now > limit:
+                return arrival - limit - now
+            if key not in self._arrivals and len(self._arrivals) >= self.max_keys:
+                self._prune(now)
+            self._arrivals[key] = arrival
+        return None
+
+    def clear(self) -> None:
+        """Drop every key."""
+        with self._lock:
+            self._arrivals.clear()
+
+    def _prune(self, now: float) -> None:
+        """Drop keys whose arrival time has passed, or all if none has."""
+        stale = [key for key, arrival in self._arrivals.items() if arrival <= now]
+        if not stale:
+            self._arrivals.clear()
+        for key in stale:
+            del self._arrivals[key]
+
+
+class CacheGCRAStore(CacheWindowStore):
+    """GCRA state shared through a Django cache.
+
+    The theoretical arrival time is one integer (milliseconds) per key and
+    is advanced with an atomic ``incr`` by the emission interval, so there is
+    no read-modify-write. A rejected hit is taken back with ``decr``. When the
+    key was idle, the arrival time is in the past and is reset to ``now``;
+    concurrent resets can only lose hits made while the key was idle.
+    """
+
+    def hit(self, key: str, now: float, interval: float, limit: float) -> Optional[float]:
+        """Count a hit if it conforms to the rate.
+
+        Args:
+            key: The throttle key.
+            now: The current time in seconds.
+            interval: Seconds between requests at the sustained rate.
+            limit: How far ahead of ``now`` the arrival time may run (the period).
+
+        Returns:
+            None if the hit is allowed, otherwise the seconds to wait.
+
+        """
+        cache = self.cache
+        now_ms = int(now * 1000)
+        step = max(1, int(interval * 1000))
+        ttl = int(limit) + 1
+        if cache.add(key, now_ms + step, ttl):
+            return None
+        try:
+            arrival = cache.incr(key, step)
+        except ValueError:
+            # The key expired between ``add`` and ``incr``.
+            cache.set(key, now_ms + step, ttl)
+            return None
+        if arrival - step < now_ms:
+            cache.set(key, now_ms + step, ttl)
+            return None
+        excess = arrival - now_ms - int(limit * 1000)
+        if excess <= 0:
+            cache.touch(key, ttl)
+            return None
+        cache.decr(key, step)
+        return excess / 1000
+
+
+class GCRAThrottleMixin:
+    """Generic cell rate algorithm for ``SimpleRateThrottle`` subclasses.
+
+    A rate of N requests per period becomes one request every period / N
+    seconds with a burst of up to N. The state is a single theoretical
+    arrival time per key, and the wait returned on rejection is the exact
+    time until the next request conforms, which DRF sends as ``Retry-After``.
+
+    Attributes:
+        store: Backend holding the arrival times; shared through the cache by default
+
+    """
+
+    store = CacheGCRAStore()
+
+    def allow_request(self, request: HttpRequest, view: Callable[..., HttpResponseBase]) -> bool:
+        """Check the request against the rate and count it if allowed.
+
+        Args:
+            request: The incoming request.
+            view: The view being throttled.
+
+        Returns:
+            True if the request is allowed, False otherwise.
+
+        """
+        self.wait_seconds = None
+        if self.rate is None:
+            return True
+
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        interval = self.duration / self.num_requests
+        self.wait_seconds = self.store.hit(self.key, self.timer(), interval, self.duration)
+        if self.wait_seconds is None:
+            return True
+        throttle_rejections.inc((self.scope or type(self).__name__,))
+        return self.throttle_failure()
+
+    def wait(self) -> Optional[float]:
+        """Return the seconds until a request would be allowed again."""
+        return getattr(self, "wait_seconds", None)
+
+
+class SlidingWindowThrottleMixin:
+    """Sliding-window counter algorithm for ``SimpleRateThrottle`` subclasses.
+
+    Instead of a timestamp list rewritten on every request, only two counters
+    are kept per key: the current and previous fixed windows. The request
+    count over the last ``duration`` seconds is estimated by weighting the
+    previous window by how much of it still overlaps, so each request costs
+    O(1) regardless of the rate.
+
+    Attributes:
+        store: Backend holding the counters; shared through the cache by default
+
+    """
+
+    store = CacheWindowStore()
+
+    def allow_request(self, request: HttpRequest, view: Callable[..., HttpResponseBase]) -> bool:
+        """Count the request and check whether it is within the rate.
+
+        Args:
+            request: The incoming request.
+            view: The view being throttled.
+
+        Returns:
+            True if the request is allowed, False otherwise.
+
+        """
+        self.wait_seconds = None
+        if self.rate is None:
+            return True
+
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        window, offset = divmod(self.timer(), self.duration)
+        window = int(window)
+        previous, current = self.store.incr(self.key, window, self.duration * 2)
+        weight = 1 - offset / self.duration
+        if previous * weight + current <= self.num_requests:
+            return True
+
+        # Rejected requests don't count toward the rate.
+        self.store.decr(self.key, window)
+        self.wait_seconds = self._get_wait(previous, current - 1, offset, weight)
+        throttle_rejections.inc((self.scope or type(self).__name__,))
+        return self.throttle_failure()
+
+    def wait(self) -> Optional[float]:
+        """Return the seconds until a request would be allowed again."""
+        return getattr(self, "wait_seconds", None)
+
+    def _get_wait(self, previous: int, current: int, offset: float, weight: float) -> float:
+        """Estimate when the weighted count drops below the rate."""
+        remaining = self.duration - offset
+        excess = previous * weight + current - self.num_requests + 1
+        if current >= self.num_requests or previous == 0:
+            return remaining
+        # The previous window's share decays linearly over the current window.
+        return min(remaining, excess * self.duration / previous)
+
+
+class SlidingWindowAnonRateThrottle(SlidingWindowThrottleMixin, throttling.AnonRateThrottle):
+    """``AnonRateThrottle`` using sliding-window counters."""
+
+
+class SlidingWindowUserRateThrottle(SlidingWindowThrottleMixin, throttling.UserRateThrottle):
+    """``UserRateThrottle`` using sliding-window counters."""
+
+
+class AnonRateThrottle(GCRAThrottleMixin, throttling.AnonRateThrottle):
+    """Drop-in ``AnonRateThrottle`` using atomic GCRA state."""
+
+
+class UserRateThrottle(GCRAThrottleMixin, throttling.UserRateThrottle):
+    """Drop-in ``UserRateThrottle`` using atomic GCRA state."""
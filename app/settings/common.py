@@ -16,7 +16,14 @@ from pathlib import Path
 
 from django.utils.translation import gettext_lazy as _
 
-from app.settings import EnvSettings, get_logging_config
+from app.settings import (
+    SQLITE_PRAGMAS,
+    EnvSettings,
+    get_cache_config,
+    get_database_config,
+    get_logging_config,
+    get_timed_middleware,
+)
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent.parent
@@ -79,20 +86,33 @@ CUSTOM_APPS = [
 ]
 INSTALLED_APPS = DJANGO_APPS + THIRD_PARTY_APPS + CUSTOM_APPS
 
-MIDDLEWARE = [
-    "app.contrib.health_check.middleware.HealthCheckMiddleware",
-    "django.middleware.security.SecurityMiddleware",
-    "django.contrib.sessions.middleware.SessionMiddleware",
-    "corsheaders.middleware.CorsMiddleware",
-    "django.middleware.common.CommonMiddleware",
-    "django.middleware.csrf.CsrfViewMiddleware",
-    "django.contrib.auth.middleware.AuthenticationMiddleware",
-    "app.contrib.health_check.middleware.MaintenanceMiddleware",
-    "django.contrib.messages.middleware.MessageMiddleware",
-    "django.middleware.clickjacking.XFrameOptionsMiddleware",
-    "app.contrib.request_logging.middleware.RequestLoggingMiddleware",
-    "app.contrib.security.middleware.SecurityHeadersMiddleware",
-]
+# Request timing: per-middleware spans, DB and cache totals for each request,
+# logged in one line (above SERVER_TIMING_SLOW_MS) and optionally sent in a
+# Server-Timing header. Nothing is instrumented when disabled.
+SERVER_TIMING_ENABLED = env_settings.SERVER_TIMING_ENABLED
+SERVER_TIMING_HEADER = env_settings.SERVER_TIMING_HEADER
+SERVER_TIMING_LOG = True
+SERVER_TIMING_SLOW_MS = 0
+
+MIDDLEWARE = get_timed_middleware(
+    [
+        "app.contrib.health_check.middleware.HealthCheckMiddleware",
+        "app.contrib.metrics.middleware.MetricsMiddleware",
+        "app.contrib.db.middleware.ReplicaRoutingMiddleware",
+        "django.middleware.security.SecurityMiddleware",
+        "django.contrib.sessions.middleware.SessionMiddleware",
+        "corsheaders.middleware.CorsMiddleware",
+        "django.middleware.common.CommonMiddleware",
+        "django.middleware.csrf.CsrfViewMiddleware",
+        "django.contrib.auth.middleware.AuthenticationMiddleware",
+        "app.contrib.health_check.middleware.MaintenanceMiddleware",
+        "django.contrib.messages.middleware.MessageMiddleware",
+        "django.middleware.clickjacking.XFrameOptionsMiddleware",
+        "app.contrib.request_logging.middleware.RequestLoggingMiddleware",
+        "app.contrib.security.middleware.SecurityHeadersMiddleware",
+    ],
+    SERVER_TIMING_ENABLED,
+)
 
 # Session security
 SESSION_COOKIE_SECURE = True
@@ -126,18 +146,85 @@ WSGI_APPLICATION = "app.wsgi.application"
 # Database
 # https://docs.djangoproject.com/en/4.2/ref/settings/#databases
 
-DATABASES = {
-    "default": {
-        "ENGINE": "django.db.backends.sqlite3",
-        "NAME": BASE_DIR / "db.sqlite3",
+# Built from DATABASE_URL, SQLite in the project directory by default.
+# Connections are reused for DATABASE_CONN_MAX_AGE seconds, or taken from a
+# psycopg pool with DATABASE_POOL (PostgreSQL, needs psycopg[pool]). Set
+# DATABASE_CONN_MAX_AGE=0 when serving through ASGI.
+# SQLite databases use the SQLITE_PRAGMAS profile (WAL, busy timeout) with
+# DATABASE_SQLITE_TUNING, needed when several workers share the file.
+DATABASE_SQLITE_PRAGMAS = SQLITE_PRAGMAS if env_settings.DATABASE_SQLITE_TUNING else None
+DATABASE_POOL_OPTIONS = (
+    {
+        "min_size": env_settings.DATABASE_POOL_MIN_SIZE,
+        "max_size": env_settings.DATABASE_POOL_MAX_SIZE,
+        "timeout": env_settings.DATABASE_POOL_TIMEOUT,
     }
+    if env_settings.DATABASE_POOL
+    else None
+)
+DATABASES = {
+    "default": get_database_config(
+        env_settings.DATABASE_URL or "sqlite:///db.sqlite3",
+        conn_max_age=env_settings.DATABASE_CONN_MAX_AGE,
+        conn_health_checks=env_settings.DATABASE_CONN_HEALTH_CHECKS,
+        pool=DATABASE_POOL_OPTIONS,
+        sqlite_pragmas=DATABASE_SQLITE_PRAGMAS,
+    )
 }
 
+# Read replicas from DATABASE_REPLICA_URLS, with the same connection options.
+# Reads of each request are balanced across them (round_robin, or
+# least_failed to prefer the replicas that failed least recently); writes
+# and, for DATABASE_STICKY_SECONDS, the next reads of the same client go to
+# the primary. A replica failing or lagging more than DATABASE_REPLICA_MAX_LAG
+# seconds is ejected for DATABASE_REPLICA_EJECT_SECONDS.
+DATABASE_REPLICAS = [f"replica_{i}" for i, _ in enumerate(env_settings.DATABASE_REPLICA_URLS)]
+for _alias, _url in zip(DATABASE_REPLICAS, env_settings.DATABASE_REPLICA_URLS):
+    DATABASES[_alias] = {
+        **get_database_config(
+            _url,
+            conn_max_age=env_settings.DATABASE_CONN_MAX_AGE,
+            conn_health_checks=env_settings.DATABASE_CONN_HEALTH_CHECKS,
+            pool=DATABASE_POOL_OPTIONS,
+            sqlite_pragmas=DATABASE_SQLITE_PRAGMAS,
+        ),
+        "TEST": {"MIRROR": "default"},
+    }
+# With DATABASE_SQLITE_READ_CONNECTION, a SQLite primary is also opened
+# read-only as a replica, so reads don't queue behind the writer's lock.
+if env_settings.DATABASE_SQLITE_READ_CONNECTION and DATABASES["default"]["ENGINE"].endswith(
+    "sqlite3"
+):
+    DATABASE_REPLICAS.append("sqlite_read")
+    DATABASES["sqlite_read"] = {
+        **get_database_config(
+            env_settings.DATABASE_URL or "sqlite:///db.sqlite3",
+            conn_max_age=env_settings.DATABASE_CONN_MAX_AGE,
+            conn_health_checks=env_settings.DATABASE_CONN_HEALTH_CHECKS,
+            sqlite_pragmas=DATABASE_SQLITE_PRAGMAS,
+            read_only=True,
+        ),
+        "TEST": {"MIRROR": "default"},
+    }
+DATABASE_ROUTERS = ["app.contrib.db.router.ReplicaRouter"]
+DATABASE_REPLICA_BALANCE = env_settings.DATABASE_REPLICA_BALANCE
+DATABASE_REPLICA_MAX_LAG = env_settings.DATABASE_REPLICA_MAX_LAG
+DATABASE_REPLICA_EJECT_SECONDS = 30
+DATABASE_REPLICA_CHECK_INTERVAL = 5
+DATABASE_STICKY_SECONDS = env_settings.DATABASE_STICKY_SECONDS
+
 # Caches
+# Built from CACHE_URL, per-process memory by default. Shared caches get a
+# per-process tier holding up to CACHE_LOCAL_MAX_ENTRIES hot entries for
+# CACHE_LOCAL_TIMEOUT seconds; writes from other workers are seen within
+# CACHE_SYNC_INTERVAL seconds.
+CACHE_OPTIONS = {
+    "local_max_entries": env_settings.CACHE_LOCAL_MAX_ENTRIES,
+    "local_timeout": env_settings.CACHE_LOCAL_TIMEOUT,
+    "sync_interval": env_settings.CACHE_SYNC_INTERVAL,
+}
 CACHES = {
-    "default": {
-        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
-    }
+    "default": get_cache_config(env_settings.CACHE_URL, **CACHE_OPTIONS),
 }
 
 # Password validation
@@ -205,7 +292,36 @@ SHELL_PLUS_IMPORTS = [
     "from app.contrib.config import config",
 ]
 
-LOGGING = get_logging_config("INFO", 100)
+# Queued file logging: request threads only enqueue records.
+LOG_QUEUE_OPTIONS = (
+    {"queue_size": env_settings.LOG_QUEUE_SIZE, "overflow": env_settings.LOG_QUEUE_OVERFLOW}
+    if env_settings.LOG_QUEUE_ENABLE
+    else None
+)
+LOGGING = get_logging_config("INFO", 100, queue_options=LOG_QUEUE_OPTIONS)
+
+# Keys masked in logged request bodies and error payloads: exact names, glob
+# patterns and dotted JSON paths ("*" matches any key or list index).
+LOG_REDACT_FIELDS = ["password", "token", "secret"]
+LOG_REDACT_PATTERNS = ["*password*", "*secret*", "*token", "*api_key"]
+LOG_REDACT_PATHS = []
+
+# Request logging policy: unsampled requests are still logged when they fail or
+# are slow. Routes: {"prefix": "/api/", "methods": ["GET"], "sample_rate": 0.1,
+# "level": "DEBUG"}; the longest matching prefix wins.
+REQUEST_LOGGING_SAMPLE_RATE = 1.0
+REQUEST_LOGGING_SLOW_MS = 1000
+REQUEST_LOGGING_ERROR_STATUS = 400
+REQUEST_LOGGING_ROUTES = []
+
+# API error logging: the first ERROR_LOG_DEDUP_LIMIT occurrences of an error
+# (class, code and view) per window are logged in full, the rest summarized.
+ERROR_LOG_DEDUP_LIMIT = 10
+ERROR_LOG_DEDUP_WINDOW = 60
+ERROR_LOG_DEDUP_MAX_KEYS = 1000
+
+# Log a bounded, sanitized prefix of request bodies above the size limit.
+REQUEST_LOGGING_CAPTURE_PREFIX = False
 
 REST_FRAMEWORK = {
     # Base API policies
@@ -217,11 +333,22 @@ REST_FRAMEWORK = {
         "rest_framework.permissions.IsAuthenticated",
     ],
     "DEFAULT_THROTTLE_CLASSES": [
-        "rest_framework.throttling.AnonRateThrottle",
-        "rest_framework.throttling.UserRateThrottle",
+        "app.contrib.throttling.AnonRateThrottle",
+        "app.contrib.throttling.UserRateThrottle",
     ],
     "DEFAULT_VERSIONING_CLASS": None,
+    # JSON goes through app.contrib.renderers, backed by orjson when installed.
+    "DEFAULT_RENDERER_CLASSES": [
+        "app.contrib.renderers.JSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+    "DEFAULT_PARSER_CLASSES": [
+        "app.contrib.renderers.JSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ],
     # Generic view behavior
+    # Use "app.contrib.pagination.KeysetPagination" for COUNT-free keyset pages.
     "DEFAULT_PAGINATION_CLASS": "app.contrib.pagination.CustomPagination",
     "DEFAULT_FILTER_BACKENDS": [
         "rest_framework.filters.SearchFilter",
@@ -301,6 +428,69 @@ CONSTANCE_CONFIG_FIELDSETS = (
         },
     ),
 )
+# Seconds between checks of the shared config version counter.
+CONFIG_SNAPSHOT_TTL = 5
+# Cache alias holding the shared config version counter.
+CONFIG_SNAPSHOT_CACHE = "default"
 
 # Endpoint to health check API service
 HEALTH_CHECK_ENDPOINT = env_settings.HEALTH_CHECK_ENDPOINT
+HEALTH_CHECK_LIVENESS_ENDPOINT = env_settings.HEALTH_CHECK_LIVENESS_ENDPOINT
+HEALTH_CHECK_READINESS_ENDPOINT = env_settings.HEALTH_CHECK_READINESS_ENDPOINT
+# Seconds a health report is reused before the checks run again.
+HEALTH_CHECK_CACHE_TTL = 5
+# Dotted paths to additional BaseHealthCheck subclasses run by the readiness probe.
+HEALTH_CHECK_EXTRA_CHECKS = []
+
+# Prometheus metrics, summed across the workers from per-process files in
+# METRICS_DIR (a temp directory by default). The endpoint is only served to
+# METRICS_ALLOWED_IPS or with "Authorization: Bearer <METRICS_TOKEN>".
+METRICS_ENABLED = env_settings.METRICS_ENABLED
+METRICS_ENDPOINT = env_settings.METRICS_ENDPOINT
+METRICS_DIR = env_settings.METRICS_DIR
+METRICS_ALLOWED_IPS = ["127.0.0.1", "::1"]
+METRICS_TOKEN = (
+    env_settings.METRICS_TOKEN.get_secret_value() if env_settings.METRICS_TOKEN else None
+)
+
+# Security headers, compiled once by app.contrib.security.policy. Routes override
+# them by path prefix: {"/apidocs/": {"csp": [...], "headers": {"X-Frame-Options": None}}}.
+# A CSP source "'nonce-{nonce}'" adds a per-request nonce (request.csp_nonce).
+SECURITY_HEADERS = {
+    "X-Frame-Options": "DENY",
+    "X-XSS-Protection": "1; mode=block",
+    "X-Content-Type-Options": "nosniff",
+    "Strict-Transport-Security": "max-age=31536000; includeSubDomains",
+}
+SECURITY_CSP = [
+    "default-src 'self'",
+    "img-src 'self' data: https:",
+    "script-src 'self' 'unsafe-inline' cdn.jsdelivr.net ",
+    "style-src 'self' 'unsafe-inline' https://cdn.jsdelivr.net",
+    "frame-ancestors 'none'",
+]
+SECURITY_HEADERS_ROUTES = {}
+
+# Cache holding the shared throttle counters; use an atomic backend such as
+# Redis or Memcached when running several workers. The per-process tier of a
+# TwoTierCache is bypassed for them.
+THROTTLE_CACHE = "default"
+
+# CustomPagination count strategy: "exact", "cached" (per query, for the TTL)
+# or "estimated" (PostgreSQL planner estimate above the threshold).
+PAGINATION_COUNT_STRATEGY = "exact"
+PAGINATION_COUNT_CACHE_TTL = 60
+PAGINATION_COUNT_ESTIMATE_THRESHOLD = 100000
+
+# Rows fetched and encoded per chunk by StreamingListMixin.
+STREAMING_CHUNK_SIZE = 2000
+
+# Paths never logged by the request logging middleware.
+REQUEST_LOGGING_SKIP_PATHS = [
+    HEALTH_CHECK_ENDPOINT,
+    HEALTH_CHECK_LIVENESS_ENDPOINT,
+    HEALTH_CHECK_READINESS_ENDPOINT,
+    METRICS_ENDPOINT,
+    f"/{STATIC_URL}",
+    f"/{MEDIA_URL}",
+]
@@ -15,22 +15,27 @@ THIRD_PARTY_APPS += [
 ]
 INSTALLED_APPS = DJANGO_APPS + THIRD_PARTY_APPS + CUSTOM_APPS
 
-MIDDLEWARE = [
-    "app.contrib.health_check.middleware.HealthCheckMiddleware",
-    "django.middleware.security.SecurityMiddleware",
-    "django.contrib.sessions.middleware.SessionMiddleware",
-    "corsheaders.middleware.CorsMiddleware",
-    "django.middleware.locale.LocaleMiddleware",
-    "django.middleware.common.CommonMiddleware",
-    "django.middleware.csrf.CsrfViewMiddleware",
-    "django.contrib.auth.middleware.AuthenticationMiddleware",
-    "app.contrib.health_check.middleware.MaintenanceMiddleware",
-    "django.contrib.messages.middleware.MessageMiddleware",
-    "django.middleware.clickjacking.XFrameOptionsMiddleware",
-    "app.contrib.request_logging.middleware.RequestLoggingMiddleware",
-    "app.contrib.security.middleware.SecurityHeadersMiddleware",
-    "debug_toolbar.middleware.DebugToolbarMiddleware",
-]
+MIDDLEWARE = get_timed_middleware(
+    [
+        "app.contrib.health_check.middleware.HealthCheckMiddleware",
+        "app.contrib.metrics.middleware.MetricsMiddleware",
+        "app.contrib.db.middleware.ReplicaRoutingMiddleware",
+        "django.middleware.security.SecurityMiddleware",
+        "django.contrib.sessions.middleware.SessionMiddleware",
+        "corsheaders.middleware.CorsMiddleware",
+        "django.middleware.locale.LocaleMiddleware",
+        "django.middleware.common.CommonMiddleware",
+        "django.middleware.csrf.CsrfViewMiddleware",
+        "django.contrib.auth.middleware.AuthenticationMiddleware",
+        "app.contrib.health_check.middleware.MaintenanceMiddleware",
+        "django.contrib.messages.middleware.MessageMiddleware",
+        "django.middleware.clickjacking.XFrameOptionsMiddleware",
+        "app.contrib.request_logging.middleware.RequestLoggingMiddleware",
+        "app.contrib.security.middleware.SecurityHeadersMiddleware",
+        "debug_toolbar.middleware.DebugToolbarMiddleware",
+    ],
+    SERVER_TIMING_ENABLED,
+)
 
 # django-debug-toolbar
 INTERNAL_IPS = [
@@ -68,7 +73,7 @@ SPECTACULAR_SETTINGS = {
     "SCHEMA_PATH_PREFIX": "/api/v1/",
 }
 
-LOGGING = get_logging_config("DEBUG", 10)
+LOGGING = get_logging_config("DEBUG", 10, queue_options=LOG_QUEUE_OPTIONS)
 
 # django-constance
 CONSTANCE_BACKEND = "constance.backends.memory.MemoryBackend"
@@ -15,35 +15,30 @@ THIRD_PARTY_APPS += [
 ]
 INSTALLED_APPS = DJANGO_APPS + THIRD_PARTY_APPS + CUSTOM_APPS
 
-MIDDLEWARE = [
-    "app.contrib.health_check.middleware.HealthCheckMiddleware",
-    "django.middleware.security.SecurityMiddleware",
-    "django.contrib.sessions.middleware.SessionMiddleware",
-    "corsheaders.middleware.CorsMiddleware",
-    "django.middleware.locale.LocaleMiddleware",
-    "django.middleware.common.CommonMiddleware",
-    "django.middleware.csrf.CsrfViewMiddleware",
-    "django.contrib.auth.middleware.AuthenticationMiddleware",
-    "app.contrib.health_check.middleware.MaintenanceMiddleware",
-    "django.contrib.messages.middleware.MessageMiddleware",
-    "django.middleware.clickjacking.XFrameOptionsMiddleware",
-    "app.contrib.request_logging.middleware.RequestLoggingMiddleware",
-    "app.contrib.security.middleware.SecurityHeadersMiddleware",
-    "debug_toolbar.middleware.DebugToolbarMiddleware",
-]
-
-DATABASES = {
-    "default": {
-        "ENGINE": "django.db.backends.sqlite3",
-        "NAME": BASE_DIR / "db.sqlite3",
-    }
-}
+MIDDLEWARE = get_timed_middleware(
+    [
+        "app.contrib.health_check.middleware.HealthCheckMiddleware",
+        "app.contrib.metrics.middleware.MetricsMiddleware",
+        "app.contrib.db.middleware.ReplicaRoutingMiddleware",
+        "django.middleware.security.SecurityMiddleware",
+        "django.contrib.sessions.middleware.SessionMiddleware",
+        "corsheaders.middleware.CorsMiddleware",
+        "django.middleware.locale.LocaleMiddleware",
+        "django.middleware.common.CommonMiddleware",
+        "django.middleware.csrf.CsrfViewMiddleware",
+        "django.contrib.auth.middleware.AuthenticationMiddleware",
+        "app.contrib.health_check.middleware.MaintenanceMiddleware",
+        "django.contrib.messages.middleware.MessageMiddleware",
+        "django.middleware.clickjacking.XFrameOptionsMiddleware",
+        "app.contrib.request_logging.middleware.RequestLoggingMiddleware",
+        "app.contrib.security.middleware.SecurityHeadersMiddleware",
+        "debug_toolbar.middleware.DebugToolbarMiddleware",
+    ],
+    SERVER_TIMING_ENABLED,
+)
 
 CACHES = {
-    "default": {
-        "BACKEND": "django.core.cache.backends.db.DatabaseCache",
-        "LOCATION": "app_cache",
-    }
+    "default": get_cache_config(env_settings.CACHE_URL or "db://app_cache", **CACHE_OPTIONS),
 }
 
 # django-debug-toolbar
@@ -82,7 +77,7 @@ SPECTACULAR_SETTINGS = {
     "SCHEMA_PATH_PREFIX": "/api/",
 }
 
-LOGGING = get_logging_config("DEBUG", 10)
+LOGGING = get_logging_config("DEBUG", 10, queue_options=LOG_QUEUE_OPTIONS)
 
 # django-constance
 CONSTANCE_BACKEND = "constance.backends.memory.MemoryBackend"
@@ -20,6 +20,7 @@ DATABASES = {
         "NAME": BASE_DIR / "db.sqlite3",
     }
 }
+DATABASE_REPLICAS = []  # replicas from DATABASE_REPLICA_URLS are not configured in tests
 
 CACHES = {
     "default": {
@@ -37,7 +38,7 @@ SPECTACULAR_SETTINGS = {
     "SCHEMA_PATH_PREFIX": "/api/",
 }
 
-LOGGING = get_logging_config("DEBUG", 3)
+LOGGING = get_logging_config("DEBUG", 3, queue_options=LOG_QUEUE_OPTIONS)
 
 # django-constance
 CONSTANCE_BACKEND = "constance.backends.memory.MemoryBackend"
@@ -2,4 +2,4 @@ from .common import *  # NOQA NOSONAR
 
 EMAIL_SUBJECT_PREFIX = "[APP][STG]"
 
-LOGGING = get_logging_config("DEBUG", 30)
+LOGGING = get_logging_config("DEBUG", 30, queue_options=LOG_QUEUE_OPTIONS)
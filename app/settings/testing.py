@@ -29,4 +29,4 @@ REST_FRAMEWORK["DEFAULT_SCHEMA_CLASS"] = "drf_spectacular.openapi.AutoSchema"
 
 EMAIL_SUBJECT_PREFIX = "[APP][TESTING]"
 
-LOGGING = get_logging_config("DEBUG", 30)
+LOGGING = get_logging_config("DEBUG", 30, queue_options=LOG_QUEUE_OPTIONS)
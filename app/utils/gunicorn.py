@@ -0,0 +1,155 @@
+import importlib.util
+import math
+import os
+from pathlib import Path
+from typing import Optional, Tuple
+
+CGROUP_ROOT = Path("/sys/fs/cgroup")
+
+# cgroup v1 reports "no limit" as a huge page-aligned number.
+UNLIMITED_MEMORY = 1 << 60
+
+WORKER_CLASSES = {
+    "sync": "sync",
+    "gthread": "gthread",
+    "asgi": "uvicorn_worker.UvicornWorker",
+}
+
+
+def _read(path: Path) -> Optional[str]:
+    """Return the stripped content of a cgroup file, or None if it can't be read."""
+    try:
+        return path.read_text().strip()
+    except OSError:
+        return None
+
+
+def get_cpu_limit(root: Path = CGROUP_ROOT) -> float:
+    """Return the CPUs available to the process.
+
+    The CFS quota of the cgroup (v2 ``cpu.max`` or v1 ``cpu.cfs_quota_us``)
+    is what ``docker run --cpus`` and ``deploy.resources.limits.cpus`` set;
+    ``os.cpu_count`` would report the CPUs of the host.
+
+    Args:
+        root: Mount point of the cgroup file system.
+
+    Returns:
+        The CPU quota, possibly fractional, capped by the CPUs the process
+        may run on.
+
+    """
+    if hasattr(os, "sched_getaffinity"):
+        cpus = float(len(os.sched_getaffinity(0)))
+    else:
+        cpus = float(os.cpu_count() or 1)
+
+    quota = period = None
+    cpu_max = _read(root / "cpu.max")
+    if cpu_max is not None:
+        quota, _, period = cpu_max.partition(" ")
+    else:
+        quota = _read(root / "cpu" / "cpu.cfs_quota_us")
+        period = _read(root / "cpu" / "cpu.cfs_period_us")
+    try:
+        limit = int(quota) / int(period)
+    except (TypeError, ValueError, ZeroDivisionError):
+        return cpus  # "max", -1 or no cgroup
+    return min(cpus, limit) if limit > 0 else cpus
+
+
+def get_memory_limit(root: Path = CGROUP_ROOT) -> Optional[int]:
+    """Return the memory limit of the cgroup in bytes, or None if unlimited.
+
+    Args:
+        root: Mount point of the cgroup file system.
+
+    Returns:
+        The v2 ``memory.max`` or v1 ``memory.limit_in_bytes`` limit.
+
+    """
+    value = _read(root / "memory.max") or _read(root / "memory" / "memory.limit_in_bytes")
+    try:
+        limit = int(value)
+    except (TypeError, ValueError):
+        return None  # "max" or no cgroup
+    return limit if 0 < limit < UNLIMITED_MEMORY else None
+
+
+def get_worker_count(
+    worker_class: str,
+    cpus: float,
+    memory_limit: Optional[int] = None,
+    worker_memory: int = 256 * 1024 * 1024,
+) -> int:
+    """Return the number of workers suited to the CPU and memory limits.
+
+    Sync workers block on I/O, so they run ``2 * CPUs + 1`` processes to keep
+    the CPUs busy. Threaded and ASGI workers wait for I/O concurrently inside
+    each process, so one process per CPU is enough; a threaded pool gets one
+    more for the time its workers spend holding the GIL.
+
+    Args:
+        worker_class: ``sync``, ``gthread`` or ``asgi``.
+        cpus: CPUs available, e.g. from ``get_cpu_limit``.
+        memory_limit: Memory available in bytes, None if unlimited.
+        worker_memory: Memory used by one worker in bytes.
+
+    Returns:
+        The number of workers, at least 1 and never more than fit in memory.
+
+    Raises:
+        ValueError: If the worker class is unknown.
+
+    """
+    if worker_class not in WORKER_CLASSES:
+        raise ValueError(f"Unknown Gunicorn worker class: {worker_class!r}")
+    cores = max(1, math.ceil(cpus))
+    if worker_class == "sync":
+        workers = 2 * cores + 1
+    elif worker_class == "gthread":
+        workers = cores + 1
+    else:
+        workers = cores
+    if memory_limit is not None:
+        workers = min(workers, memory_limit // worker_memory)
+    return max(1, workers)
+
+
+def get_worker_config(
+    worker_class: str,
+    workers: Optional[int] = None,
+    threads: Optional[int] = None,
+    worker_memory: int = 256 * 1024 * 1024,
+    root: Path = CGROUP_ROOT,
+) -> Tuple[str, int, int]:
+    """Return the Gunicorn worker class, workers and threads per worker.
+
+    Args:
+        worker_class: ``sync``, ``gthread`` or ``asgi``.
+        workers: Number of workers, computed from the cgroup limits if None.
+        threads: Threads per ``gthread`` worker, 4 if None; always 1 otherwise.
+        worker_memory: Memory used by one worker in bytes.
+        root: Mount point of the cgroup file system.
+
+    Returns:
+        The ``worker_class``, ``workers`` and ``threads`` settings.
+
+    Raises:
+        ValueError: If the worker class is unknown, or its module is not installed.
+
+    """
+    module, _, _ = WORKER_CLASSES.get(worker_class, "").rpartition(".")
+    if module and importlib.util.find_spec(module) is None:
+        raise ValueError(
+            f"Gunicorn worker class {worker_class!r} needs the {module!r} module; "
+            "install it with `uv sync --extra asgi`"
+        )
+    if workers is None:
+        workers = get_worker_count(
+            worker_class, get_cpu_limit(root), get_memory_limit(root), worker_memory
+        )
+    elif worker_class not in WORKER_CLASSES:
+        raise ValueError(f"Unknown Gunicorn worker class: {worker_class!r}")
+    threads = (threads or 4) if worker_class == "gthread" else 1
+    return WORKER_CLASSES[worker_class], workers, threads
@@ -0,0 +1,94 @@
+"""Compare DRF's JSON renderer and parser with ``app.contrib.renderers``.
+
+Run from the project root::
+
+    python -m benchmarks.json_renderers [--settings=app.settings.local] [--rows=1000]
+
+The payload mimics a page of API results with strings, integers, decimals,
+UUIDs, datetimes and lazy translation strings.
+"""
+
+import argparse
+import datetime
+import decimal
+import os
+import sys
+import timeit
+import uuid
+from typing import Callable, Dict, List
+
+import django
+
+from app.utils.config import setup_django_environment
+
+
+def build_payload(rows: int) -> Dict:
+    """Return a paginated response body with ``rows`` results."""
+    from django.utils.translation import gettext_lazy
+
+    now = datetime.datetime.now(datetime.timezone.utc)
+    results: List[Dict] = [
+        {
+            "id": index,
+            "uuid": uuid.uuid4(),
+            "name": f"Item {index} – ünïcode",
+            "price": decimal.Decimal("19.99"),
+            "created_at": now,
+            "tags": ["alpha", "beta", "gamma"],
+            "status": gettext_lazy("Not found."),
+            "active": index % 2 == 0,
+        }
+        for index in range(rows)
+    ]
+    return {"count": rows, "next": None, "previous": None, "results": results}
+
+
+def measure(name: str, func: Callable[[], object], number: int) -> float:
+    """Time the function and print the mean duration per call."""
+    best = min(timeit.repeat(func, number=number, repeat=5)) / number
+    sys.stdout.write(f"{name:<32} {best * 1e6:>10.1f} µs\n")
+    return best
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--number", type=int, default=50)
+    args, _ = parser.parse_known_args()
+
+    settings_module, _ = setup_django_environment(from_command_line=True)
+    os.environ["DJANGO_SETTINGS_MODULE"] = settings_module
+    django.setup()
+
+    from rest_framework import parsers, renderers
+
+    from app.contrib import renderers as fast
+
+    payload = build_payload(args.rows)
+    body = renderers.JSONRenderer().render(payload)
+    sys.stdout.write(
+        f"{args.rows} rows, {len(body)} bytes, "
+        f"backend: {'orjson' if fast.orjson is not None else 'json (stdlib)'}\n"
+    )
+
+    def parse(parser_class: type) -> Callable[[], object]:
+        from io import BytesIO
+
+        return lambda: parser_class().parse(BytesIO(body))
+
+    drf_render = measure(
+        "render: DRF JSONRenderer", lambda: renderers.JSONRenderer().render(payload), args.number
+    )
+    fast_render = measure(
+        "render: contrib JSONRenderer", lambda: fast.JSONRenderer().render(payload), args.number
+    )
+    drf_parse = measure("parse: DRF JSONParser", parse(parsers.JSONParser), args.number)
+    fast_parse = measure("parse: contrib JSONParser", parse(fast.JSONParser), args.number)
+    sys.stdout.write(
+        f"speedup: render x{drf_render / fast_render:.1f}, parse x{drf_parse / fast_parse:.1f}\n"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""Compare SQLite throughput with default pragmas and ``SQLITE_PRAGMAS``.
+
+Run from the project root::
+
+    python -m benchmarks.sqlite_pragmas [--processes=4] [--operations=500]
+
+Each process opens its own connection to a shared database file, like
+gunicorn workers, and mixes write transactions (a read then an insert,
+like ``get_or_create``) with primary-key reads. The default profile uses a
+rollback journal and deferred transactions, as Django does without
+``OPTIONS``; the tuned profile sets the pragmas of ``get_database_config``
+and begins transactions with ``IMMEDIATE``.
+"""
+
+import argparse
+import multiprocessing
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Tuple
+
+from app.settings import SQLITE_PRAGMAS, get_sqlite_init_command
+
+PROFILES = ("default", "tuned")
+
+
+def connect(path: str, profile: str) -> sqlite3.Connection:
+    """Open a connection configured like the application would."""
+    connection = sqlite3.connect(path, isolation_level=None)
+    if profile == "tuned":
+        for statement in get_sqlite_init_command(SQLITE_PRAGMAS).split(";"):
+            connection.execute(statement)
+    return connection
+
+
+def setup_database(path: str, profile: str, rows: int) -> None:
+    """Create the table read and written by the workers."""
+    connection = connect(path, profile)
+    connection.execute("CREATE TABLE item (id INTEGER PRIMARY KEY, name TEXT, payload TEXT)")
+    connection.executemany(
+        "INSERT INTO item (name, payload) VALUES (?, ?)",
+        ((f"item {index}", "x" * 200) for index in range(rows)),
+    )
+    connection.close()
+
+
+def work(args: Tuple[str, str, int, float, int]) -> Tuple[int, int, int]:
+    """Run the operations of one process.
+
+    Returns:
+        The number of writes, reads and "database is locked" errors.
+
+    """
+    path, profile, operations, write_ratio, rows = args
+    connection = connect(path, profile)
+    begin = "BEGIN IMMEDIATE" if profile == "tuned" else "BEGIN"
+    rng = random.Random()  # noqa: S311
+    writes = reads = errors = 0
+    for _ in range(operations):
+        if rng.random() < write_ratio:
+            try:
+                connection.execute(begin)
+                name = f"item {rng.randrange(rows * 2)}"
+                exists = connection.execute(
+                    "SELECT id FROM item WHERE name = ?", (name,)
+                ).fetchone()
+                if exists is None:
+                    connection.execute(
+                        "INSERT INTO item (name, payload) VALUES (?, ?)", (name, "y" * 200)
+                    )
+                connection.execute("COMMIT")
+                writes += 1
+            except sqlite3.OperationalError:
+                errors += 1
+                if connection.in_transaction:
+                    connection.execute("ROLLBACK")
+        else:
+            try:
+                connection.execute(
+                    "SELECT name, payload FROM item WHERE id = ?", (rng.randrange(1, rows),)
+                ).fetchone()
+                reads += 1
+            except sqlite3.OperationalError:
+                errors += 1
+    connection.close()
+    return writes, reads, errors
+
+
+def run(profile: str, args: argparse.Namespace) -> None:
+    """Benchmark one profile on a fresh database and print its throughput."""
+    with tempfile.TemporaryDirectory() as directory:
+        path = str(Path(directory) / "bench.sqlite3")
+        setup_database(path, profile, args.rows)
+        tasks = [
+            (path, profile, args.operations, args.write_ratio, args.rows)
+            for _ in range(args.processes)
+        ]
+        started = time.perf_counter()
+        with multiprocessing.Pool(args.processes) as pool:
+            results = pool.map(work, tasks)
+        elapsed = time.perf_counter() - started
+
+    writes = sum(result[0] for result in results)
+    reads = sum(result[1] for result in results)
+    errors = sum(result[2] for result in results)
+    sys.stdout.write(
+        f"{profile:<8} {writes / elapsed:>10.0f} writes/s {reads / elapsed:>10.0f} reads/s "
+        f"{errors:>6} locked errors {elapsed:>8.2f} s\n"
+    )
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--processes", type=int, default=4)
+    parser.add_argument("--operations", type=int, default=500)
+    parser.add_argument("--write-ratio", type=float, default=0.2)
+    parser.add_argument("--rows", type=int, default=10000)
+    args = parser.parse_args()
+
+    sys.stdout.write(
+        f"{args.processes} processes x {args.operations} operations, "
+        f"{args.write_ratio:.0%} writes, SQLite {sqlite3.sqlite_version}\n"
+    )
+    for profile in PROFILES:
+        run(profile, args)
+
+
+if __name__ == "__main__":
+    main()
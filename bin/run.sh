@@ -107,11 +107,5 @@ else
 fi
 
 echo "Starting Gunicorn..."
-exec python -m gunicorn \
-    --workers ${GUNICORN_WORKERS:-4} \
-    --bind 0.0.0.0:8000 \
-    --env DJANGO_SETTINGS_MODULE=${DJANGO_SETTINGS_MODULE} \
-    --timeout ${GUNICORN_TIMEOUT:-120} \
-    --keep-alive ${GUNICORN_KEEP_ALIVE:-5} \
-    --reload \
-    app.wsgi:application
+# Workers, threads, reload and preload come from the GUNICORN_* variables
+exec python -m gunicorn --config gunicorn.conf.py
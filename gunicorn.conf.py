@@ -0,0 +1,88 @@
+"""Gunicorn configuration, read from the same environment as the Django settings.
+
+Gunicorn loads this file from the working directory::
+
+    gunicorn                                # serves app.wsgi, or app.asgi for asgi workers
+    gunicorn -c gunicorn.conf.py app.wsgi   # explicit
+
+Without GUNICORN_WORKERS the number of workers is computed from the CPU quota
+and memory limit of the container's cgroup, not from the CPUs of the host.
+"""
+
+import logging
+import sys
+
+from gunicorn.arbiter import Arbiter
+from gunicorn.workers.base import Worker
+
+from app.settings import EnvSettings
+from app.utils.config import setup_django_environment
+from app.utils.gunicorn import get_worker_config
+
+settings_module, env_file = setup_django_environment(from_command_line=False)
+try:
+    env_settings = EnvSettings(
+        _case_sensitive=False, _env_file=env_file, _env_file_encoding="utf-8"
+    )
+except Exception as e:
+    logging.error("\033[91mERROR: Environment validation error: %s\033[0m", e)
+    sys.exit(1)
+
+worker_class, workers, threads = get_worker_config(
+    env_settings.GUNICORN_WORKER_CLASS,
+    workers=env_settings.GUNICORN_WORKERS,
+    threads=env_settings.GUNICORN_THREADS,
+    worker_memory=env_settings.GUNICORN_WORKER_MEMORY_MB * 1024 * 1024,
+)
+wsgi_app = (
+    "app.asgi:application"
+    if env_settings.GUNICORN_WORKER_CLASS == "asgi"
+    else "app.wsgi:application"
+)
+raw_env = [f"DJANGO_SETTINGS_MODULE={settings_module}"]
+
+bind = "0.0.0.0:8000"
+timeout = env_settings.GUNICORN_TIMEOUT
+keepalive = env_settings.GUNICORN_KEEP_ALIVE
+
+# Restart workers now and then to bound memory growth; the jitter keeps them
+# from restarting at the same time.
+max_requests = env_settings.GUNICORN_MAX_REQUESTS
+max_requests_jitter = env_settings.GUNICORN_MAX_REQUESTS_JITTER if max_requests else 0
+
+# Reloading only makes sense in development, and does not work with a
+# preloaded application.
+reload = env_settings.DEBUG
+preload_app = env_settings.GUNICORN_PRELOAD and not reload
+
+
+def on_starting(_server: Arbiter) -> None:
+    """Delete the metric files of a previous run before the workers start."""
+    if not env_settings.METRICS_ENABLED:
+        return
+    from app.contrib.metrics.registry import get_metrics_dir
+    from app.contrib.metrics.store import MetricsStore
+
+    MetricsStore(get_metrics_dir()).clear()
+
+
+def child_exit(_server: Arbiter, worker: Worker) -> None:
+    """Merge the metric file of an exited worker so the files don't pile up."""
+    if not env_settings.METRICS_ENABLED:
+        return
+    from app.contrib.metrics.registry import get_metrics_dir
+    from app.contrib.metrics.store import MetricsStore
+
+    MetricsStore(get_metrics_dir()).mark_process_dead(worker.pid)
+
+
+def when_ready(server: Arbiter) -> None:
+    """Log the computed concurrency."""
+    server.log.info(
+        "Serving %s with %s %s workers x %s threads (preload: %s)",
+        wsgi_app,
+        workers,
+        worker_class,
+        threads,
+        preload_app,
+    )
@@ -0,0 +1,88 @@
+import time
+from unittest import TestCase
+from unittest.mock import patch
+
+from django.db import OperationalError
+from django.test import TestCase as DjangoTestCase
+from django.test import override_settings
+
+from app.contrib.db.replicas import ReplicaSet, get_replicas
+from app.contrib.health_check.checks import ReplicaHealthCheck
+
+
+class TestReplicaSet(TestCase):
+    """Test the ReplicaSet class."""
+
+    def make_replicas(self, **kwargs: object) -> ReplicaSet:
+        """Return a replica set whose replicas were just checked."""
+        replicas = ReplicaSet(["replica_0", "replica_1"], **kwargs)
+        for state in replicas.states.values():
+            state.checked_at = time.monotonic()
+        return replicas
+
+    def test_round_robin(self):
+        """Test that reads rotate across the replicas."""
+        replicas = self.make_replicas()
+        self.assertEqual(
+            [replicas.choose() for _ in range(3)], ["replica_0", "replica_1", "replica_0"]
+        )
+
+    def test_ejected_replica_is_skipped(self):
+        """Test that a failing replica is out of rotation until it recovers."""
+        replicas = self.make_replicas(eject_seconds=60)
+        replicas.report_failure("replica_0", "connection refused")
+        self.assertEqual({replicas.choose() for _ in range(4)}, {"replica_1"})
+        replicas.report_failure("replica_1", "connection refused")
+        self.assertIsNone(replicas.choose())
+
+    def test_least_failed(self):
+        """Test that the replica that failed least recently is preferred."""
+        replicas = self.make_replicas(balance="least_failed", eject_seconds=0)
+        replicas.report_failure("replica_1", "timeout")
+        replicas.report_failure("replica_0", "timeout")
+        with patch.object(ReplicaSet, "check", return_value=True):
+            self.assertEqual([replicas.choose() for _ in range(2)], ["replica_1", "replica_1"])
+
+    def test_stale_replica_is_probed(self):
+        """Test that a replica is probed before use once its check is stale."""
+        replicas = ReplicaSet(["replica_0"], check_interval=60)
+        with patch.object(ReplicaSet, "check", return_value=False) as check:
+            self.assertIsNone(replicas.choose())
+        check.assert_called_once_with("replica_0")
+
+    def test_check_ejects_lagging_replica(self):
+        """Test that a replica lagging more than max_lag is ejected."""
+        replicas = ReplicaSet(["default"], max_lag=1)
+        with patch.object(ReplicaSet, "get_lag_query", return_value="SELECT 5"):
+            self.assertFalse(replicas.check("default"))
+        self.assertTrue(replicas.states["default"].is_ejected(time.monotonic()))
+        self.assertEqual(replicas.states["default"].lag, 5)
+        self.assertTrue(replicas.check("default"))
+        self.assertFalse(replicas.states["default"].is_ejected(time.monotonic()))
+
+    def test_unknown_balance_mode(self):
+        """Test that an unknown balance mode is rejected."""
+        with self.assertRaises(ValueError):
+            ReplicaSet(["replica_0"], balance="random")
+
+
+@override_settings(DATABASE_REPLICAS=["default"])
+class TestReplicaHealthCheck(DjangoTestCase):
+    """Test the ReplicaHealthCheck class."""
+
+    def test_reports_lag(self):
+        """Test that a healthy replica reports its lag."""
+        result = ReplicaHealthCheck("default").run()
+        self.assertTrue(result.healthy)
+        self.assertFalse(result.critical)
+        self.assertEqual(
+            result.details, {"replica": {"ejected": False, "lag_seconds": 0, "error": None}}
+        )
+
+    def test_failure_ejects(self):
+        """Test that a failing replica is reported and ejected."""
+        with patch.object(ReplicaSet, "get_lag_query", side_effect=OperationalError("down")):
+            result = ReplicaHealthCheck("default").run()
+        self.assertFalse(result.healthy)
+        self.assertEqual(result.error, "down")
+        self.assertTrue(get_replicas().states["default"].is_ejected(time.monotonic()))
@@ -0,0 +1,89 @@
+import time
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.http import HttpRequest, HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+
+from app.contrib.constants import DatabaseConstant
+from app.contrib.db.middleware import ReplicaRoutingMiddleware
+from app.contrib.db.replicas import ReplicaSet
+from app.contrib.db.router import ReplicaRouter, end_routing, get_routing_state, start_routing
+
+
+@override_settings(DATABASE_REPLICAS=["replica_0"])
+class TestReplicaRouter(TestCase):
+    """Test the ReplicaRouter class."""
+
+    def setUp(self):
+        """Create the router with a replica always available."""
+        self.router = ReplicaRouter()
+        choose = patch.object(ReplicaSet, "choose", return_value="replica_0")
+        choose.start()
+        self.addCleanup(choose.stop)
+
+    def test_reads_use_primary_outside_requests(self):
+        """Test that reads outside a routing context use the primary."""
+        self.assertEqual(self.router.db_for_read(User), "default")
+
+    def test_reads_use_replica(self):
+        """Test that reads in a routing context use a replica."""
+        _state, token = start_routing()
+        try:
+            with patch("app.contrib.db.router.connections") as connections:
+                connections.__getitem__.return_value.in_atomic_block = False
+                self.assertEqual(self.router.db_for_read(User), "replica_0")
+        finally:
+            end_routing(token)
+
+    def test_write_pins_to_primary(self):
+        """Test that reads after a write use the primary."""
+        state, token = start_routing()
+        try:
+            self.assertEqual(self.router.db_for_write(User), "default")
+            self.assertTrue(state.wrote)
+            self.assertEqual(self.router.db_for_read(User), "default")
+        finally:
+            end_routing(token)
+        self.assertIsNone(get_routing_state())
+
+    def test_replicas_are_not_migrated(self):
+        """Test that migrations never run on replicas."""
+        self.assertFalse(self.router.allow_migrate("replica_0", "auth"))
+        self.assertIsNone(self.router.allow_migrate("default", "auth"))
+
+
+@override_settings(DATABASE_REPLICAS=["replica_0"], DATABASE_STICKY_SECONDS=5)
+class TestReplicaRoutingMiddleware(TestCase):
+    """Test the ReplicaRoutingMiddleware class."""
+
+    def setUp(self):
+        """Set up the request factory."""
+        self.factory = RequestFactory()
+
+    def test_write_sets_sticky_cookie(self):
+        """Test that a request routing a write pins the client to the primary."""
+
+        def view(_request: HttpRequest) -> HttpResponse:
+            ReplicaRouter().db_for_write(User)
+            return HttpResponse()
+
+        response = ReplicaRoutingMiddleware(view)(self.factory.post("/"))
+        cookie = response.cookies[DatabaseConstant.STICKY_COOKIE]
+        self.assertEqual(cookie["max-age"], 5)
+        self.assertGreater(float(cookie.value), time.time())
+
+    def test_read_sets_no_cookie(self):
+        """Test that a read-only request sets no cookie."""
+        response = ReplicaRoutingMiddleware(lambda _request: HttpResponse())(self.factory.get("/"))
+        self.assertNotIn(DatabaseConstant.STICKY_COOKIE, response.cookies)
+
+    def test_is_pinned(self):
+        """Test that unsafe methods and a fresh cookie read from the primary."""
+        self.assertTrue(ReplicaRoutingMiddleware.is_pinned(self.factory.post("/")))
+        self.assertFalse(ReplicaRoutingMiddleware.is_pinned(self.factory.get("/")))
+        request = self.factory.get("/")
+        request.COOKIES[DatabaseConstant.STICKY_COOKIE] = str(time.time() + 5)
+        self.assertTrue(ReplicaRoutingMiddleware.is_pinned(request))
+        request.COOKIES[DatabaseConstant.STICKY_COOKIE] = "invalid"
+        self.assertFalse(ReplicaRoutingMiddleware.is_pinned(request))
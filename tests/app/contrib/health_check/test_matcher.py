@@ -0,0 +1,77 @@
+from unittest import TestCase
+
+from app.contrib.health_check.matcher import (
+    IPAddressSet,
+    MaintenanceAllowList,
+    PathPrefixTrie,
+)
+
+
+class TestPathPrefixTrie(TestCase):
+    """Test suite for the PathPrefixTrie."""
+
+    def test_match_prefix(self):
+        """Test that paths starting with a registered prefix match."""
+        trie = PathPrefixTrie(["/admin/", "/api/special/"])
+        self.assertTrue(trie.match("/admin/"))
+        self.assertTrue(trie.match("/admin/users/1"))
+        self.assertTrue(trie.match("/api/special/data"))
+
+    def test_no_match(self):
+        """Test that other paths do not match."""
+        trie = PathPrefixTrie(["/admin/", "/api/special/"])
+        self.assertFalse(trie.match("/adm"))
+        self.assertFalse(trie.match("/api/"))
+        self.assertFalse(trie.match("/other/"))
+
+    def test_empty_trie(self):
+        """Test that an empty trie matches nothing."""
+        self.assertFalse(PathPrefixTrie().match("/admin/"))
+
+    def test_empty_prefix_matches_everything(self):
+        """Test that an empty prefix behaves like str.startswith("")."""
+        self.assertTrue(PathPrefixTrie([""]).match("/anything"))
+
+
+class TestIPAddressSet(TestCase):
+    """Test suite for the IPAddressSet."""
+
+    def test_exact_address(self):
+        """Test single address membership."""
+        ips = IPAddressSet(["192.168.1.1", "::1"])
+        self.assertIn("192.168.1.1", ips)
+        self.assertIn("0:0:0:0:0:0:0:1", ips)
+        self.assertNotIn("192.168.1.2", ips)
+
+    def test_cidr_range(self):
+        """Test CIDR range membership."""
+        ips = IPAddressSet(["10.0.0.0/8", "192.168.1.0/24", "2001:db8::/32"])
+        self.assertIn("10.1.2.3", ips)
+        self.assertIn("192.168.1.254", ips)
+        self.assertIn("2001:db8::42", ips)
+        self.assertNotIn("192.168.2.1", ips)
+        self.assertNotIn("11.0.0.1", ips)
+
+    def test_ipv4_mapped_address(self):
+        """Test that IPv4-mapped IPv6 addresses match IPv4 entries."""
+        ips = IPAddressSet(["10.0.0.0/8"])
+        self.assertIn("::ffff:10.0.0.1", ips)
+
+    def test_invalid_values(self):
+        """Test that invalid entries and addresses are ignored."""
+        ips = IPAddressSet(["not-an-ip", "10.0.0.1"])
+        self.assertIn("10.0.0.1", ips)
+        self.assertNotIn("not-an-ip", ips)
+        self.assertNotIn(None, ips)
+        self.assertNotIn("", ips)
+
+
+class TestMaintenanceAllowList(TestCase):
+    """Test suite for the MaintenanceAllowList."""
+
+    def test_allows(self):
+        """Test that either a URL or an IP match allows the request."""
+        allow_list = MaintenanceAllowList(["/admin/"], ["10.0.0.0/24"])
+        self.assertTrue(allow_list.allows("/admin/login/", "1.1.1.1"))
+        self.assertTrue(allow_list.allows("/api/", "10.0.0.7"))
+        self.assertFalse(allow_list.allows("/api/", "1.1.1.1"))
@@ -1,10 +1,11 @@
 import json
-from unittest import TestCase
-from unittest.mock import Mock, patch
+from unittest import IsolatedAsyncioTestCase, TestCase
+from unittest.mock import AsyncMock, Mock, patch
 
 from django.core.cache import cache
 from django.http import HttpRequest, HttpResponse, JsonResponse
 
+from asgiref.sync import iscoroutinefunction
 from constance import config as constance_config
 from rest_framework import status
 
@@ -14,6 +15,7 @@ from app.contrib.health_check.middleware import (
     HealthCheckMiddleware,
     MaintenanceMiddleware,
 )
+from app.contrib.health_check.registry import registry
 
 
 class TestHealthCheckMiddleware(TestCase):
@@ -23,10 +25,12 @@ class TestHealthCheckMiddleware(TestCase):
         """Set up the test environment before each test method."""
         self.get_response = Mock(return_value=HttpResponse())
         self.middleware = HealthCheckMiddleware(self.get_response)
+        registry.clear()
 
     def tearDown(self):
         """Clear the cache after each test."""
         cache.clear()
+        registry.clear()
 
     def test_health_check_path(self):
         """Test that the middleware returns a 200 status code for the health check."""
@@ -35,6 +39,39 @@ class TestHealthCheckMiddleware(TestCase):
         response = self.middleware(request)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.get_response.assert_not_called()
+        content = json.loads(response.content)
+        self.assertEqual(content["status"], "ok")
+        self.assertEqual(content["checks"]["database:default"]["status"], "ok")
+        self.assertIn("latency_ms", content["checks"]["cache:default"])
+
+    def test_readiness_path(self):
+        """Test that the readiness endpoint runs the dependency checks."""
+        request = HttpRequest()
+        request.path = "/api/health_check/ready/"
+        response = self.middleware(request)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn("checks", json.loads(response.content))
+
+    @patch("app.contrib.health_check.middleware.registry")
+    def test_liveness_path(self, mock_registry: Mock):
+        """Test that the liveness endpoint does not run dependency checks."""
+        request = HttpRequest()
+        request.path = "/api/health_check/live/"
+        response = self.middleware(request)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(json.loads(response.content), {"status": "ok"})
+        mock_registry.run.assert_not_called()
+        self.get_response.assert_not_called()
+
+    @patch("app.contrib.health_check.checks.connections")
+    def test_health_check_result_is_cached(self, mock_connections: Mock):
+        """Test that a burst of probes runs the checks once."""
+        mock_connections.__getitem__.return_value.pool = None
+        request = HttpRequest()
+        request.path = "/api/health_check/"
+        self.middleware(request)
+        self.middleware(request)
+        self.assertEqual(mock_connections.__getitem__.call_count, 1)
 
     def test_non_health_check_path(self):
         """Test that the middleware calls get_response for non-health check paths."""
@@ -55,27 +92,29 @@ class TestHealthCheckMiddleware(TestCase):
 
         self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
 
-    @patch("app.contrib.health_check.middleware.connection")
-    def test_health_check_database_failure(self, mock_connection: Mock):
+    @patch("app.contrib.health_check.checks.connections")
+    def test_health_check_database_failure(self, mock_connections: Mock):
         """Test that the health check returns a 503 status code on database failure."""
         request = HttpRequest()
         request.path = "/api/health_check/"
 
-        mock_connection.ensure_connection.side_effect = Exception("Database error")
+        mock_connections.__getitem__.return_value.cursor.side_effect = Exception("Database error")
 
         response = self.middleware(request)
         self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
         content = json.loads(response.content)
         self.assertEqual(content["code"], ServiceUnavailable.default_code)
         self.assertIn("database", content["message"])
+        self.assertEqual(content["checks"]["database:default"]["status"], "error")
+        self.assertEqual(content["checks"]["cache:default"]["status"], "ok")
 
-    @patch("app.contrib.health_check.middleware.cache")
-    def test_health_check_cache_failure(self, mock_cache: Mock):
+    @patch("app.contrib.health_check.checks.caches")
+    def test_health_check_cache_failure(self, mock_caches: Mock):
         """Test that the health check returns a 503 status code on cache failure."""
         request = HttpRequest()
         request.path = "/api/health_check/"
 
-        mock_cache.get.return_value = None  # Simulate cache miss/failure
+        mock_caches.__getitem__.return_value.get.return_value = None  # Simulate cache miss
 
         response = self.middleware(request)
         self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
@@ -155,6 +194,33 @@ class TestMaintenanceMiddleware(TestCase):
         content = json.loads(response.content)
         self.assertEqual(content["code"], ServiceUnavailable.default_code)
 
+    def test_maintenance_enabled_allowed_ip_range(self):
+        """Test middleware behavior for allowed CIDR ranges in maintenance mode."""
+        constance_config.MAINTENANCE_ENABLE = True
+        constance_config.MAINTENANCE_ALLOWED_IPS = ["10.8.0.0/16"]
+        request = HttpRequest()
+        request.path = "/some/path"
+        request.META["REMOTE_ADDR"] = "10.8.3.4"
+        response = self.middleware(request)
+        self.get_response.assert_called_once_with(request)
+        self.assertEqual(response, self.get_response.return_value)
+
+        request.META["REMOTE_ADDR"] = "10.9.0.1"
+        response = self.middleware(request)
+        self.assertEqual(response.status_code, ServiceUnavailable.status_code)
+
+    def test_allow_list_rebuilt_only_on_change(self):
+        """Test that the compiled allow-list is reused until the config changes."""
+        constance_config.MAINTENANCE_ALLOWED_URLS = ["/admin/"]
+        allow_list = self.middleware.get_allow_list()
+        self.assertIs(self.middleware.get_allow_list(), allow_list)
+
+        constance_config.MAINTENANCE_MESSAGE = "Unrelated change."
+        self.assertIs(self.middleware.get_allow_list(), allow_list)
+
+        constance_config.MAINTENANCE_ALLOWED_URLS = ["/admin/", "/status/"]
+        self.assertIsNot(self.middleware.get_allow_list(), allow_list)
+
     def test_maintenance_enabled_disallowed_path(self):
         """Test middleware behavior for disallowed paths in maintenance mode."""
         constance_config.MAINTENANCE_ENABLE = True
@@ -189,3 +255,89 @@ class TestMaintenanceMiddleware(TestCase):
         content = json.loads(response.content)
         self.assertEqual(content["code"], ServiceUnavailable.default_code)
         self.assertEqual(content["message"], "Custom maintenance message.")
+
+
+class TestHealthCheckMiddlewareAsync(IsolatedAsyncioTestCase):
+    """Test suite for the HealthCheckMiddleware in async mode."""
+
+    def setUp(self):
+        """Set up the test environment before each test method."""
+        self.get_response = AsyncMock(return_value=HttpResponse())
+        self.middleware = HealthCheckMiddleware(self.get_response)
+        registry.clear()
+
+    def tearDown(self):
+        """Clear the cache after each test."""
+        cache.clear()
+        registry.clear()
+
+    def test_async_mode(self):
+        """Test that the middleware runs natively in async mode."""
+        self.assertTrue(self.middleware.async_mode)
+        self.assertTrue(iscoroutinefunction(self.middleware))
+
+    async def test_health_check_path(self):
+        """Test that the readiness report is served asynchronously."""
+        request = HttpRequest()
+        request.path = "/api/health_check/"
+        response = await self.middleware(request)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        content = json.loads(response.content)
+        self.assertEqual(content["checks"]["cache:default"]["status"], "ok")
+        self.get_response.assert_not_called()
+
+    async def test_liveness_path(self):
+        """Test that the liveness probe is served asynchronously."""
+        request = HttpRequest()
+        request.path = "/api/health_check/live/"
+        response = await self.middleware(request)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    async def test_non_health_check_path(self):
+        """Test that other paths are passed to the next middleware."""
+        request = HttpRequest()
+        request.path = "/some-other-path"
+        response = await self.middleware(request)
+        self.get_response.assert_awaited_once_with(request)
+        self.assertEqual(response, self.get_response.return_value)
+
+
+class TestMaintenanceMiddlewareAsync(IsolatedAsyncioTestCase):
+    """Test suite for the MaintenanceMiddleware in async mode."""
+
+    def setUp(self):
+        """Set up the test environment before each test method."""
+        self.get_response = AsyncMock(return_value=HttpResponse())
+        self.middleware = MaintenanceMiddleware(self.get_response)
+
+    def tearDown(self):
+        """Reset the config to the default values."""
+        config.reset()
+        cache.clear()
+
+    async def test_maintenance_disabled(self):
+        """Test middleware behavior when maintenance mode is disabled."""
+        request = HttpRequest()
+        request.path = "/some-path"
+        response = await self.middleware(request)
+        self.get_response.assert_awaited_once_with(request)
+        self.assertEqual(response, self.get_response.return_value)
+
+    async def test_maintenance_enable(self):
+        """Test middleware behavior when maintenance mode is enabled."""
+        constance_config.MAINTENANCE_ENABLE = True
+        request = HttpRequest()
+        request.path = "/some-path"
+        response = await self.middleware(request)
+        self.assertEqual(response.status_code, ServiceUnavailable.status_code)
+        self.get_response.assert_not_called()
+
+    async def test_maintenance_enabled_staff_bypass(self):
+        """Test that staff users resolved through auser() can bypass maintenance mode."""
+        constance_config.MAINTENANCE_ENABLE = True
+        request = HttpRequest()
+        request.path = "/some-path/"
+        request.auser = AsyncMock(return_value=Mock(is_staff=True))
+        response = await self.middleware(request)
+        self.get_response.assert_awaited_once_with(request)
+        self.assertEqual(response, self.get_response.return_value)
@@ -0,0 +1,178 @@
+import threading
+from unittest import IsolatedAsyncioTestCase, TestCase
+from unittest.mock import Mock, patch
+
+from django.db import connections
+from django.test import override_settings
+
+from asgiref.sync import async_to_sync
+
+from app.contrib.health_check.checks import BaseHealthCheck, CheckResult, DatabaseHealthCheck
+from app.contrib.health_check.registry import HealthCheckRegistry, HealthReport
+
+
+class PassingCheck(BaseHealthCheck):
+    """Check that always passes."""
+
+    name = "passing"
+
+    def check(self) -> None:
+        """Do nothing."""
+
+
+class FailingCheck(BaseHealthCheck):
+    """Check that always fails."""
+
+    name = "failing"
+
+    def check(self) -> None:
+        """Raise an error."""
+        raise ValueError("boom")
+
+
+class BlockingCheck(BaseHealthCheck):
+    """Check that blocks until released."""
+
+    name = "blocking"
+    timeout = 0.05
+
+    def __init__(self) -> None:
+        """Initialize the release event."""
+        self.release = threading.Event()
+
+    def check(self) -> None:
+        """Wait for the release event."""
+        self.release.wait(1)
+
+
+class UserChecksRegistry(HealthCheckRegistry):
+    """Registry running only the user-defined checks."""
+
+    def get_checks(self) -> list:
+        """Return the registered checks."""
+        return self._extra_checks
+
+
+class TestHealthCheckRegistry(TestCase):
+    """Test suite for the HealthCheckRegistry."""
+
+    def setUp(self):
+        """Set up a registry with only user-defined checks."""
+        self.registry = UserChecksRegistry()
+
+    @override_settings(HEALTH_CHECK_EXTRA_CHECKS=[f"{__name__}.PassingCheck"])
+    def test_default_checks(self):
+        """Test that database, cache and user-defined checks are registered."""
+        registry = HealthCheckRegistry()
+        registry.register(FailingCheck())
+        names = [check.name for check in registry.get_checks()]
+        self.assertEqual(names, ["database:default", "cache:default", "passing", "failing"])
+
+    def test_report(self):
+        """Test that the report aggregates the results."""
+        self.registry.register(PassingCheck())
+        self.registry.register(FailingCheck())
+
+        report = self.registry.run()
+
+        self.assertFalse(report.healthy)
+        self.assertEqual(report.error_message, "failing unavailable: boom")
+        data = report.as_dict()
+        self.assertEqual(data["status"], "error")
+        self.assertEqual(data["checks"]["passing"]["status"], "ok")
+        self.assertEqual(data["checks"]["failing"]["error"], "boom")
+
+    def test_timeout(self):
+        """Test that a slow check is failed after its timeout."""
+        check = self.registry.register(BlockingCheck())
+
+        report = self.registry.run()
+        check.release.set()
+
+        self.assertEqual(report.results[0].error, "timed out")
+
+    @override_settings(HEALTH_CHECK_CACHE_TTL=60)
+    def test_report_is_cached(self):
+        """Test that the report is reused within the TTL."""
+        self.registry.register(PassingCheck())
+        self.assertIs(self.registry.run(), self.registry.run())
+
+    @override_settings(HEALTH_CHECK_CACHE_TTL=0)
+    def test_report_expires(self):
+        """Test that the checks run again once the TTL expired."""
+        self.registry.register(PassingCheck())
+        self.assertIsNot(self.registry.run(), self.registry.run())
+
+
+class TestHealthReport(TestCase):
+    """Test suite for the HealthReport."""
+
+    def test_healthy(self):
+        """Test that a report with only passing checks is healthy."""
+        report = HealthReport((CheckResult("db", True, 1.0),))
+        self.assertTrue(report.healthy)
+        self.assertEqual(report.error_message, "")
+
+    def test_non_critical_failure(self):
+        """Test that a failing non-critical check leaves the report healthy."""
+        report = HealthReport(
+            (
+                CheckResult("db", True, 1.0),
+                CheckResult("replica", False, 1.0, "down", critical=False),
+            )
+        )
+        self.assertTrue(report.healthy)
+        self.assertEqual(report.error_message, "replica unavailable: down")
+
+
+class TestHealthCheckRegistryAsync(IsolatedAsyncioTestCase):
+    """Test suite for the async API of the HealthCheckRegistry."""
+
+    async def test_arun(self):
+        """Test that checks run concurrently and slow ones time out."""
+        registry = UserChecksRegistry()
+        registry.register(PassingCheck())
+        check = registry.register(BlockingCheck())
+
+        report = await registry.arun()
+        check.release.set()
+
+        self.assertEqual([result.healthy for result in report.results], [True, False])
+        self.assertEqual(report.results[1].error, "timed out")
+
+
+class TestDatabaseHealthCheck(TestCase):
+    """Test suite for the DatabaseHealthCheck."""
+
+    def test_no_pool(self):
+        """Test that unpooled connections report no details."""
+        result = DatabaseHealthCheck().run()
+        self.assertTrue(result.healthy)
+        self.assertNotIn("pool", result.as_dict())
+
+    def test_pool_thread_connections_closed(self):
+        """Test that the check threads close the connections they opened."""
+        closed_in = []
+        registry = UserChecksRegistry()
+        registry.register(DatabaseHealthCheck())
+
+        with patch.object(
+            connections,
+            "close_all",
+            side_effect=lambda: closed_in.append(threading.current_thread().name),
+        ):
+            self.assertTrue(registry.run().healthy)
+            self.assertTrue(async_to_sync(DatabaseHealthCheck().arun)().healthy)
+
+        self.assertEqual(len(closed_in), 2)
+        self.assertTrue(closed_in[0].startswith("health-check"))
+        self.assertNotEqual(closed_in[1], threading.current_thread().name)
+
+    def test_pool_details(self):
+        """Test that the pool usage is reported."""
+        pool = Mock(max_size=10)
+        pool.get_stats.return_value = {"pool_size": 4, "pool_available": 1, "requests_waiting": 2}
+        self.assertEqual(
+            DatabaseHealthCheck.get_pool_details(Mock(pool=pool)),
+            {"pool": {"size": 4, "max_size": 10, "in_use": 3, "waiting": 2, "saturation": 0.3}},
+        )
@@ -0,0 +1,143 @@
+import json
+import unittest
+from unittest.mock import Mock, patch
+
+from django.contrib.auth.models import User
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import HttpRequest, HttpResponse
+from django.test import RequestFactory, TransactionTestCase, override_settings
+
+from app.contrib.instrumentation.cache import LocMemCache
+from app.contrib.instrumentation.middleware import MiddlewareSpan, ServerTimingMiddleware
+from app.contrib.instrumentation.timeline import Timeline, end_timeline, start_timeline
+from app.contrib.middleware import BaseMiddleware
+from app.settings import get_timed_middleware
+
+SPAN = "app.contrib.instrumentation.middleware.MiddlewareSpan"
+TIMING = "app.contrib.instrumentation.middleware.ServerTimingMiddleware"
+INNER = "tests.app.contrib.instrumentation.test_middleware.InnerMiddleware"
+
+
+class InnerMiddleware(BaseMiddleware):
+    """Middleware doing nothing, to be timed."""
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        """Pass the request on."""
+        return self.get_response(request)
+
+
+class TestTimeline(unittest.TestCase):
+    """Test the Timeline class."""
+
+    def test_middleware_spans(self):
+        """Test that each span excludes the time of the inner ones."""
+        timeline = Timeline()
+        timeline.spans = [100, 60, 15]
+        self.assertEqual(
+            timeline.get_middleware_spans(["a", "b", "view"]), [("a", 40), ("b", 45), ("view", 15)]
+        )
+
+    def test_short_circuited_spans(self):
+        """Test that middlewares after one answering early have no span."""
+        timeline = Timeline()
+        timeline.spans = [100, 30]
+        self.assertEqual(timeline.get_middleware_spans(["a", "b", "view"]), [("a", 70), ("b", 30)])
+
+    def test_nested_calls_counted_once(self):
+        """Test that calls made by a call of the same kind are not counted again."""
+        timeline = Timeline()
+        timeline.call("cache", lambda: timeline.call("cache", lambda: None))
+        self.assertEqual(timeline.counts, {"cache": 1})
+
+
+class TestGetTimedMiddleware(unittest.TestCase):
+    """Test the get_timed_middleware function."""
+
+    def test_disabled(self):
+        """Test that the middleware list is unchanged when disabled."""
+        self.assertEqual(get_timed_middleware(["a", "b"]), ["a", "b"])
+
+    def test_enabled(self):
+        """Test that a span is put in front of each middleware and of the view."""
+        self.assertEqual(
+            get_timed_middleware(["a", "b"], enabled=True), [TIMING, SPAN, "a", SPAN, "b", SPAN]
+        )
+
+
+@override_settings(
+    SERVER_TIMING_ENABLED=True,
+    SERVER_TIMING_HEADER=True,
+    MIDDLEWARE=get_timed_middleware([INNER], enabled=True),
+)
+class TestServerTimingMiddleware(TransactionTestCase):
+    """Test the ServerTimingMiddleware class."""
+
+    def setUp(self):
+        """Set up the test environment."""
+        self.factory = RequestFactory()
+        self.cache = LocMemCache("timing-test", {})
+
+    def build(self, view: Mock) -> ServerTimingMiddleware:
+        """Build the stack of the MIDDLEWARE setting around the view."""
+        return ServerTimingMiddleware(MiddlewareSpan(InnerMiddleware(MiddlewareSpan(view))))
+
+    def view(self, _request: HttpRequest) -> HttpResponse:
+        """Run two queries and two cache calls."""
+        User.objects.count()
+        User.objects.exists()
+        self.cache.set("key", 1)
+        self.cache.get_or_set("key", 2)
+        return HttpResponse()
+
+    @patch("app.contrib.instrumentation.middleware.logger")
+    def test_timings(self, mock_logger: Mock):
+        """Test the header, log record and request timeline."""
+        request = self.factory.get("/test/")
+        request.id = "123"
+        response = self.build(self.view)(request)
+
+        names = [metric.split(";")[0] for metric in response["Server-Timing"].split(", ")]
+        self.assertEqual(names, ["InnerMiddleware", "view", "db", "cache", "total"])
+        self.assertEqual(request.timeline.counts, {"db": 2, "cache": 2})
+
+        record = json.loads(str(mock_logger.info.call_args[0][1]))
+        self.assertEqual(record["request_id"], "123")
+        self.assertEqual(record["counts"], {"db": 2, "cache": 2})
+        self.assertEqual(set(record["timings_ms"]), set(names))
+
+    @override_settings(SERVER_TIMING_HEADER=False, SERVER_TIMING_SLOW_MS=60000)
+    @patch("app.contrib.instrumentation.middleware.logger")
+    def test_fast_request_not_reported(self, mock_logger: Mock):
+        """Test that nothing is sent or logged below the slow threshold."""
+        response = self.build(self.view)(self.factory.get("/test/"))
+        self.assertNotIn("Server-Timing", response)
+        mock_logger.info.assert_not_called()
+
+    def test_nothing_recorded_outside_requests(self):
+        """Test that calls outside a timed request are not recorded."""
+        _timeline, token = start_timeline()
+        end_timeline(token)
+        with patch.object(Timeline, "call") as mock_call:
+            self.cache.get("key")
+            User.objects.count()
+        mock_call.assert_not_called()
+
+    @patch("app.contrib.instrumentation.middleware.logger")
+    async def test_async(self, _mock_logger: Mock):
+        """Test timing an async stack."""
+
+        async def view(_request: HttpRequest) -> HttpResponse:
+            self.cache.get("key")
+            return HttpResponse()
+
+        response = await self.build(view)(self.factory.get("/test/"))
+        self.assertIn("InnerMiddleware;dur=", response["Server-Timing"])
+        self.assertIn("cache;dur=", response["Server-Timing"])
+
+    @override_settings(SERVER_TIMING_ENABLED=False)
+    def test_not_loaded_when_disabled(self):
+        """Test that the middlewares remove themselves when timing is disabled."""
+        with self.assertRaises(MiddlewareNotUsed):
+            ServerTimingMiddleware(Mock())
+        with self.assertRaises(MiddlewareNotUsed):
+            MiddlewareSpan(Mock())
@@ -0,0 +1,211 @@
+import tempfile
+from pathlib import Path
+from unittest.mock import Mock
+
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connection
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TransactionTestCase, override_settings
+from django.urls import ResolverMatch
+
+from rest_framework import exceptions, status
+
+from app.contrib.exception import APIExceptionHandler
+from app.contrib.instrumentation.cache import LocMemCache
+from app.contrib.metrics.middleware import MetricsMiddleware
+from app.contrib.metrics.registry import (
+    Counter,
+    Histogram,
+    get_store,
+    group_samples,
+    metrics,
+    render_metrics,
+    throttle_rejections,
+)
+from app.contrib.metrics.store import MmapValues, encode_key
+from app.contrib.throttling import LocalGCRAStore, UserRateThrottle
+
+TOKEN = "metrics-token"  # noqa: S105
+
+
+class MetricsTestMixin:
+    """Enable metrics in a temporary directory."""
+
+    def setUp(self):
+        """Enable metrics."""
+        super().setUp()
+        self.directory = tempfile.TemporaryDirectory()
+        self.settings_override = override_settings(
+            METRICS_ENABLED=True,
+            METRICS_DIR=self.directory.name,
+            METRICS_ALLOWED_IPS=["10.0.0.0/8"],
+            METRICS_TOKEN=TOKEN,
+        )
+        self.settings_override.enable()
+
+    def tearDown(self):
+        """Disable metrics."""
+        self.settings_override.disable()
+        self.directory.cleanup()
+        super().tearDown()
+
+    def collect(self):
+        """Return the collected values by store key."""
+        return get_store().collect()
+
+
+class TestRegistry(MetricsTestMixin, SimpleTestCase):
+    """Test the metric types and the exposition format."""
+
+    def setUp(self):
+        """Declare metrics outside the exported list."""
+        super().setUp()
+        self.counter = Counter("test_total", "Test counter.", ("label",))
+        self.histogram = Histogram("test_seconds", "Test histogram.", ("label",), buckets=(0.1, 1))
+        del metrics[-2:]
+
+    def test_disabled(self):
+        """Test that nothing is collected when metrics are disabled."""
+        with override_settings(METRICS_ENABLED=False):
+            self.assertIsNone(get_store())
+            self.counter.inc(("a",))
+        self.assertEqual(self.collect(), {})
+
+    def test_counter(self):
+        """Test that a counter renders one sample per label value."""
+        self.counter.inc(("a",))
+        self.counter.inc(("a",), 2)
+        self.counter.inc(('b"\n',))
+        lines = self.counter.render(group_samples(self.collect()))
+        self.assertEqual(
+            lines,
+            [
+                "# HELP test_total Test counter.",
+                "# TYPE test_total counter",
+                'test_total{label="a"} 3',
+                'test_total{label="b\\"\\n"} 1',
+            ],
+        )
+
+    def test_histogram(self):
+        """Test that histogram buckets are rendered cumulatively."""
+        for value in (0.05, 0.1, 0.5, 3):
+            self.histogram.observe(("a",), value)
+        lines = self.histogram.render(group_samples(self.collect()))
+        self.assertEqual(
+            lines[2:],
+            [
+                'test_seconds_bucket{label="a",le="0.1"} 2',
+                'test_seconds_bucket{label="a",le="1"} 3',
+                'test_seconds_bucket{label="a",le="+Inf"} 4',
+                'test_seconds_sum{label="a"} 3.65',
+                'test_seconds_count{label="a"} 4',
+            ],
+        )
+
+    def test_render_metrics(self):
+        """Test that every declared metric is exported."""
+        text = render_metrics({})
+        self.assertIn("# TYPE http_requests_total counter\n", text)
+        self.assertIn("# TYPE http_request_duration_seconds histogram\n", text)
+
+    def test_aggregates_workers(self):
+        """Test that the values of other worker processes are added."""
+        self.counter.inc(("a",))
+        other = MmapValues(Path(self.directory.name) / "99999-1.db")
+        other.inc(encode_key("test_total", ("a",)), 5)
+        other.close()
+        self.assertIn('test_total{label="a"} 6', self.counter.render(group_samples(self.collect())))
+
+
+class TestMetricsMiddleware(MetricsTestMixin, TransactionTestCase):
+    """Test the MetricsMiddleware class."""
+
+    def setUp(self):
+        """Set up the middleware."""
+        super().setUp()
+        self.factory = RequestFactory()
+        self.middleware = MetricsMiddleware(Mock(return_value=HttpResponse(status=201)))
+
+    def test_not_used_when_disabled(self):
+        """Test that the middleware is not loaded when metrics are disabled."""
+        with override_settings(METRICS_ENABLED=False), self.assertRaises(MiddlewareNotUsed):
+            MetricsMiddleware(Mock())
+
+    def test_records_request(self):
+        """Test that requests are counted by method, route and status."""
+        request = self.factory.post("/api/items/1/")
+        request.resolver_match = ResolverMatch(Mock(), (), {}, route="api/items/<int:pk>/")
+        self.middleware(request)
+        self.middleware(self.factory.get("/missing/"))
+        values = self.collect()
+        key = encode_key("http_requests_total", ("POST", "api/items/<int:pk>/", "201"))
+        self.assertEqual(values[key], 1)
+        self.assertEqual(
+            values[encode_key("http_requests_total", ("GET", "<unmatched>", "201"))], 1
+        )
+        self.assertEqual(
+            values[
+                encode_key("http_request_duration_seconds_count", ("POST", "api/items/<int:pk>/"))
+            ],
+            1,
+        )
+
+    def test_endpoint_allowed_ip(self):
+        """Test that the endpoint is served to allowed addresses."""
+        self.middleware(self.factory.get("/other/"))
+        response = self.middleware(self.factory.get("/api/metrics/", REMOTE_ADDR="10.1.2.3"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response["Content-Type"].startswith("text/plain; version=0.0.4"))
+        self.assertIn(
+            'http_requests_total{method="GET",route="<unmatched>",status="201"} 1',
+            response.content.decode(),
+        )
+
+    def test_endpoint_token(self):
+        """Test that the endpoint is served with the bearer token."""
+        request = self.factory.get("/api/metrics/", HTTP_AUTHORIZATION=f"Bearer {TOKEN}")
+        self.assertEqual(self.middleware(request).status_code, status.HTTP_200_OK)
+
+    def test_endpoint_forbidden(self):
+        """Test that other clients get a 403 response."""
+        request = self.factory.get("/api/metrics/", HTTP_AUTHORIZATION="Bearer wrong")
+        self.assertEqual(self.middleware(request).status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_db_queries(self):
+        """Test that queries are counted by connection alias."""
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1")
+        self.assertGreaterEqual(self.collect()[encode_key("db_queries_total", ("default",))], 1)
+
+
+class TestHooks(MetricsTestMixin, SimpleTestCase):
+    """Test the metrics collected by other modules."""
+
+    def test_cache_hits_and_misses(self):
+        """Test that cache lookups are counted as hits or misses."""
+        cache = LocMemCache("metrics-test", {})
+        cache.set("key", None)
+        self.assertIsNone(cache.get("key", "default"))
+        self.assertEqual(cache.get("missing", "default"), "default")
+        values = self.collect()
+        self.assertEqual(values[encode_key("cache_requests_total", ("hit",))], 1)
+        self.assertEqual(values[encode_key("cache_requests_total", ("miss",))], 1)
+
+    def test_throttle_rejections(self):
+        """Test that throttle rejections are counted by scope."""
+
+        class Throttle(UserRateThrottle):
+            store = LocalGCRAStore()
+            rate = "1/min"
+
+        request = Mock(user=Mock(is_authenticated=True, pk=1))
+        Throttle().allow_request(request, None)
+        Throttle().allow_request(request, None)
+        self.assertEqual(self.collect()[encode_key(throttle_rejections.name, ("user",))], 1)
+
+    def test_api_exceptions(self):
+        """Test that API errors are counted by error code and status."""
+        APIExceptionHandler().handle_exception(exceptions.NotFound(), {})
+        values = self.collect()
+        self.assertEqual(values[encode_key("api_exceptions_total", ("not_found", "404"))], 1)
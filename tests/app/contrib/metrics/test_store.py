@@ -0,0 +1,115 @@
+import os
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+from app.contrib.metrics.store import MetricsStore, MmapValues, decode_key, encode_key
+
+
+class TestMmapValues(unittest.TestCase):
+    """Test the MmapValues class."""
+
+    def setUp(self):
+        """Create a temporary directory."""
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = Path(self.directory.name) / "values.db"
+
+    def tearDown(self):
+        """Remove the temporary directory."""
+        self.directory.cleanup()
+
+    def test_inc_and_read(self):
+        """Test that values are readable from the file while it is open."""
+        values = MmapValues(self.path)
+        values.inc("a")
+        values.inc("a", 2.5)
+        values.inc("b")
+        self.assertEqual(dict(MmapValues.read(self.path)), {"a": 3.5, "b": 1.0})
+        values.close()
+
+    def test_grow(self):
+        """Test that the file grows when it is full."""
+        values = MmapValues(self.path, initial_size=64)
+        for index in range(100):
+            values.inc(f"key-{index}", index)
+        self.assertEqual(len(dict(MmapValues.read(self.path))), 100)
+        self.assertEqual(dict(MmapValues.read(self.path))["key-99"], 99)
+        values.close()
+
+    def test_reopen(self):
+        """Test that a reopened file keeps its values, e.g. for a reused process id."""
+        values = MmapValues(self.path)
+        values.inc("a", 2)
+        values.close()
+        values = MmapValues(self.path)
+        values.inc("a")
+        values.inc("b")
+        self.assertEqual(dict(MmapValues.read(self.path)), {"a": 3.0, "b": 1.0})
+        values.close()
+
+
+class TestMetricsStore(unittest.TestCase):
+    """Test the MetricsStore class."""
+
+    def setUp(self):
+        """Create a store in a temporary directory."""
+        self.directory = tempfile.TemporaryDirectory()
+        self.store = MetricsStore(Path(self.directory.name))
+
+    def tearDown(self):
+        """Remove the temporary directory."""
+        self.directory.cleanup()
+
+    def test_collect_sums_writers(self):
+        """Test that the values of every process are summed."""
+        self.store.inc("a")
+        # A file left by another worker process.
+        other = MmapValues(Path(self.directory.name) / "99999.db")
+        other.inc("a", 4)
+        other.inc("b")
+        other.close()
+        self.assertEqual(self.store.collect(), {"a": 5.0, "b": 1.0})
+
+    def test_threads_share_process_file(self):
+        """Test that the threads of a process write to one file."""
+        threads = [threading.Thread(target=self.store.inc, args=("a", 2)) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.store.inc("a")
+        paths = list(Path(self.directory.name).glob("*.db"))
+        self.assertEqual([path.name for path in paths], [f"{os.getpid()}.db"])
+        self.assertEqual(self.store.collect(), {"a": 9.0})
+
+    def test_mark_process_dead(self):
+        """Test that the files of exited workers are merged into one aggregate file."""
+        self.store.inc("a")
+        for pid in (99998, 99999):
+            other = MmapValues(Path(self.directory.name) / f"{pid}.db")
+            other.inc("a", 4)
+            other.inc(f"b{pid}")
+            other.close()
+            self.store.mark_process_dead(pid)
+        self.store.mark_process_dead(99999)  # already merged
+
+        names = sorted(path.name for path in Path(self.directory.name).glob("*.db"))
+        self.assertEqual(names, sorted([f"{os.getpid()}.db", "aggregate.db"]))
+        self.assertEqual(self.store.collect(), {"a": 9.0, "b99998": 1.0, "b99999": 1.0})
+
+    def test_clear(self):
+        """Test that clearing removes every file."""
+        self.store.inc("a")
+        self.store.clear()
+        self.assertEqual(list(Path(self.directory.name).glob("*.db")), [])
+
+    def test_ignores_truncated_files(self):
+        """Test that a file being created is skipped."""
+        (Path(self.directory.name) / "1-1.db").write_bytes(b"\x00")
+        self.store.inc("a")
+        self.assertEqual(self.store.collect(), {"a": 1.0})
+
+    def test_key_round_trip(self):
+        """Test that keys decode into the metric name and label values."""
+        self.assertEqual(decode_key(encode_key("name", ("GET", 'a,"b'))), ("name", ("GET", 'a,"b')))
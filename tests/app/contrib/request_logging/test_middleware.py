@@ -1,14 +1,16 @@
 import json
 import unittest
-from unittest.mock import Mock, patch
+from typing import AsyncIterator
+from unittest.mock import AsyncMock, Mock, patch
 
 from django.core.cache import cache
-from django.http import HttpResponse
-from django.test import RequestFactory
+from django.http import HttpRequest, HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory, override_settings
 
 from rest_framework.status import HTTP_200_OK
 
 from app.contrib.constants import LoggerConstant
+from app.contrib.renderers import loads
 from app.contrib.request_logging.middleware import RequestLoggingMiddleware
 
 
@@ -37,39 +39,45 @@ class TestRequestLoggingMiddleware(unittest.TestCase):
         """Test logging a request."""
         request = self.factory.get("/test/", {"param": "value"})
         request.id = "123456"
-        self.middleware.log_request(request, "Start of request.")
+        self.middleware.log_request(request, HttpResponse(b"hello"), 1500)
 
-        expected_log = (
-            "[request_id=123456, method=GET, content_type=, path=/test/, "
-            "query=param=value, body=None, user_agent=None, ip=127.0.0.1],"
-            " Start of request."
+        mock_logger.log.assert_called_once()
+        record = json.loads(str(mock_logger.log.call_args[0][2]))
+        self.assertEqual(
+            record,
+            {
+                "request_id": "123456",
+                "method": "GET",
+                "path": "/test/",
+                "query": "param=value",
+                "status": 200,
+                "duration_ns": 1500,
+                "bytes_in": 0,
+                "bytes_out": 5,
+                "content_type": "",
+                "body": None,
+                "user_agent": None,
+                "ip": "127.0.0.1",
+            },
         )
-        mock_logger.info.assert_called_once_with(expected_log)
 
     @patch("app.contrib.request_logging.middleware.logger")
     def test_log_request_with_sensitive_data(self, mock_logger: Mock):
         """Test logging a request with sensitive data."""
         data = {"password": "value"}
-        data_log = {"password": "***"}
         request = self.factory.post(
             "/test/",
             data,
             content_type="application/json",
         )
-        request.id = "123456"
-        self.middleware.log_request(request, "Start of request.")
+        self.middleware(request)
 
-        expected_log = (
-            "[request_id=123456, method=POST, content_type=application/json, "
-            f"path=/test/, query=, body={json.dumps(data_log)}, user_agent=None, "
-            "ip=127.0.0.1], "
-            "Start of request."
-        )
-        mock_logger.info.assert_called_once_with(expected_log)
+        record = json.loads(str(mock_logger.log.call_args[0][2]))
+        self.assertEqual(record["body"], {"password": "***"})
 
     @patch("app.contrib.request_logging.middleware.logger")
     def test_log_request_with_body(self, mock_logger: Mock):
-        """Test logging a request with a body."""
+        """Test that one record is logged per request, after the response."""
         data = {"param": "value"}
         request = self.factory.post(
             "/test/",
@@ -77,26 +85,72 @@ class TestRequestLoggingMiddleware(unittest.TestCase):
             content_type="application/json",
         )
         self.middleware(request)
-        log_message = mock_logger.info.call_args[0][0]
 
-        self.assertIn("method=POST", log_message)
-        self.assertIn("content_type=application/json", log_message)
-        self.assertIn("path=/test/", log_message)
-        self.assertIn("query=", log_message)
-        self.assertIn(f"body={json.dumps(data)}", log_message)
+        mock_logger.log.assert_called_once()
+        record = json.loads(str(mock_logger.log.call_args[0][2]))
+        self.assertEqual(record["request_id"], request.id)
+        self.assertEqual(record["method"], "POST")
+        self.assertEqual(record["content_type"], "application/json")
+        self.assertEqual(record["path"], "/test/")
+        self.assertEqual(record["status"], HTTP_200_OK)
+        self.assertEqual(record["bytes_in"], len(json.dumps(data)))
+        self.assertGreaterEqual(record["duration_ns"], 0)
+        self.assertEqual(record["body"], data)
 
+    @patch("app.contrib.request_logging.middleware.loads", wraps=loads)
     @patch("app.contrib.request_logging.middleware.logger")
-    def test_call_does_not_log_when_not_required(self, mock_logger: Mock):
-        """Test middleware skips logging when body should not be logged."""
-        request = self.factory.post(
-            "/test/",
-            data="data",
-            content_type="text/plain",
-        )
+    def test_body_parsed_once(self, _mock_logger: Mock, mock_loads: Mock):
+        """Test that the body is parsed at most once per request."""
+        request = self.factory.post("/test/", data={"a": 1}, content_type="application/json")
+        self.middleware(request)
+        mock_loads.assert_called_once()
+
+    @patch("app.contrib.request_logging.middleware.LazyJSON")
+    @patch("app.contrib.request_logging.middleware.logger")
+    def test_no_record_built_when_disabled(self, mock_logger: Mock, mock_lazy_json: Mock):
+        """Test that nothing is built when INFO is disabled for the logger."""
+        mock_logger.isEnabledFor.return_value = False
+        request = self.factory.post("/test/", data={"a": 1}, content_type="application/json")
+        self.middleware(request)
+        mock_lazy_json.assert_not_called()
+        mock_logger.log.assert_not_called()
+
+    @override_settings(REQUEST_LOGGING_SAMPLE_RATE=0.0)
+    @patch("app.contrib.request_logging.middleware.logger")
+    def test_unsampled_get_error_logged(self, mock_logger: Mock):
+        """Test that the policy, not the content type, decides whether a GET is logged."""
+        self.middleware(self.factory.get("/test/"))
+        mock_logger.log.assert_not_called()
+
+        self.middleware.get_response = Mock(return_value=HttpResponse(status=500))
+        self.middleware(self.factory.get("/test/"))
+        mock_logger.log.assert_called_once()
+        record = json.loads(str(mock_logger.log.call_args[0][2]))
+        self.assertEqual((record["method"], record["status"]), ("GET", 500))
+
+    @patch("app.contrib.request_logging.middleware.logger")
+    def test_body_not_captured_when_not_required(self, mock_logger: Mock):
+        """Test that a body of another content type is not read but the request is logged."""
+        request = self.factory.post("/test/", data="data", content_type="text/plain")
         response = self.middleware(request)
 
         self.assertIsInstance(response, HttpResponse)
-        mock_logger.assert_not_called()
+        self.assertFalse(hasattr(request, "_body"))
+        record = json.loads(str(mock_logger.log.call_args[0][2]))
+        self.assertEqual((record["content_type"], record["body"]), ("text/plain", None))
+
+    @patch("app.contrib.request_logging.middleware.logger")
+    def test_get_error_logged(self, mock_logger: Mock):
+        """Test that a GET returning 500 gets one record."""
+        self.middleware.get_response = Mock(return_value=HttpResponse(status=500))
+        self.middleware(self.factory.get("/test/", {"q": "1"}))
+
+        mock_logger.log.assert_called_once()
+        record = json.loads(str(mock_logger.log.call_args[0][2]))
+        self.assertEqual(record["method"], "GET")
+        self.assertEqual(record["status"], 500)
+        self.assertEqual(record["query"], "q=1")
+        self.assertIsNone(record["body"])
 
     @patch("app.contrib.request_logging.middleware.logger")
     def test_log_request_content_type_form_urlencoded(self, _mock_logger: Mock):
@@ -111,7 +165,7 @@ class TestRequestLoggingMiddleware(unittest.TestCase):
 
         body = self.middleware.get_request_body(request)
 
-        self.assertEqual(body, json.dumps(data_json))
+        self.assertEqual(body, data_json)
 
     @patch("app.contrib.request_logging.middleware.logger")
     def test_application_json_encode_error(self, mock_logger: Mock):
@@ -146,3 +200,157 @@ class TestRequestLoggingMiddleware(unittest.TestCase):
         body = RequestLoggingMiddleware.get_request_body(request)
 
         self.assertEqual(body, "BODY TOO LARGE")
+
+    @patch.object(LoggerConstant, "MAX_BODY_SIZE", 8)
+    @patch("app.contrib.request_logging.middleware.loads")
+    def test_large_body_not_read(self, mock_loads: Mock):
+        """Test that an oversized body is rejected before it is read or parsed."""
+        request = self.factory.post(
+            "/test/", data={"a": "b" * 100}, content_type="application/json"
+        )
+
+        body = RequestLoggingMiddleware.get_request_body(request)
+
+        self.assertEqual(body, "BODY TOO LARGE")
+        mock_loads.assert_not_called()
+        self.assertFalse(hasattr(request, "_body"))
+
+    @patch.object(LoggerConstant, "MAX_BODY_SIZE", 8)
+    @patch("app.contrib.request_logging.middleware.loads")
+    def test_large_body_without_content_length(self, mock_loads: Mock):
+        """Test that a body without Content-Length is bounded without being read whole."""
+        payload = json.dumps({"a": "b" * 100}).encode()
+        request = self.factory.post("/test/", data=payload, content_type="application/json")
+        del request.META["CONTENT_LENGTH"]
+
+        body = RequestLoggingMiddleware.get_request_body(request)
+
+        self.assertEqual(body, "BODY TOO LARGE")
+        mock_loads.assert_not_called()
+        self.assertEqual(request.read(), payload)  # still whole for the view
+
+    @override_settings(REQUEST_LOGGING_CAPTURE_PREFIX=True)
+    @patch.object(LoggerConstant, "MAX_BODY_SIZE", 4)
+    @patch("app.contrib.request_logging.middleware.logger")
+    def test_large_body_without_content_length_prefix(self, mock_logger: Mock):
+        """Test that a body without Content-Length gets a prefix capture of unknown size."""
+        payload = b'{"a": 1}'
+
+        def view(request: HttpRequest) -> HttpResponse:
+            self.assertEqual(request.body, payload)
+            return HttpResponse()
+
+        request = self.factory.post("/test/", data=payload, content_type="application/json")
+        del request.META["CONTENT_LENGTH"]
+        RequestLoggingMiddleware(get_response=view)(request)
+
+        record = json.loads(str(mock_logger.log.call_args[0][2]))
+        self.assertEqual(record["body"], {"truncated": True, "size": None, "prefix": '{"a"'})
+
+    def test_small_body_without_content_length(self):
+        """Test that a small body without Content-Length is still parsed and readable."""
+        request = self.factory.post("/test/", data={"a": 1}, content_type="application/json")
+        del request.META["CONTENT_LENGTH"]
+
+        self.assertEqual(RequestLoggingMiddleware.get_request_body(request), {"a": 1})
+        self.assertEqual(json.loads(request.body), {"a": 1})
+
+    @override_settings(REQUEST_LOGGING_CAPTURE_PREFIX=True)
+    @patch.object(LoggerConstant, "MAX_BODY_SIZE", 24)
+    @patch("app.contrib.request_logging.middleware.logger")
+    def test_large_body_prefix_captured(self, mock_logger: Mock):
+        """Test that only a bounded, sanitized prefix of a large body is logged."""
+        payload = json.dumps({"password": "hunter2", "data": "x" * 100}).encode()
+
+        def view(request: HttpRequest) -> HttpResponse:
+            self.assertEqual(request.body, payload)
+            return HttpResponse()
+
+        request = self.factory.post("/test/", data=payload, content_type="application/json")
+        RequestLoggingMiddleware(get_response=view)(request)
+
+        record = json.loads(str(mock_logger.log.call_args[0][2]))
+        self.assertEqual(
+            record["body"],
+            {"truncated": True, "size": len(payload), "prefix": '{"password": ***, '},
+        )
+
+    @override_settings(REQUEST_LOGGING_CAPTURE_PREFIX=True)
+    @patch.object(LoggerConstant, "MAX_BODY_SIZE", 4)
+    @patch("app.contrib.request_logging.middleware.logger")
+    def test_large_body_prefix_filled_when_unread(self, mock_logger: Mock):
+        """Test that the prefix is read after the view if the view ignored the body."""
+        request = self.factory.post("/test/", data=b'{"a": 1}', content_type="application/json")
+        self.middleware(request)
+
+        record = json.loads(str(mock_logger.log.call_args[0][2]))
+        self.assertEqual(record["body"]["prefix"], '{"a"')
+
+    @patch("app.contrib.request_logging.middleware.logger")
+    def test_streaming_response_logged_when_consumed(self, mock_logger: Mock):
+        """Test that a streaming response is logged once sent, with the bytes sent."""
+        response = StreamingHttpResponse(iter([b"[1,", b"2]"]))
+        self.middleware.get_response = Mock(return_value=response)
+
+        result = self.middleware(self.factory.post("/test/", {}, content_type="application/json"))
+        mock_logger.log.assert_not_called()
+
+        self.assertEqual(b"".join(result.streaming_content), b"[1,2]")
+        mock_logger.log.assert_called_once()
+        record = json.loads(str(mock_logger.log.call_args[0][2]))
+        self.assertEqual(record["bytes_out"], 5)
+        self.assertEqual(record["status"], HTTP_200_OK)
+
+    @patch("app.contrib.request_logging.middleware.logger")
+    def test_streaming_response_logged_when_closed_early(self, mock_logger: Mock):
+        """Test that an interrupted stream is logged with the bytes sent so far."""
+        response = StreamingHttpResponse(iter([b"ab", b"cd"]))
+        self.middleware.get_response = Mock(return_value=response)
+
+        result = self.middleware(self.factory.post("/test/", {}, content_type="application/json"))
+        next(iter(result))
+        result.close()
+
+        record = json.loads(str(mock_logger.log.call_args[0][2]))
+        self.assertEqual(record["bytes_out"], 2)
+
+
+class TestRequestLoggingMiddlewareAsync(unittest.IsolatedAsyncioTestCase):
+    """Test the RequestLoggingMiddleware class in async mode."""
+
+    def setUp(self):
+        """Set up the test environment."""
+        self.factory = RequestFactory()
+        self.get_response = AsyncMock(return_value=HttpResponse())
+        self.middleware = RequestLoggingMiddleware(get_response=self.get_response)
+
+    @patch("app.contrib.request_logging.middleware.logger")
+    async def test_middleware_call(self, mock_logger: Mock):
+        """Test the middleware call in async mode."""
+        request = self.factory.post(
+            "/test/", data={"param": "value"}, content_type="application/json"
+        )
+        response = await self.middleware(request)
+
+        self.assertEqual(response.status_code, HTTP_200_OK)
+        self.get_response.assert_awaited_once_with(request)
+        self.assertTrue(request.id)
+        mock_logger.log.assert_called_once()
+
+    @patch("app.contrib.request_logging.middleware.logger")
+    async def test_async_streaming_response(self, mock_logger: Mock):
+        """Test that an async streaming response is logged once consumed."""
+
+        async def content() -> AsyncIterator[bytes]:
+            yield b"[]"
+
+        self.get_response.return_value = StreamingHttpResponse(content())
+        response = await self.middleware(
+            self.factory.post("/test/", {}, content_type="application/json")
+        )
+        self.assertTrue(response.is_async)
+
+        chunks = [chunk async for chunk in response.streaming_content]
+        self.assertEqual(chunks, [b"[]"])
+        record = json.loads(str(mock_logger.log.call_args[0][2]))
+        self.assertEqual(record["bytes_out"], 2)
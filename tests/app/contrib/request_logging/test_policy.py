@@ -0,0 +1,103 @@
+import logging
+import unittest
+from unittest.mock import Mock, patch
+
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from app.contrib.request_logging.middleware import RequestLoggingMiddleware
+from app.contrib.request_logging.policy import LogDecision, RequestLogPolicy
+
+
+class TestRequestLogPolicy(unittest.TestCase):
+    """Test the RequestLogPolicy class."""
+
+    def setUp(self):
+        """Set up the test environment."""
+        self.factory = RequestFactory()
+        self.policy = RequestLogPolicy(
+            routes=[
+                {"prefix": "/api/", "sample_rate": 0},
+                {"prefix": "/api/orders/", "methods": ["post"], "level": "WARNING"},
+            ],
+            skip_paths=["/static/", ""],
+            slow_ms=100,
+        )
+
+    def test_skip_paths(self):
+        """Test that skipped paths are never logged."""
+        self.assertIsNone(self.policy.decide(self.factory.get("/static/app.js")))
+
+    def test_longest_prefix_and_method(self):
+        """Test that the longest prefix wins and its method rules apply."""
+        self.assertEqual(
+            self.policy.decide(self.factory.post("/api/orders/1/")),
+            LogDecision(logging.WARNING, sampled=True),
+        )
+        self.assertEqual(
+            self.policy.decide(self.factory.get("/api/orders/1/")),
+            LogDecision(logging.INFO, sampled=False),
+        )
+        self.assertEqual(
+            self.policy.decide(self.factory.get("/other/")), LogDecision(logging.INFO, sampled=True)
+        )
+
+    def test_should_emit(self):
+        """Test that unsampled requests are logged only on errors or when slow."""
+        decision = LogDecision(logging.INFO, sampled=False)
+        self.assertFalse(self.policy.should_emit(decision, 200, 1_000))
+        self.assertTrue(self.policy.should_emit(decision, 500, 1_000))
+        self.assertTrue(self.policy.should_emit(decision, 200, 100_000_000))
+        self.assertTrue(self.policy.should_emit(decision._replace(sampled=True), 200, 0))
+
+    @patch("app.contrib.request_logging.policy.random.random", return_value=0.3)
+    def test_sample_rate(self, _mock_random: Mock):
+        """Test partial sampling rates."""
+        self.assertTrue(RequestLogPolicy(sample_rate=0.5).decide(self.factory.get("/")).sampled)
+        self.assertFalse(RequestLogPolicy(sample_rate=0.2).decide(self.factory.get("/")).sampled)
+
+    def test_invalid_level(self):
+        """Test that an unknown level name is rejected."""
+        with self.assertRaises(ValueError):
+            RequestLogPolicy(routes=[{"prefix": "/", "level": "LOUD"}])
+
+
+@override_settings(REQUEST_LOGGING_ROUTES=[{"prefix": "/api/", "sample_rate": 0}])
+class TestRequestLoggingMiddlewarePolicy(SimpleTestCase):
+    """Test the policy applied by RequestLoggingMiddleware."""
+
+    def setUp(self):
+        """Set up the test environment."""
+        self.factory = RequestFactory()
+
+    @patch("app.contrib.request_logging.middleware.logger")
+    def test_unsampled_request_skipped(self, mock_logger: Mock):
+        """Test that unsampled successful requests are neither read nor logged."""
+        middleware = RequestLoggingMiddleware(get_response=Mock(return_value=HttpResponse()))
+        request = self.factory.post("/api/", data={"a": 1}, content_type="application/json")
+        middleware(request)
+
+        mock_logger.log.assert_not_called()
+        self.assertFalse(hasattr(request, "_body"))
+
+    @patch("app.contrib.request_logging.middleware.logger")
+    def test_unsampled_error_logged(self, mock_logger: Mock):
+        """Test that unsampled failed requests are logged without their body."""
+        response = HttpResponse(status=500)
+        middleware = RequestLoggingMiddleware(get_response=Mock(return_value=response))
+        middleware(self.factory.post("/api/", data={"a": 1}, content_type="application/json"))
+
+        mock_logger.log.assert_called_once()
+        self.assertIn('"body":null', str(mock_logger.log.call_args[0][2]))
+
+    @override_settings(REQUEST_LOGGING_SKIP_PATHS=["/api/health_check/"])
+    @patch("app.contrib.request_logging.middleware.logger")
+    def test_skip_path(self, mock_logger: Mock):
+        """Test that skipped paths are not logged even on errors."""
+        response = HttpResponse(status=500)
+        middleware = RequestLoggingMiddleware(get_response=Mock(return_value=response))
+        middleware(
+            self.factory.post("/api/health_check/", data={"a": 1}, content_type="application/json")
+        )
+
+        mock_logger.log.assert_not_called()
@@ -1,12 +1,14 @@
 import unittest
 from http import HTTPStatus
-from unittest.mock import Mock
+from typing import Iterator
+from unittest.mock import AsyncMock, Mock
 
-from django.http import HttpResponse
-from django.test import RequestFactory
+from django.http import BadHeaderError, HttpRequest, HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory, SimpleTestCase
 from django.test.utils import override_settings
 
 from app.contrib.security.middleware import SecurityHeadersMiddleware
+from app.contrib.security.policy import get_security_policy
 
 
 class TestSecurityHeadersMiddleware(unittest.TestCase):
@@ -43,8 +45,9 @@ class TestSecurityHeadersMiddleware(unittest.TestCase):
         self.assertNotIn("X-Frame-Options", response)
         self.assertNotIn("X-XSS-Protection", response)
 
-    def test_get_csp_policy(self):
-        """Test the Content Security Policy generation."""
+    @override_settings(DEBUG=False)
+    def test_default_csp(self):
+        """Test the Content Security Policy written from the default settings."""
         expected_policy = (
             "default-src 'self'; "
             "img-src 'self' data: https:; "
@@ -52,4 +55,100 @@ class TestSecurityHeadersMiddleware(unittest.TestCase):
             "style-src 'self' 'unsafe-inline' https://cdn.jsdelivr.net; "
             "frame-ancestors 'none'"
         )
-        self.assertEqual(self.middleware._get_csp_policy(), expected_policy)
+        response = self.middleware(self.factory.get("/test/"))
+        self.assertEqual(response["Content-Security-Policy"], expected_policy)
+
+    @override_settings(DEBUG=False, SECURITY_CSP=["default-src 'none'", "img-src 'self'"])
+    def test_csp_setting(self):
+        """Test that the SECURITY_CSP setting is compiled into the header."""
+        response = self.middleware(self.factory.get("/test/"))
+        self.assertEqual(response["Content-Security-Policy"], "default-src 'none'; img-src 'self'")
+
+
+class TestSecurityHeadersMiddlewareAsync(unittest.IsolatedAsyncioTestCase):
+    """Test the SecurityHeadersMiddleware class in async mode."""
+
+    @override_settings(DEBUG=False)
+    async def test_add_security_headers(self):
+        """Test that security headers are added to the response in async mode."""
+        middleware = SecurityHeadersMiddleware(get_response=AsyncMock(return_value=HttpResponse()))
+        response = await middleware(RequestFactory().get("/test/"))
+
+        self.assertEqual(response["X-Frame-Options"], "DENY")
+        self.assertIn("Content-Security-Policy", response)
+
+
+class TestSecurityHeaderPolicy(SimpleTestCase):
+    """Test the security header policy."""
+
+    def setUp(self):
+        """Set up the test environment."""
+        self.factory = RequestFactory()
+
+    @override_settings(
+        DEBUG=False,
+        SECURITY_HEADERS_ROUTES={
+            "/apidocs/": {
+                "csp": ["default-src 'self'", "script-src 'self' 'nonce-{nonce}'"],
+                "headers": {"X-Frame-Options": None, "Referrer-Policy": "same-origin"},
+            }
+        },
+    )
+    def test_route_override_with_nonce(self):
+        """Test that a route override replaces the CSP and headers and renders the nonce."""
+
+        def view(request: HttpRequest) -> HttpResponse:
+            return HttpResponse(f"<script nonce='{request.csp_nonce}'></script>")
+
+        request = self.factory.get("/apidocs/schema/")
+        response = SecurityHeadersMiddleware(get_response=view)(request)
+
+        nonce = request.csp_nonce.value
+        self.assertTrue(nonce)
+        self.assertEqual(
+            response["Content-Security-Policy"],
+            f"default-src 'self'; script-src 'self' 'nonce-{nonce}'",
+        )
+        self.assertNotIn("X-Frame-Options", response)
+        self.assertEqual(response["Referrer-Policy"], "same-origin")
+        self.assertEqual(response["X-Content-Type-Options"], "nosniff")
+
+    @override_settings(
+        DEBUG=False,
+        SECURITY_HEADERS_ROUTES={"/apidocs/": {"csp": ["script-src 'self' 'nonce-{nonce}'"]}},
+    )
+    def test_unused_nonce_left_out(self):
+        """Test that an unrendered nonce is not generated nor sent."""
+        middleware = SecurityHeadersMiddleware(get_response=Mock(return_value=HttpResponse()))
+
+        request = self.factory.get("/apidocs/")
+        response = middleware(request)
+        self.assertIsNone(request.csp_nonce.value)
+        self.assertEqual(response["Content-Security-Policy"], "script-src 'self'")
+
+        request = self.factory.get("/api/")
+        middleware(request)
+        self.assertFalse(hasattr(request, "csp_nonce"))
+
+    @override_settings(DEBUG=False)
+    def test_streaming_response(self):
+        """Test that headers are added to a streaming response without consuming it."""
+        consumed = []
+
+        def content() -> Iterator[bytes]:
+            consumed.append(True)
+            yield b"[]"
+
+        response = StreamingHttpResponse(content())
+        middleware = SecurityHeadersMiddleware(get_response=Mock(return_value=response))
+        result = middleware(self.factory.get("/test/"))
+
+        self.assertEqual(result["X-Frame-Options"], "DENY")
+        self.assertFalse(consumed)
+        self.assertEqual(b"".join(result.streaming_content), b"[]")
+
+    @override_settings(SECURITY_HEADERS={"X-Frame-Options": "bad\nvalue"})
+    def test_invalid_header_rejected_at_compile_time(self):
+        """Test that header values are validated when the policy is compiled."""
+        with self.assertRaises(BadHeaderError):
+            get_security_policy()
@@ -0,0 +1,163 @@
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.test import SimpleTestCase, override_settings
+
+from app.contrib.cache import MISSING, LocalLRU, TwoTierCache, _local_tiers
+
+
+def make_cache(location: str = "two-tier-test", **options: object) -> TwoTierCache:
+    """Return a two-tier cache over a local-memory cache shared by ``location``.
+
+    Each call gets its own local tier, as if it ran in another process.
+    """
+    _local_tiers.clear()
+    return TwoTierCache(
+        location,
+        {"OPTIONS": {"SHARED_BACKEND": "django.core.cache.backends.locmem.LocMemCache", **options}},
+    )
+
+
+class TestLocalLRU(unittest.TestCase):
+    """Test the LocalLRU class."""
+
+    def test_evicts_least_recently_used(self):
+        """Test that the oldest unused entry is evicted when full."""
+        lru = LocalLRU(max_entries=2, timeout=60)
+        lru.set("a", 0, 1)
+        lru.set("b", 0, 2)
+        lru.get("a")
+        lru.set("c", 0, 3)
+        self.assertEqual(lru.get("b"), MISSING)
+        self.assertEqual(lru.get("a"), 1)
+
+    def test_expiry(self):
+        """Test that entries expire after their timeout."""
+        lru = LocalLRU(max_entries=2, timeout=60)
+        lru.set("a", 0, 1, timeout=0.01)
+        time.sleep(0.02)
+        self.assertEqual(lru.get("a"), MISSING)
+
+    def test_values_are_copies(self):
+        """Test that callers can't mutate cached values."""
+        lru = LocalLRU(max_entries=2, timeout=60)
+        lru.set("a", 0, [1])
+        lru.get("a").append(2)
+        self.assertEqual(lru.get("a"), [1])
+
+    def test_stale_fill_is_ignored(self):
+        """Test that a value read before a write is not stored."""
+        lru = LocalLRU(max_entries=2, timeout=60)
+        stamp = lru.stamp
+        lru.delete(["a"])
+        lru.set("a", 0, "old", stamp=stamp)
+        self.assertEqual(lru.get("a"), MISSING)
+
+
+class TestTwoTierCache(unittest.TestCase):
+    """Test the TwoTierCache class."""
+
+    def setUp(self):
+        """Create two caches sharing one backend, like two workers."""
+        self.worker = make_cache()
+        self.other = make_cache()
+        self.worker.clear()
+
+    def tearDown(self):
+        """Clear the shared backend."""
+        self.worker.clear()
+
+    def test_get_is_served_locally(self):
+        """Test that a value read once is served without the shared backend."""
+        self.worker.set("key", "value")
+        self.worker.sync()
+        with patch.object(LocMemCache, "get") as shared_get:
+            self.assertEqual(self.worker.get("key"), "value")
+        shared_get.assert_not_called()
+
+    def test_get_many_batches_misses(self):
+        """Test that keys missing locally are fetched in one call."""
+        self.other.set_many({"a": 1, "b": 2})
+        self.worker.set("c", 3)
+        with patch.object(LocMemCache, "get_many", wraps=self.worker.shared.get_many) as get_many:
+            self.worker.tier.synced_at = time.monotonic()
+            self.assertEqual(self.worker.get_many(["a", "b", "c", "d"]), {"a": 1, "b": 2, "c": 3})
+        get_many.assert_called_once()
+        self.assertEqual(self.worker.get_many(["a", "b"]), {"a": 1, "b": 2})
+
+    def test_writes_of_other_workers_invalidate(self):
+        """Test that a write in another worker drops the local copy on the next sync."""
+        self.other.set("key", "old")
+        self.assertEqual(self.worker.get("key"), "old")
+        self.other.set("key", "new")
+        self.assertEqual(self.worker.get("key"), "old")  # until the next sync
+        self.worker.tier.synced_at = None  # as if SYNC_INTERVAL elapsed
+        self.assertEqual(self.worker.get("key"), "new")
+
+    def test_own_writes_keep_local_copies(self):
+        """Test that a worker doesn't drop its own writes on sync."""
+        self.worker.set("key", "value")
+        self.worker.tier.synced_at = None
+        self.worker.sync()
+        self.assertEqual(self.worker.local.get(self.worker.shared.make_key("key")), "value")
+
+    def test_counters_are_atomic_in_shared_cache(self):
+        """Test that counters are always incremented in the shared backend."""
+        self.worker.set("count", 1)
+        self.other.incr("count")
+        self.worker.tier.synced_at = None  # as if SYNC_INTERVAL elapsed
+        self.assertEqual(self.worker.incr("count"), 3)
+        self.assertEqual(self.other.get("count"), 3)
+
+    def test_add_and_delete(self):
+        """Test that add respects the shared cache and delete invalidates."""
+        self.assertTrue(self.worker.add("key", 1))
+        self.assertFalse(self.other.add("key", 2))
+        self.other.delete("key")
+        self.worker.tier.synced_at = None  # as if SYNC_INTERVAL elapsed
+        self.assertIsNone(self.worker.get("key"))
+        self.assertFalse(self.worker.has_key("key"))
+
+    def test_zero_timeout_is_not_cached(self):
+        """Test that a value set with a zero timeout is not kept locally."""
+        self.worker.set("key", "value", timeout=0)
+        self.assertIsNone(self.worker.get("key"))
+
+
+@override_settings(
+    CACHES={
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+        "two_tier": {
+            "BACKEND": "app.contrib.cache.TwoTierCache",
+            "LOCATION": "two-tier-threads",
+            "OPTIONS": {"SHARED_BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+        },
+    }
+)
+class TestTwoTierCacheThreads(SimpleTestCase):
+    """Test that the threads of a process share the local tier."""
+
+    def test_local_hit_from_another_thread(self):
+        """Test that a value read in one thread is served locally in another."""
+        cache = caches["two_tier"]
+        cache.set("key", "value")
+        cache.sync()
+        result = {}
+
+        def read() -> None:
+            other = caches["two_tier"]
+            result["same_instance"] = other is cache
+            result["value"] = other.get("key")
+
+        with patch.object(LocMemCache, "get") as shared_get:
+            thread = threading.Thread(target=read)
+            thread.start()
+            thread.join()
+        self.assertFalse(result["same_instance"])
+        self.assertEqual(result["value"], "value")
+        shared_get.assert_not_called()
+        cache.clear()
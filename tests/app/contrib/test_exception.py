@@ -1,16 +1,19 @@
 import json
 from unittest import TestCase
+from unittest.mock import Mock, patch
 
 from django.core.exceptions import PermissionDenied
+from django.db import transaction
 from django.http import Http404, JsonResponse
-from django.test import override_settings
+from django.test import TransactionTestCase, override_settings
+from django.utils import translation
 
 from rest_framework import exceptions, status
 from rest_framework.response import Response
 
 from app.contrib.config import config
 from app.contrib.error_code import ErrorCode
-from app.contrib.exception import APIExceptionHandler, exception_handler
+from app.contrib.exception import APIExceptionHandler, PrerenderedJsonResponse, exception_handler
 
 
 class TestExceptionHandler(TestCase):
@@ -92,3 +95,78 @@ class TestExceptionHandler(TestCase):
         content = json.loads(response.content)
         self.assertEqual(content["code"], ErrorCode.INTERNAL_SERVER_ERROR_CODE)
         self.assertEqual(content["message"], ErrorCode.INTERNAL_SERVER_ERROR_DETAIL)
+
+    @patch("app.contrib.exception.logger")
+    def test_log_api_error_redacts_data(self, mock_logger: Mock):
+        """Test that sensitive values in the error payload are not logged."""
+        APIExceptionHandler()._log_api_error(
+            exceptions.ValidationError(), {"message": {"password": ["too short"]}}
+        )
+        self.assertEqual(
+            str(mock_logger.info.call_args[0][2]), str({"message": {"password": "***"}})
+        )
+
+    @patch("app.contrib.exception.logger")
+    def test_repeated_errors_deduplicated(self, mock_logger: Mock):
+        """Test that repeated errors from the same view are logged a limited number of times."""
+        handler = APIExceptionHandler()
+        handler.deduplicator.limit = 2
+        view = Mock()
+        for _ in range(5):
+            handler.handle_exception(exceptions.NotFound(), {"view": view})
+            handler.handle_exception(ValueError("boom"), {"view": view})
+
+        self.assertEqual(mock_logger.info.call_count, 4)
+        self.assertEqual(mock_logger.error.call_count, 2)
+        handler.deduplicator.flush()
+        self.assertEqual(mock_logger.log.call_count, 3)
+
+
+@override_settings(DEBUG=False)
+class TestPrerenderedErrors(TransactionTestCase):
+    """Test the pre-rendered responses of default-detail exceptions."""
+
+    def setUp(self):
+        """Set up the test environment."""
+        self.handler = APIExceptionHandler()
+
+    def tearDown(self):
+        """Reset the config to the default values."""
+        config.reset()
+
+    def test_default_detail_rendered_once(self):
+        """Test that the body of a default-detail exception is encoded once."""
+        first = self.handler.handle_exception(exceptions.NotFound(), {})
+        with patch("app.contrib.exception.dumps") as mock_dumps:
+            second = self.handler.handle_exception(Http404(), {})
+        mock_dumps.assert_not_called()
+
+        self.assertIsInstance(second, PrerenderedJsonResponse)
+        self.assertEqual(second.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(json.loads(second.content), {"message": "Not found.", "code": "not_found"})
+
+    def test_rendered_per_language(self):
+        """Test that cached bodies are kept per active language."""
+        with translation.override("en"):
+            self.handler.handle_exception(exceptions.NotFound(), {})
+        with translation.override("ja"):
+            response = self.handler.handle_exception(exceptions.NotFound(), {})
+        self.assertEqual(len(self.handler._rendered), 2)
+        self.assertEqual(json.loads(response.content)["code"], "not_found")
+
+    def test_custom_detail_not_cached(self):
+        """Test that exceptions with a custom detail are rendered every time."""
+        response = self.handler.handle_exception(exceptions.NotFound("No such order."), {})
+        self.assertEqual(json.loads(response.content)["message"], "No such order.")
+        self.assertEqual(self.handler._rendered, {})
+
+    @patch("app.contrib.exception.set_rollback")
+    def test_rollback_skipped_outside_atomic(self, mock_set_rollback: Mock):
+        """Test that set_rollback is only called inside an atomic block."""
+        self.handler.handle_exception(exceptions.NotFound(), {})
+        mock_set_rollback.assert_not_called()
+
+        with transaction.atomic():
+            self.handler.handle_exception(exceptions.NotFound(), {})
+        mock_set_rollback.assert_called_once()
@@ -0,0 +1,64 @@
+import threading
+from unittest import TestCase
+from unittest.mock import Mock
+
+from app.contrib.log_dedup import LogDeduplicator
+
+
+class TestLogDeduplicator(TestCase):
+    """Test the LogDeduplicator class."""
+
+    def setUp(self):
+        """Set up the test environment."""
+        self.report = Mock()
+        self.timer = Mock(return_value=0.0)
+        self.deduplicator = LogDeduplicator(
+            self.report, limit=2, window=60, max_keys=2, timer=self.timer
+        )
+        self.addCleanup(self.deduplicator.flush)
+
+    def test_first_occurrences_then_summary(self):
+        """Test that only the first occurrences are allowed and the rest summarized."""
+        allowed = [self.deduplicator.allow("a") for _ in range(5)]
+        self.assertEqual(allowed, [True, True, False, False, False])
+        self.report.assert_not_called()
+
+        self.timer.return_value = 60.0
+        self.assertTrue(self.deduplicator.allow("a"))
+        self.report.assert_called_once_with("a", 3, 60)
+
+    def test_sweep_reports_quiet_keys(self):
+        """Test that keys that stopped occurring are summarized by later calls."""
+        for _ in range(3):
+            self.deduplicator.allow("a")
+        self.timer.return_value = 61.0
+        self.deduplicator.allow("b")
+        self.report.assert_called_once_with("a", 1, 60)
+
+    def test_bounded_keys(self):
+        """Test that the least recently seen key is evicted and summarized."""
+        for key in ("a", "a", "a", "b", "c"):
+            self.deduplicator.allow(key)
+        self.report.assert_called_once_with("a", 1, 60)
+        self.assertTrue(self.deduplicator.allow("a"))
+
+    def test_summary_after_burst_ends(self):
+        """Test that the summary is reported when the window ends without further calls."""
+        reported = threading.Event()
+        report = Mock(side_effect=lambda *_args: reported.set())
+        deduplicator = LogDeduplicator(report, limit=1, window=0.05)
+        self.addCleanup(deduplicator.flush)
+        for _ in range(3):
+            deduplicator.allow("a")
+
+        self.assertTrue(reported.wait(5))
+        report.assert_called_once_with("a", 2, 0.05)
+        deduplicator.flush()
+        report.assert_called_once()
+
+    def test_flush(self):
+        """Test that pending summaries are reported by flush."""
+        for _ in range(3):
+            self.deduplicator.allow("a")
+        self.deduplicator.flush()
+        self.report.assert_called_once_with("a", 1, 60)
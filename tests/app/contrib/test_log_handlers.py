@@ -0,0 +1,142 @@
+import logging
+import tempfile
+from pathlib import Path
+from unittest import TestCase
+from unittest.mock import patch
+
+from app.contrib.log_handlers import BatchRotatingFileHandler, QueueRotatingFileHandler
+
+
+class TestQueueRotatingFileHandler(TestCase):
+    """Test the QueueRotatingFileHandler class."""
+
+    def setUp(self):
+        """Set up a handler writing to a temporary file."""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.filename = Path(self.tmp_dir.name) / "app.log"
+        self.logger = logging.getLogger("tests.log_handlers")
+        self.logger.propagate = False
+        self.logger.setLevel(logging.INFO)
+
+    def tearDown(self):
+        """Remove handlers and the temporary directory."""
+        for handler in list(self.logger.handlers):
+            self.logger.removeHandler(handler)
+            handler.close()
+        self.tmp_dir.cleanup()
+
+    def make_handler(self, **kwargs: object) -> QueueRotatingFileHandler:
+        """Create a handler attached to the test logger."""
+        handler = QueueRotatingFileHandler(self.filename, **kwargs)
+        handler.setFormatter(logging.Formatter("%(levelname)s %(message)s"))
+        self.logger.addHandler(handler)
+        return handler
+
+    def test_records_written_by_listener(self):
+        """Test that records are formatted and written once flushed."""
+        handler = self.make_handler()
+        self.logger.info("hello %s", "world")
+        self.logger.warning("second")
+        handler.flush()
+
+        self.assertEqual(self.filename.read_text(), "INFO hello world\nWARNING second\n")
+
+    def test_args_merged_when_logged(self):
+        """Test that arguments mutated after the call are logged as they were."""
+        handler = self.make_handler()
+        items = ["a"]
+        self.logger.info("items %s", items)
+        items.append("b")
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            self.logger.exception("failed")
+        handler.flush()
+
+        lines = self.filename.read_text().splitlines()
+        self.assertEqual(lines[:2], ["INFO items ['a']", "ERROR failed"])
+        self.assertEqual(lines[-1], "ValueError: boom")
+
+    def test_close_flushes_queue(self):
+        """Test that closing the handler writes every pending record."""
+        handler = self.make_handler()
+        for i in range(100):
+            self.logger.info("record %s", i)
+        self.logger.removeHandler(handler)
+        handler.close()
+
+        self.assertEqual(len(self.filename.read_text().splitlines()), 100)
+
+    def test_drop_overflow(self):
+        """Test that records are dropped and reported when the queue is full."""
+        handler = self.make_handler(queue_size=2, overflow="drop")
+        handler.listener.stop()
+        for i in range(5):
+            self.logger.info("record %s", i)
+        self.assertEqual(handler.dropped, 3)
+
+        handler.start_listener()
+        handler.flush()
+        lines = self.filename.read_text().splitlines()
+        self.assertEqual(lines[:2], ["INFO record 0", "INFO record 1"])
+        self.assertIn("Dropped 3 records", lines[2])
+
+    def test_sample_overflow(self):
+        """Test that low-level records are sampled once the queue fills up."""
+        handler = self.make_handler(
+            queue_size=100, overflow="sample", sample_rate=2, sample_threshold=0.1
+        )
+        handler.listener.stop()
+        for i in range(30):
+            self.logger.info("record %s", i)
+        self.logger.error("always kept")
+
+        self.assertEqual(handler.queue.qsize(), 10 + 10 + 1)
+        handler.start_listener()
+        handler.flush()
+        self.assertIn("ERROR always kept", self.filename.read_text())
+
+    def test_block_overflow(self):
+        """Test that the block policy waits for room before dropping."""
+        handler = self.make_handler(queue_size=1, overflow="block", block_timeout=0.01)
+        handler.listener.stop()
+        self.logger.info("first")
+        self.logger.info("second")
+        self.assertEqual(handler.dropped, 1)
+        handler.start_listener()
+
+    def test_invalid_overflow(self):
+        """Test that an unknown overflow policy is rejected."""
+        with self.assertRaises(ValueError):
+            QueueRotatingFileHandler(self.filename, overflow="unknown")
+
+    def test_restart_after_fork(self):
+        """Test that a forked child gets a fresh queue and listener."""
+        handler = self.make_handler()
+        old_queue = handler.queue
+        handler.restart_after_fork()
+        self.assertIsNot(handler.queue, old_queue)
+        self.logger.info("after fork")
+        handler.flush()
+        self.assertIn("after fork", self.filename.read_text())
+
+
+class TestBatchRotatingFileHandler(TestCase):
+    """Test the BatchRotatingFileHandler class."""
+
+    def test_rotates_once_per_batch(self):
+        """Test that a batch triggers at most one rollover."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            handler = BatchRotatingFileHandler(
+                Path(tmp_dir) / "app.log", maxBytes=10, backupCount=2
+            )
+            records = [
+                logging.makeLogRecord({"msg": f"record {i}", "levelno": logging.INFO})
+                for i in range(3)
+            ]
+            with patch.object(handler, "doRollover", wraps=handler.doRollover) as rollover:
+                handler.emit_batch(records)
+                handler.emit_batch(records)
+            handler.close()
+
+            self.assertEqual(rollover.call_count, 2)
@@ -0,0 +1,181 @@
+from typing import Optional
+from unittest.mock import Mock, patch
+from urllib.parse import parse_qs, urlparse
+
+from django.contrib.auth.models import Permission, User
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import QuerySet
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from rest_framework.exceptions import NotFound
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from app.contrib.pagination import CustomPagination, KeysetPagination
+
+
+class TestKeysetPagination(TestCase):
+    """Test the KeysetPagination class."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        """Create users sharing last names so the ordering needs a tie-breaker."""
+        for index in range(7):
+            User.objects.create(username=f"user{index}", last_name=f"name{index % 3}")
+
+    def setUp(self):
+        """Set up the test environment."""
+        self.factory = APIRequestFactory()
+        self.queryset = User.objects.all()
+        self.expected = list(User.objects.order_by("-last_name", "pk"))
+
+    def paginate(
+        self, url: str, ordering: tuple = ("-last_name",), queryset: Optional[QuerySet] = None
+    ) -> tuple:
+        """Paginate the users for the URL and return the page and the paginator."""
+        paginator = KeysetPagination()
+        paginator.ordering = ordering
+        request = Request(self.factory.get(url))
+        queryset = self.queryset if queryset is None else queryset
+        return paginator.paginate_queryset(queryset, request), paginator
+
+    def test_forward_and_backward(self):
+        """Test walking every page forward, then back, on a multi-field ordering."""
+        url, pages = "/users/?page_size=3", []
+        while url:
+            page, paginator = self.paginate(url)
+            pages.append(page)
+            url = paginator.get_next_link()
+        self.assertEqual([user for page in pages for user in page], self.expected)
+        self.assertEqual([len(page) for page in pages], [3, 3, 1])
+
+        url = paginator.get_previous_link()
+        page, paginator = self.paginate(url)
+        self.assertEqual(page, pages[1])
+        page, paginator = self.paginate(paginator.get_previous_link())
+        self.assertEqual(page, pages[0])
+        self.assertIsNone(paginator.get_previous_link())
+
+    def test_no_count_query(self):
+        """Test that a page costs a single query and never counts."""
+        _, paginator = self.paginate("/users/?page_size=2")
+        with CaptureQueriesContext(connection) as queries:
+            self.paginate(paginator.get_next_link())
+        self.assertEqual(len(queries), 1)
+        self.assertNotIn("COUNT", queries[0]["sql"].upper())
+        self.assertNotIn("OFFSET", queries[0]["sql"].upper())
+
+    def test_tampered_cursor(self):
+        """Test that forged or malformed cursors are rejected."""
+        _, paginator = self.paginate("/users/?page_size=2")
+        cursor = parse_qs(urlparse(paginator.get_next_link()).query)["cursor"][0]
+        for value in (cursor[:-2] + "xx", "garbage"):
+            with self.subTest(value=value), self.assertRaises(NotFound):
+                self.paginate(f"/users/?cursor={value}")
+
+    def test_cursor_of_other_ordering(self):
+        """Test that a cursor reused with another ordering is rejected."""
+        _, paginator = self.paginate("/users/?page_size=2", ordering=("-date_joined",))
+        cursor = parse_qs(urlparse(paginator.get_next_link()).query)["cursor"][0]
+        # The date position would be compared against the integer primary key.
+        with self.assertRaises(NotFound):
+            self.paginate(f"/users/?page_size=2&cursor={cursor}", ordering=("pk",))
+        with self.assertRaises(NotFound):
+            self.paginate(f"/users/?page_size=2&cursor={cursor}", ordering=("-last_name",))
+
+    def test_ordering_across_relation(self):
+        """Test paging on an ordering field that follows a foreign key."""
+        queryset = Permission.objects.all()
+        ordering = ("content_type__model",)
+        expected = list(queryset.order_by("content_type__model", "pk"))
+        url, items = "/permissions/?page_size=10", []
+        while url:
+            page, paginator = self.paginate(url, ordering, queryset)
+            items.extend(page)
+            url = paginator.get_next_link()
+        self.assertEqual(items, expected)
+
+    def test_tiebreaker_and_seek_filter(self):
+        """Test the unique ordering and the seek condition."""
+        self.assertEqual(KeysetPagination.get_keyset_ordering(["-created"]), ("-created", "pk"))
+        self.assertEqual(KeysetPagination.get_keyset_ordering(["-id"]), ("-id",))
+        seek = KeysetPagination.get_seek_filter(("a", "-b"), (1, 2))
+        self.assertEqual(str(seek), "(OR: ('a__gt', 1), (AND: ('a', 1), ('b__lt', 2)))")
+
+
+class TestCustomPaginationCount(TestCase):
+    """Test the count strategies of CustomPagination."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        """Create users."""
+        for index in range(5):
+            User.objects.create(username=f"user{index}")
+
+    def setUp(self):
+        """Set up the test environment."""
+        self.factory = APIRequestFactory()
+
+    def tearDown(self):
+        """Tear down the test environment."""
+        cache.clear()
+
+    def paginate(self, strategy: str, url: str = "/users/?page_size=2") -> dict:
+        """Paginate the users with the strategy and return the response data."""
+        paginator = CustomPagination()
+        paginator.count_strategy = strategy
+        request = Request(self.factory.get(url))
+        page = paginator.paginate_queryset(User.objects.order_by("pk"), request)
+        return paginator.get_paginated_response([user.pk for user in page]).data
+
+    def test_exact(self):
+        """Test the exact count."""
+        data = self.paginate("exact")
+        self.assertEqual(data["count"], 5)
+        self.assertTrue(data["count_exact"])
+
+    def test_cached(self):
+        """Test that the count is cached per query and reported as not exact."""
+        self.assertTrue(self.paginate("cached")["count_exact"])
+        User.objects.create(username="new")
+        with CaptureQueriesContext(connection) as queries:
+            data = self.paginate("cached", "/users/?page_size=2&page=2")
+        self.assertEqual(data["count"], 5)
+        self.assertFalse(data["count_exact"])
+        self.assertEqual(len(queries), 1)
+
+        paginator = CustomPagination()
+        self.assertEqual(paginator.get_cached_count(User.objects.filter(username="new")), 1)
+
+    def test_estimated_falls_back_to_exact(self):
+        """Test that without a planner estimate the count is exact."""
+        data = self.paginate("estimated")
+        self.assertEqual(data["count"], 5)
+        self.assertTrue(data["count_exact"])
+
+    def test_estimated_large_table(self):
+        """Test that a large planner estimate, parsed from the explain output, is used as is."""
+        # QuerySet.explain(format="json") output on PostgreSQL.
+        explain = (
+            '{"Plan": {"Node Type": "Seq Scan", "Parallel Aware": false, '
+            '"Async Capable": false, "Relation Name": "auth_user", "Alias": "auth_user", '
+            '"Startup Cost": 0.0, "Total Cost": 4586.0, "Plan Rows": 250000, '
+            '"Plan Width": 145}}'
+        )
+        with patch.object(connection, "vendor", "postgresql"), patch(
+            "django.db.models.QuerySet.explain", return_value=explain
+        ) as explain_mock:
+            data = self.paginate("estimated")
+        explain_mock.assert_called_once_with(format="json")
+        self.assertEqual(data["count"], 250000)
+        self.assertFalse(data["count_exact"])
+
+    def test_view_strategy_and_unknown(self):
+        """Test the view's strategy takes precedence and unknown ones are rejected."""
+        paginator = CustomPagination()
+        self.assertEqual(paginator.get_count_strategy(Mock(count_strategy="cached")), "cached")
+        paginator.count_strategy = "fuzzy"
+        with self.assertRaises(ValueError):
+            paginator.get_count_strategy()
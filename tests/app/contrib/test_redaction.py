@@ -0,0 +1,89 @@
+from unittest import TestCase
+
+from django.test import override_settings
+
+from app.contrib.redaction import Redactor, get_redactor, redact
+
+
+class TestRedactor(TestCase):
+    """Test the Redactor class."""
+
+    def setUp(self):
+        """Set up the test environment."""
+        self.redactor = Redactor(
+            fields=["password"],
+            patterns=["*token", "*secret*"],
+            paths=["user.profile.ssn", "cards.*.number"],
+        )
+
+    def test_nested_structures(self):
+        """Test that sensitive keys are masked at any depth, in dicts and lists."""
+        data = {
+            "Password": "p",
+            "user": {"access_token": "t", "name": "n", "profile": {"ssn": "1", "age": 2}},
+            "items": [{"client_secret": "s"}, {"id": 1}],
+            "cards": [{"number": "4111", "brand": "visa"}],
+        }
+
+        self.assertEqual(
+            self.redactor.redact(data),
+            {
+                "Password": "***",
+                "user": {"access_token": "***", "name": "n", "profile": {"ssn": "***", "age": 2}},
+                "items": [{"client_secret": "***"}, {"id": 1}],
+                "cards": [{"number": "***", "brand": "visa"}],
+            },
+        )
+        self.assertEqual(data["user"]["access_token"], "t")
+
+    def test_copies_only_changed_containers(self):
+        """Test that unchanged data is returned as is and shared with the copy."""
+        clean = {"a": [1, {"b": 2}], "c": {"d": 3}}
+        self.assertIs(self.redactor.redact(clean), clean)
+
+        data = {"clean": {"d": 3}, "dirty": {"password": "p"}}
+        result = self.redactor.redact(data)
+        self.assertIsNot(result, data)
+        self.assertIs(result["clean"], data["clean"])
+        self.assertIsNot(result["dirty"], data["dirty"])
+
+    def test_already_masked(self):
+        """Test that already masked data is not copied."""
+        data = {"password": "***"}
+        self.assertIs(self.redactor.redact(data), data)
+
+    def test_scalars_and_tuples(self):
+        """Test scalars pass through and tuples stay tuples."""
+        self.assertEqual(self.redactor.redact("password"), "password")
+        self.assertEqual(self.redactor.redact(({"password": "p"},)), ({"password": "***"},))
+
+    def test_redact_text(self):
+        """Test masking raw, possibly truncated JSON and form text."""
+        self.assertEqual(
+            self.redactor.redact_text(
+                '{"a": {"refresh_token": "x\\"y", "b": 1}, "password": "unterm'
+            ),
+            '{"a": {"refresh_token": ***, "b": 1}, "password": ***',
+        )
+        self.assertEqual(
+            self.redactor.redact_text("a=1&password=p&id_token=t"), "a=1&password=***&id_token=***"
+        )
+
+
+class TestGetRedactor(TestCase):
+    """Test the configured redactor."""
+
+    def test_default_settings(self):
+        """Test the default rules catch nested and suffixed names."""
+        self.assertEqual(
+            redact({"auth": {"access_token": "t", "api_key": "k"}, "token": "t", "name": "n"}),
+            {"auth": {"access_token": "***", "api_key": "***"}, "token": "***", "name": "n"},
+        )
+
+    def test_recompiled_on_setting_change(self):
+        """Test that the redactor follows LOG_REDACT_* setting changes."""
+        with override_settings(
+            LOG_REDACT_FIELDS=["pin"], LOG_REDACT_PATTERNS=[], LOG_REDACT_PATHS=[]
+        ):
+            self.assertEqual(redact({"pin": 1, "password": 2}), {"pin": "***", "password": 2})
+        self.assertTrue(get_redactor().is_sensitive_key("password"))
@@ -0,0 +1,94 @@
+import datetime
+import decimal
+import io
+import uuid
+from unittest.mock import patch
+
+from django.test import SimpleTestCase
+from django.utils.translation import gettext_lazy
+
+from rest_framework import renderers
+from rest_framework.exceptions import ErrorDetail, ParseError
+
+from app.contrib.renderers import JSONParser, JSONRenderer, dumps, loads
+
+PAYLOAD = {
+    "id": uuid.UUID("12345678-1234-5678-1234-567812345678"),
+    "price": decimal.Decimal("1.50"),
+    "created_at": datetime.datetime(2024, 1, 2, 3, 4, 5, 123456, tzinfo=datetime.timezone.utc),
+    "day": datetime.date(2024, 1, 2),
+    "message": gettext_lazy("Not found."),
+    "detail": ErrorDetail("Not found.", code="not_found"),
+    "name": "ünïcode",
+    "items": (1, 2),
+}
+
+
+class TestJSON(SimpleTestCase):
+    """Test the dumps and loads functions."""
+
+    def test_matches_drf_encoder(self):
+        """Test that the output is the same as DRF's renderer, with either backend."""
+        expected = renderers.JSONRenderer().render(PAYLOAD)
+        self.assertEqual(dumps(PAYLOAD), expected)
+        with patch("app.contrib.renderers.orjson", None):
+            self.assertEqual(dumps(PAYLOAD), expected)
+
+    def test_big_integer_falls_back(self):
+        """Test that values orjson rejects are encoded with the standard library."""
+        self.assertEqual(dumps({"n": 2**70}), b'{"n":1180591620717411303424}')
+
+    def test_non_string_keys(self):
+        """Test that non-string keys are converted like the standard library does."""
+        self.assertEqual(dumps({1: True}), b'{"1":true}')
+
+    def test_custom_default(self):
+        """Test that a custom default is used for unknown values."""
+        self.assertEqual(dumps({"a": object}, default=lambda _: "x"), b'{"a":"x"}')
+        with self.assertRaises(TypeError):
+            dumps({"a": object})
+
+    def test_loads(self):
+        """Test decoding, and that invalid input raises the standard errors."""
+        self.assertEqual(loads(b'{"a": [1, "\xc3\xa9"]}'), {"a": [1, "é"]})
+        with self.assertRaises(ValueError):
+            loads(b"invalid_json")
+        with self.assertRaises(UnicodeDecodeError):
+            loads(b"\xff\xff")
+
+
+class TestJSONRenderer(SimpleTestCase):
+    """Test the JSONRenderer class."""
+
+    def test_render(self):
+        """Test rendering, including the JavaScript line separators."""
+        renderer = JSONRenderer()
+        self.assertEqual(renderer.render(None), b"")
+        self.assertEqual(renderer.render({"a": "x y "}), b'{"a":"x\\u2028y\\u2029"}')
+
+    def test_indent_uses_drf(self):
+        """Test that indented output falls back to DRF's renderer."""
+        content = JSONRenderer().render({"a": 1}, "application/json; indent=2")
+        self.assertEqual(content, b'{\n  "a": 1\n}')
+
+
+class TestJSONParser(SimpleTestCase):
+    """Test the JSONParser class."""
+
+    def test_parse(self):
+        """Test parsing a UTF-8 body."""
+        data = JSONParser().parse(io.BytesIO('{"name": "é"}'.encode()))
+        self.assertEqual(data, {"name": "é"})
+
+    def test_parse_error(self):
+        """Test that invalid bodies raise a ParseError."""
+        with self.assertRaises(ParseError):
+            JSONParser().parse(io.BytesIO(b"{"))
+        with self.assertRaises(ParseError):
+            JSONParser().parse(io.BytesIO(b'"\xff"'))
+
+    def test_other_encoding_uses_drf(self):
+        """Test that bodies in other encodings are decoded by DRF's parser."""
+        body = '{"name": "é"}'.encode("latin-1")
+        data = JSONParser().parse(io.BytesIO(body), parser_context={"encoding": "latin-1"})
+        self.assertEqual(data, {"name": "é"})
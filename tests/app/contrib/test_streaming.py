@@ -0,0 +1,161 @@
+import datetime
+import decimal
+import json
+from typing import Optional, Type
+
+from django.contrib.auth.models import User
+from django.http import StreamingHttpResponse
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import path
+
+from rest_framework import generics, serializers
+from rest_framework.pagination import BasePagination
+from rest_framework.test import APIRequestFactory
+
+from app.contrib.pagination import CustomPagination, KeysetPagination
+from app.contrib.streaming import JSONListStream, StreamingListMixin
+
+
+class UserSerializer(serializers.ModelSerializer):
+    """Serializer for the streamed users."""
+
+    class Meta:
+        """Meta options."""
+
+        model = User
+        fields = ("id", "username")
+
+
+class StreamedUserList(StreamingListMixin, generics.ListAPIView):
+    """List view streaming the users."""
+
+    queryset = User.objects.order_by("pk")
+    serializer_class = UserSerializer
+    pagination_class = CustomPagination
+    stream_chunk_size = 2
+    authentication_classes = ()
+    permission_classes = ()
+
+
+urlpatterns = [path("users/", StreamedUserList.as_view())]
+
+
+class TestJSONListStream(SimpleTestCase):
+    """Test the JSONListStream class."""
+
+    def test_bare_array(self):
+        """Test streaming a bare array in batches."""
+        chunks = list(JSONListStream(range(5), lambda item: {"n": item}, batch_size=2))
+        self.assertEqual(len(chunks), 4)
+        self.assertEqual(json.loads(b"".join(chunks)), [{"n": n} for n in range(5)])
+
+    def test_empty(self):
+        """Test streaming no items."""
+        self.assertEqual(b"".join(JSONListStream([], str)), b"[]")
+        envelope = {"next": None, "count": None}
+        self.assertEqual(
+            json.loads(b"".join(JSONListStream([], str, envelope))),
+            {"next": None, "results": [], "count": 0},
+        )
+
+    def test_envelope_count_written_last(self):
+        """Test that the count is the number of items streamed, written after them."""
+        envelope = {"count": None, "count_exact": None, "next": None, "previous": None}
+        body = b"".join(JSONListStream(iter("abc"), str, envelope, batch_size=2))
+        self.assertTrue(body.endswith(b'],"count":3,"count_exact":true}'))
+        self.assertEqual(
+            json.loads(body),
+            {
+                "count": 3,
+                "count_exact": True,
+                "next": None,
+                "previous": None,
+                "results": ["a", "b", "c"],
+            },
+        )
+
+    def test_encodes_drf_types(self):
+        """Test that values are encoded like the JSON renderer."""
+        item = {"at": datetime.date(2024, 1, 2), "price": decimal.Decimal("1.50"), "name": "é"}
+        body = b"".join(JSONListStream([item], dict))
+        self.assertEqual(body.decode(), '[{"at":"2024-01-02","price":1.5,"name":"é"}]')
+
+
+class TestStreamingListMixin(TestCase):
+    """Test the StreamingListMixin class."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        """Create the users to stream."""
+        User.objects.bulk_create(User(username=f"user{index}") for index in range(5))
+
+    def stream(self, pagination_class: Optional[Type[BasePagination]]) -> StreamingHttpResponse:
+        """Return the streaming response of a list view using the pagination class."""
+
+        class UserList(StreamingListMixin, generics.ListAPIView):
+            queryset = User.objects.order_by("pk")
+            serializer_class = UserSerializer
+            stream_chunk_size = 2
+            authentication_classes = ()
+            permission_classes = ()
+
+        UserList.pagination_class = pagination_class
+        return UserList.as_view()(APIRequestFactory().get("/users/"))
+
+    def expected(self) -> list:
+        """Return the serialized users."""
+        return [{"id": user.pk, "username": user.username} for user in User.objects.order_by("pk")]
+
+    def test_page_number_envelope(self):
+        """Test that the whole result set is streamed in the paginator's envelope."""
+        response = self.stream(CustomPagination)
+        self.assertIsInstance(response, StreamingHttpResponse)
+        self.assertEqual(response["Content-Type"], "application/json")
+        # Nothing is fetched before the content is consumed, then rows are fetched in chunks.
+        with self.assertNumQueries(0):
+            chunks = iter(response.streaming_content)
+        with self.assertNumQueries(1):
+            body = b"".join(chunks)
+        self.assertEqual(
+            json.loads(body),
+            {
+                "count": 5,
+                "count_exact": True,
+                "next": None,
+                "previous": None,
+                "results": self.expected(),
+            },
+        )
+
+    def test_keyset_envelope(self):
+        """Test that a paginator without a count gets no count."""
+        body = b"".join(self.stream(KeysetPagination).streaming_content)
+        self.assertEqual(
+            json.loads(body), {"next": None, "previous": None, "results": self.expected()}
+        )
+
+    def test_without_pagination(self):
+        """Test that a bare array is streamed without a paginator."""
+        body = b"".join(self.stream(None).streaming_content)
+        self.assertEqual(json.loads(body), self.expected())
+
+
+@override_settings(ROOT_URLCONF=__name__)
+class TestStreamingListMixinAsync(TestCase):
+    """Test the StreamingListMixin class under ASGI."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        """Create the users to stream."""
+        User.objects.bulk_create(User(username=f"user{index}") for index in range(5))
+
+    async def test_streams_async_iterator(self):
+        """Test that the rows are sent batch by batch through an async iterator."""
+        response = await self.async_client.get("/users/")
+        self.assertTrue(response.is_async)
+        chunks = [chunk async for chunk in response.streaming_content]
+        # Opening and first batch, two more batches, then the closing with the count.
+        self.assertEqual(len(chunks), 4)
+        body = json.loads(b"".join(chunks))
+        self.assertEqual(body["count"], 5)
+        self.assertEqual(len(body["results"]), 5)
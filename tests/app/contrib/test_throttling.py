@@ -0,0 +1,185 @@
+from unittest import TestCase
+from unittest.mock import Mock, patch
+
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache, caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from app.contrib.cache import TwoTierCache
+from app.contrib.throttling import (
+    AnonRateThrottle,
+    CacheGCRAStore,
+    CacheWindowStore,
+    LocalGCRAStore,
+    LocalWindowStore,
+    SlidingWindowAnonRateThrottle,
+)
+
+
+class TestLocalWindowStore(TestCase):
+    """Test the LocalWindowStore class."""
+
+    def test_windows_roll_over(self):
+        """Test that counts move to the previous window and then expire."""
+        store = LocalWindowStore()
+        self.assertEqual(store.incr("k", 10, 0), (0, 1))
+        self.assertEqual(store.incr("k", 10, 0), (0, 2))
+        self.assertEqual(store.incr("k", 11, 0), (2, 1))
+        self.assertEqual(store.incr("k", 13, 0), (0, 1))
+        store.decr("k", 13)
+        self.assertEqual(store.incr("k", 13, 0), (0, 1))
+
+    def test_bounded_keys(self):
+        """Test that stale keys are pruned when the store is full."""
+        store = LocalWindowStore(max_keys=2)
+        store.incr("a", 1, 0)
+        store.incr("b", 5, 0)
+        store.incr("c", 5, 0)
+        self.assertEqual(store.incr("b", 5, 0), (0, 2))
+        self.assertEqual(store.incr("a", 5, 0), (0, 1))
+
+
+class TestCacheWindowStore(TestCase):
+    """Test the CacheWindowStore class."""
+
+    def tearDown(self):
+        """Tear down the test environment."""
+        cache.clear()
+
+    def test_incr(self):
+        """Test that hits are counted with add/incr on per-window keys."""
+        store = CacheWindowStore()
+        self.assertEqual(store.incr("k", 10, 60), (0, 1))
+        self.assertEqual(store.incr("k", 10, 60), (0, 2))
+        self.assertEqual(store.incr("k", 11, 60), (2, 1))
+        store.decr("k", 11)
+        self.assertEqual(cache.get("k:11"), 0)
+
+
+@override_settings(
+    CACHES={
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+        "two_tier": {
+            "BACKEND": "app.contrib.cache.TwoTierCache",
+            "LOCATION": "two-tier-throttle",
+            "OPTIONS": {"SHARED_BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+        },
+    },
+    THROTTLE_CACHE="two_tier",
+)
+class TestCacheStoreTwoTier(SimpleTestCase):
+    """Test the cache stores on a TwoTierCache alias."""
+
+    def test_shared_backend_used(self):
+        """Test that counters skip the local tier and its slot token writes."""
+        store = CacheGCRAStore()
+        self.assertIsInstance(store.cache, LocMemCache)
+        with patch.object(TwoTierCache, "publish") as mock_publish:
+            self.assertIsNone(store.hit("k", 100.0, 1.0, 10.0))
+            self.assertIsNone(store.hit("k", 100.0, 1.0, 10.0))
+            self.assertEqual(CacheWindowStore().incr("w", 10, 60), (0, 1))
+        mock_publish.assert_not_called()
+        self.assertEqual(caches["two_tier"].get("w:10"), 1)
+
+
+class TestSlidingWindowThrottle(TestCase):
+    """Test the sliding-window throttles."""
+
+    def setUp(self):
+        """Set up the test environment."""
+        self.request = RequestFactory().get("/")
+        self.request.user = AnonymousUser()
+        self.store = LocalWindowStore()
+        self.timer = Mock(return_value=600.0)
+
+    def get_throttle(self) -> SlidingWindowAnonRateThrottle:
+        """Return a 2/minute throttle on the local store and fake clock."""
+        throttle = SlidingWindowAnonRateThrottle()
+        throttle.num_requests, throttle.duration = 2, 60
+        throttle.store = self.store
+        throttle.timer = self.timer
+        return throttle
+
+    def test_limit_and_wait(self):
+        """Test that requests over the rate are rejected with an accurate wait."""
+        self.assertTrue(self.get_throttle().allow_request(self.request, None))
+        self.assertTrue(self.get_throttle().allow_request(self.request, None))
+        throttle = self.get_throttle()
+        self.assertFalse(throttle.allow_request(self.request, None))
+        self.assertEqual(throttle.wait(), 60)
+
+    def test_previous_window_weight(self):
+        """Test that the previous window counts in proportion to its overlap."""
+        self.timer.return_value = 540.0
+        self.get_throttle().allow_request(self.request, None)
+        self.get_throttle().allow_request(self.request, None)
+
+        self.timer.return_value = 615.0
+        throttle = self.get_throttle()
+        self.assertFalse(throttle.allow_request(self.request, None))
+        self.assertEqual(throttle.wait(), 15)
+
+        self.timer.return_value = 630.0
+        self.assertTrue(self.get_throttle().allow_request(self.request, None))
+
+    @patch.object(SlidingWindowAnonRateThrottle, "store", CacheWindowStore())
+    def test_cache_store_default(self):
+        """Test that the default store shares counters through the cache."""
+        throttle = SlidingWindowAnonRateThrottle()
+        self.assertTrue(throttle.allow_request(self.request, None))
+        self.assertTrue(cache.get(f"{throttle.key}:{int(throttle.timer() // 60)}"))
+        cache.clear()
+
+
+class TestGCRAThrottle(TestCase):
+    """Test the GCRA throttles on both stores."""
+
+    def setUp(self):
+        """Set up the test environment."""
+        self.request = RequestFactory().get("/")
+        self.request.user = AnonymousUser()
+        self.timer = Mock(return_value=1000.0)
+
+    def tearDown(self):
+        """Tear down the test environment."""
+        cache.clear()
+
+    def get_throttle(self, store: object) -> AnonRateThrottle:
+        """Return a 3/minute throttle on the given store and fake clock."""
+        throttle = AnonRateThrottle()
+        throttle.num_requests, throttle.duration = 3, 60
+        throttle.store = store
+        throttle.timer = self.timer
+        return throttle
+
+    def test_burst_and_retry_after(self):
+        """Test the burst, the exact wait and the sustained rate."""
+        for store in (LocalGCRAStore(), CacheGCRAStore()):
+            with self.subTest(store=type(store).__name__):
+                self.timer.return_value = 1000.0
+                for _ in range(3):
+                    self.assertTrue(self.get_throttle(store).allow_request(self.request, None))
+                throttle = self.get_throttle(store)
+                self.assertFalse(throttle.allow_request(self.request, None))
+                self.assertAlmostEqual(throttle.wait(), 20)
+
+                self.timer.return_value = 1020.0
+                self.assertTrue(self.get_throttle(store).allow_request(self.request, None))
+                self.assertFalse(self.get_throttle(store).allow_request(self.request, None))
+
+    def test_idle_key_resets(self):
+        """Test that a key idle for longer than the period gets a full burst."""
+        store = CacheGCRAStore()
+        for _ in range(3):
+            self.get_throttle(store).allow_request(self.request, None)
+        self.timer.return_value = 2000.0
+        for _ in range(3):
+            self.assertTrue(self.get_throttle(store).allow_request(self.request, None))
+
+    def test_authenticated_user_not_throttled(self):
+        """Test that the anon throttle ignores authenticated users."""
+        self.request.user = Mock(is_authenticated=True)
+        throttle = self.get_throttle(LocalGCRAStore())
+        for _ in range(5):
+            self.assertTrue(throttle.allow_request(self.request, None))
@@ -1,12 +1,13 @@
-from unittest import TestCase
-from unittest.mock import patch
+from unittest import IsolatedAsyncioTestCase, TestCase
+from unittest.mock import Mock, patch
 
 from django.conf import settings
 from django.test import override_settings
 
+import constance.utils
 from constance import config as constance_config
 
-from app.contrib.config import config
+from app.contrib.config import ConfigWrapper, config
 
 
 class TestConfigWrapper(TestCase):
@@ -44,8 +45,6 @@ class TestConfigWrapper(TestCase):
     @patch.dict("sys.modules", {"constance": None})
     def test_import_error_handling(self):
         """Test handling import errors when constance is not available."""
-        from app.contrib.config import ConfigWrapper
-
         config_wrapper = ConfigWrapper()
         self.assertIsNone(config_wrapper.constance_config)
         self.assertIsNone(config_wrapper.constance_settings)
@@ -61,3 +60,65 @@ class TestConfigWrapper(TestCase):
 
         # Check if the value is reset to the default
         self.assertFalse(constance_config.MAINTENANCE_ENABLE)
+
+    def test_snapshot_is_reused_between_reads(self):
+        """Test that repeated reads are served from the same snapshot."""
+        snapshot = config.snapshot
+        with patch("constance.utils.get_values") as mock_get_values:
+            _ = config.MAINTENANCE_ENABLE
+            _ = config.MAINTENANCE_ALLOWED_URLS
+            mock_get_values.assert_not_called()
+        self.assertIs(config.snapshot, snapshot)
+
+    def test_snapshot_invalidated_on_config_update(self):
+        """Test that the config_updated signal drops the snapshot."""
+        snapshot = config.snapshot
+        constance_config.MAINTENANCE_MESSAGE = "Back soon."
+        self.assertIsNot(config.snapshot, snapshot)
+        self.assertEqual(config.MAINTENANCE_MESSAGE, "Back soon.")
+
+    @override_settings(CONFIG_SNAPSHOT_TTL=0)
+    def test_snapshot_reloaded_when_shared_version_changes(self):
+        """Test that a version bump from another worker reloads the snapshot."""
+        version_cache = Mock()
+        version_cache.get.return_value = 1
+        with patch.object(ConfigWrapper, "_get_version_cache", return_value=version_cache):
+            snapshot = config.snapshot
+            self.assertIs(config.snapshot, snapshot)
+
+            version_cache.get.return_value = 2
+            self.assertIsNot(config.snapshot, snapshot)
+
+    def test_snapshot_is_immutable(self):
+        """Test that the snapshot can't be modified in place."""
+        with self.assertRaises(TypeError):
+            config.snapshot["MAINTENANCE_ENABLE"] = True
+
+
+class TestConfigWrapperAsync(IsolatedAsyncioTestCase):
+    """Test the async API of the ConfigWrapper class."""
+
+    def tearDown(self):
+        """Reset the config cache."""
+        config.reset()
+
+    async def test_aget(self):
+        """Test reading constance values and settings fallbacks asynchronously."""
+        constance_config.MAINTENANCE_ENABLE = True
+        self.assertTrue(await config.aget("MAINTENANCE_ENABLE"))
+        self.assertEqual(await config.aget("DEBUG"), settings.DEBUG)
+
+    async def test_asnapshot_matches_snapshot(self):
+        """Test that the async snapshot holds the same values."""
+        snapshot = await config.asnapshot()
+        self.assertIs(await config.asnapshot(), snapshot)
+        self.assertEqual(dict(snapshot), dict(config.snapshot))
+
+    async def test_asnapshot_without_async_api(self):
+        """Test that releases of constance without aget_values are read in a thread."""
+        with patch.dict(constance.utils.__dict__):
+            del constance.utils.__dict__["aget_values"]
+            config.invalidate()
+            constance_config.MAINTENANCE_ENABLE = True
+            snapshot = await config.asnapshot()
+        self.assertTrue(snapshot["MAINTENANCE_ENABLE"])
@@ -0,0 +1,104 @@
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from app.utils.gunicorn import get_cpu_limit, get_memory_limit, get_worker_config, get_worker_count
+
+GIB = 1024**3
+
+
+class TestCgroupLimits(unittest.TestCase):
+    """Test reading the CPU and memory limits of the cgroup."""
+
+    def setUp(self):
+        """Create an empty cgroup file system on 8 CPUs."""
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.root = Path(directory.name)
+        affinity = patch("os.sched_getaffinity", return_value=set(range(8)), create=True)
+        affinity.start()
+        self.addCleanup(affinity.stop)
+
+    def write(self, name: str, content: str) -> None:
+        """Write a cgroup file."""
+        path = self.root / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(f"{content}\n")
+
+    def test_no_cgroup(self):
+        """Test that the CPUs of the host are used without a cgroup."""
+        self.assertEqual(get_cpu_limit(self.root), 8)
+        self.assertIsNone(get_memory_limit(self.root))
+
+    def test_cgroup_v2(self):
+        """Test the cpu.max and memory.max files of cgroup v2."""
+        self.write("cpu.max", "150000 100000")
+        self.write("memory.max", str(2 * GIB))
+        self.assertEqual(get_cpu_limit(self.root), 1.5)
+        self.assertEqual(get_memory_limit(self.root), 2 * GIB)
+
+    def test_cgroup_v2_unlimited(self):
+        """Test that "max" means no limit."""
+        self.write("cpu.max", "max 100000")
+        self.write("memory.max", "max")
+        self.assertEqual(get_cpu_limit(self.root), 8)
+        self.assertIsNone(get_memory_limit(self.root))
+
+    def test_cgroup_v1(self):
+        """Test the CFS quota and memory limit files of cgroup v1."""
+        self.write("cpu/cpu.cfs_quota_us", "200000")
+        self.write("cpu/cpu.cfs_period_us", "100000")
+        self.write("memory/memory.limit_in_bytes", str(GIB))
+        self.assertEqual(get_cpu_limit(self.root), 2)
+        self.assertEqual(get_memory_limit(self.root), GIB)
+
+    def test_cgroup_v1_unlimited(self):
+        """Test that a -1 quota and a huge memory limit mean no limit."""
+        self.write("cpu/cpu.cfs_quota_us", "-1")
+        self.write("cpu/cpu.cfs_period_us", "100000")
+        self.write("memory/memory.limit_in_bytes", "9223372036854771712")
+        self.assertEqual(get_cpu_limit(self.root), 8)
+        self.assertIsNone(get_memory_limit(self.root))
+
+    def test_worker_config(self):
+        """Test that the workers follow the limits of the container."""
+        self.write("cpu.max", "200000 100000")
+        self.write("memory.max", str(2 * GIB))
+        self.assertEqual(get_worker_config("gthread", root=self.root), ("gthread", 3, 4))
+        self.assertEqual(get_worker_config("sync", threads=8, root=self.root), ("sync", 5, 1))
+        with patch("importlib.util.find_spec", return_value=object()):
+            self.assertEqual(
+                get_worker_config("asgi", workers=6, root=self.root),
+                ("uvicorn_worker.UvicornWorker", 6, 1),
+            )
+
+    def test_worker_module_missing(self):
+        """Test that a worker class whose module is not installed is rejected clearly."""
+        with patch("importlib.util.find_spec", return_value=None) as find_spec:
+            with self.assertRaisesRegex(ValueError, "uv sync --extra asgi"):
+                get_worker_config("asgi", workers=2, root=self.root)
+        find_spec.assert_called_once_with("uvicorn_worker")
+
+
+class TestGetWorkerCount(unittest.TestCase):
+    """Test the get_worker_count function."""
+
+    def test_worker_classes(self):
+        """Test the number of workers per CPU of each worker class."""
+        self.assertEqual(get_worker_count("sync", 2), 5)
+        self.assertEqual(get_worker_count("gthread", 2), 3)
+        self.assertEqual(get_worker_count("asgi", 2), 2)
+        self.assertEqual(get_worker_count("asgi", 0.5), 1)
+
+    def test_memory_limit(self):
+        """Test that the workers fit in the memory limit."""
+        self.assertEqual(get_worker_count("sync", 4, GIB, worker_memory=256 * 1024**2), 4)
+        self.assertEqual(get_worker_count("sync", 4, 100 * 1024**2), 1)
+
+    def test_unknown_worker_class(self):
+        """Test that an unknown worker class is rejected."""
+        with self.assertRaises(ValueError):
+            get_worker_count("eventlet", 2)
+        with self.assertRaises(ValueError):
+            get_worker_config("eventlet", workers=2)